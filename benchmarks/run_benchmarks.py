@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+# Copyright 2026 The Lynx Authors. All rights reserved.
+# Licensed under the Apache License Version 2.0 that can be found in the
+# LICENSE file in the root directory of this source tree.
+"""
+Benchmark git lynx checkers and git lynx format on a synthetic repository.
+
+Every built-in checker is run on all files (--all) and on the last commit,
+then git lynx format --all is run. Each run is a separate git lynx process,
+its wall time and peak RSS are recorded together with the throughput in
+files and diff lines per second.
+
+By default clang-format, gn, npx (prettier, cspell) and git-lfs are replaced
+by stubs which accept every file, so that the numbers measure git lynx
+itself. Use --real-tools to run the tools installed on PATH instead, the
+checkers needing tools without stubs (checkstyle, PMD) only run then.
+
+Runs which exit with an error or time out are marked as failed and get no
+throughput, their time measures the failure and not the checker.
+
+Example:
+  python3 benchmarks/run_benchmarks.py --cpp-files 500 --diff-lines 5000 \\
+      --output bench.json --baseline previous_bench.json
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+
+from synthetic_repo import generate_repo
+
+GIT_LYNX = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "git_lynx.py"
+)
+
+_STUBS = {
+    "clang-format": """#!/bin/sh
+# Benchmark stub: every file is already well formatted.
+xml=0
+inplace=0
+for arg in "$@"; do
+  case "$arg" in
+    --output-replacements-xml) xml=1 ;;
+    -i) inplace=1 ;;
+  esac
+done
+for arg in "$@"; do
+  case "$arg" in -*) continue ;; esac
+  if [ $xml = 1 ]; then
+    echo "<?xml version='1.0'?>"
+    echo "<replacements xml:space='preserve' incomplete_format='false'>"
+    echo "</replacements>"
+  elif [ $inplace = 0 ]; then
+    cat "$arg"
+  fi
+done
+""",
+    "gn": """#!/bin/sh
+# Benchmark stub: every file is already well formatted.
+exit 0
+""",
+    "npx": """#!/bin/sh
+# Benchmark stub for prettier and cspell: no file has any issue.
+for arg in "$@"; do
+  case "$arg" in
+    --version) echo 2.2.1; exit 0 ;;
+    stdin) cat > /dev/null ;;
+  esac
+done
+exit 0
+""",
+    "git-lfs": """#!/bin/sh
+# Benchmark stub: the repository has no LFS files.
+exit 0
+""",
+}
+
+
+# Checkers running tools of the build tools directory, which have no stub.
+_CHECKERS_WITHOUT_STUBS = {
+    "android-check-style": "checkstyle.jar",
+    "java-lint": "PMD",
+}
+# Checkers which only check changed lines and do not support --all.
+_CHANGED_LINES_CHECKERS = {"macro"}
+
+
+def write_stubs(directory):
+    os.makedirs(directory, exist_ok=True)
+    for name, content in _STUBS.items():
+        path = os.path.join(directory, name)
+        with open(path, "w") as f:
+            f.write(content)
+        os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR | stat.S_IXGRP)
+
+
+def run_measured(command, cwd, env, timeout):
+    """
+    Run |command| and return (exit code, wall seconds, peak RSS in bytes) of
+    the process and the children it waited for. The process is killed after
+    |timeout| seconds and its exit code is then None.
+    """
+    start = time.perf_counter()
+    p = subprocess.Popen(
+        command, cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    timed_out = False
+    while True:
+        pid, status, rusage = os.wait4(p.pid, os.WNOHANG)
+        if pid:
+            break
+        if not timed_out and time.perf_counter() - start > timeout:
+            timed_out = True
+            p.kill()
+        time.sleep(0.01)
+    seconds = time.perf_counter() - start
+    p.returncode = None if timed_out else os.waitstatus_to_exitcode(status)
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere.
+    peak_rss = rusage.ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+    return p.returncode, seconds, peak_rss
+
+
+def list_checkers(python, repo, env):
+    output = subprocess.check_output(
+        [python, GIT_LYNX, "check", "--list"], cwd=repo, env=env, encoding="utf-8"
+    )
+    return re.findall(r"^  ([\w-]+): ", output, re.MULTILINE)
+
+
+def _result(name, scenario, files, lines, code, seconds, peak_rss, profile=None):
+    failed = code != 0
+    result = {
+        "name": name,
+        "scenario": scenario,
+        "files": files,
+        "lines": lines,
+        "exit_code": code,
+        "failed": failed,
+        "seconds": seconds,
+        "files_per_second": None,
+        "lines_per_second": None,
+        "peak_rss_bytes": peak_rss,
+    }
+    if failed:
+        print(
+            "Warning: %s (%s) %s, it is left out of the throughput numbers"
+            % (
+                name,
+                scenario,
+                "timed out" if code is None else "exited with %d" % code,
+            )
+        )
+    else:
+        result["files_per_second"] = files / seconds if seconds else 0.0
+        result["lines_per_second"] = lines / seconds if seconds else 0.0
+    if profile:
+        result["subprocess_count"] = profile["subprocess_count"]
+        result["subprocess_time"] = profile["subprocess_time"]
+    return result
+
+
+def _print_result(name, result):
+    if result["failed"]:
+        throughput = "%16s" % "failed"
+    else:
+        throughput = "%10.1f files/s" % result["files_per_second"]
+    print(
+        "%-32s %-12s %8.2fs %s"
+        % (name, result["scenario"], result["seconds"], throughput)
+    )
+
+
+def _read_profile(path):
+    try:
+        with open(path) as f:
+            checkers = json.load(f)["checkers"]
+    except (OSError, ValueError, KeyError):
+        return None
+    return checkers[0] if checkers else None
+
+
+def run_benchmarks(repo, stats, python, env, checkers, jobs, timeout):
+    scenarios = [
+        ("all", ["--all"], stats["files"], 0),
+        ("last-commit", [], stats["changed_files"], stats["diff_lines"]),
+    ]
+    profile_path = os.path.join(os.path.dirname(repo), "profile.json")
+    results = []
+    for checker in checkers:
+        for scenario, flags, files, lines in scenarios:
+            if scenario == "all" and checker in _CHANGED_LINES_CHECKERS:
+                print(
+                    "%-32s %-12s skipped, checks changed lines only"
+                    % (checker, scenario)
+                )
+                continue
+            if os.path.exists(profile_path):
+                os.remove(profile_path)
+            command = [python, GIT_LYNX, "check", "--checkers", checker]
+            command += flags + ["--jobs", str(jobs), "--profile-out", profile_path]
+            code, seconds, peak_rss = run_measured(command, repo, env, timeout)
+            results.append(
+                _result(
+                    "check:" + checker,
+                    scenario,
+                    files,
+                    lines,
+                    code,
+                    seconds,
+                    peak_rss,
+                    _read_profile(profile_path),
+                )
+            )
+            _print_result(checker, results[-1])
+            # Checkers may fix files in place, start every run from HEAD.
+            subprocess.check_call(["git", "checkout", "-q", "."], cwd=repo)
+
+    command = [python, GIT_LYNX, "format", "--all", "--jobs", str(jobs)]
+    code, seconds, peak_rss = run_measured(command, repo, env, timeout)
+    results.append(_result("format", "all", stats["files"], 0, code, seconds, peak_rss))
+    _print_result("format", results[-1])
+    subprocess.check_call(["git", "checkout", "-q", "."], cwd=repo)
+    return results
+
+
+def compare_with_baseline(results, baseline_path, threshold):
+    """
+    Print runs which became more than |threshold| slower than in the
+    baseline. Runs which failed now or in the baseline are not compared.
+    Returns whether there was any.
+    """
+    with open(baseline_path) as f:
+        baseline = {(r["name"], r["scenario"]): r for r in json.load(f)["results"]}
+    regressed = False
+    for result in results:
+        previous = baseline.get((result["name"], result["scenario"]))
+        if not previous or not previous["seconds"]:
+            continue
+        if result["failed"] or previous.get("exit_code") != 0:
+            continue
+        ratio = result["seconds"] / previous["seconds"]
+        if ratio > 1 + threshold:
+            regressed = True
+            print(
+                "Regression: %s (%s) took %.2fs, %.0f%% slower than %.2fs"
+                % (
+                    result["name"],
+                    result["scenario"],
+                    result["seconds"],
+                    (ratio - 1) * 100,
+                    previous["seconds"],
+                )
+            )
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--cpp-files", type=int, default=100)
+    parser.add_argument("--java-files", type=int, default=20)
+    parser.add_argument("--gn-files", type=int, default=10)
+    parser.add_argument("--yaml-files", type=int, default=10)
+    parser.add_argument("--diff-lines", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--checkers", help="Checkers to run, separated with commas, default all"
+    )
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=600,
+        help="Seconds after which a single run is killed, default 600",
+    )
+    parser.add_argument(
+        "--python", default=sys.executable, help="Python used to run git lynx"
+    )
+    parser.add_argument(
+        "--real-tools",
+        action="store_true",
+        help="Use clang-format, gn and npx from PATH instead of stubs",
+    )
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument(
+        "--baseline", help="Fail if runs are slower than in this JSON file"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Allowed slowdown against the baseline, default 0.2 (20%%)",
+    )
+    parser.add_argument(
+        "--keep", action="store_true", help="Keep the generated repository"
+    )
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="lynx-bench-")
+    repo = os.path.join(work_dir, "repo")
+    try:
+        stats = generate_repo(
+            repo,
+            cpp_files=args.cpp_files,
+            java_files=args.java_files,
+            gn_files=args.gn_files,
+            yaml_files=args.yaml_files,
+            diff_lines=args.diff_lines,
+            seed=args.seed,
+        )
+        print("Generated %s in %s" % (stats, repo))
+        env = dict(os.environ)
+        if not args.real_tools:
+            stub_dir = os.path.join(work_dir, "stubs")
+            write_stubs(stub_dir)
+            env["PATH"] = stub_dir + os.pathsep + env.get("PATH", "")
+        if args.checkers:
+            checkers = args.checkers.split(",")
+        else:
+            checkers = list_checkers(args.python, repo, env)
+            if not args.real_tools:
+                for checker, tool in sorted(_CHECKERS_WITHOUT_STUBS.items()):
+                    if checker in checkers:
+                        print("Skipping %s, %s has no stub" % (checker, tool))
+                        checkers.remove(checker)
+        results = run_benchmarks(
+            repo, stats, args.python, env, checkers, args.jobs, args.timeout
+        )
+    finally:
+        if args.keep:
+            print("Kept %s" % work_dir)
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {
+        "config": {
+            "cpp_files": args.cpp_files,
+            "java_files": args.java_files,
+            "gn_files": args.gn_files,
+            "yaml_files": args.yaml_files,
+            "diff_lines": args.diff_lines,
+            "seed": args.seed,
+            "jobs": args.jobs,
+            "real_tools": args.real_tools,
+        },
+        "repo": stats,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline and compare_with_baseline(results, args.baseline, args.threshold):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
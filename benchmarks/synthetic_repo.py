@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# Copyright 2026 The Lynx Authors. All rights reserved.
+# Licensed under the Apache License Version 2.0 that can be found in the
+# LICENSE file in the root directory of this source tree.
+"""
+Generate a synthetic git repository for benchmarking git lynx.
+
+The repository gets two commits: one adding the generated sources and one
+appending lines to them, so that checkers can be run both on all files
+(--all) and on the diff of the last commit.
+"""
+
+import argparse
+import os
+import random
+import subprocess
+
+# Commit messages in the format the commit-message checker asks for.
+ADD_MESSAGE = "[Testing] Add synthetic sources\n\nGenerated for benchmarking."
+APPEND_MESSAGE = "[Testing] Append synthetic lines\n\nGenerated for benchmarking."
+COPYRIGHT = "Copyright 2026 The Lynx Authors. All rights reserved."
+LICENSE = (
+    "Licensed under the Apache License Version 2.0 that can be found in the",
+    "LICENSE file in the root directory of this source tree.",
+)
+
+
+def _slash_header():
+    return "// %s\n// %s\n// %s\n\n" % ((COPYRIGHT,) + LICENSE)
+
+
+def _pound_header():
+    return "# %s\n# %s\n# %s\n\n" % ((COPYRIGHT,) + LICENSE)
+
+
+def _header_guard(path):
+    return path.upper().replace("/", "_").replace(".", "_") + "_"
+
+
+def _cpp_header(path, index, functions):
+    guard = _header_guard(path)
+    body = "".join(
+        "int Function%d_%d(int value);\n" % (index, i) for i in range(functions)
+    )
+    return (
+        _slash_header()
+        + "#ifndef %s\n#define %s\n\n" % (guard, guard)
+        + "namespace lynx {\n\n"
+        + body
+        + "\n}  // namespace lynx\n\n#endif  // %s\n" % guard
+    )
+
+
+def _cpp_source(header, index, functions):
+    body = []
+    for i in range(functions):
+        body.append(
+            "int Function%d_%d(int value) {\n"
+            "#if defined(OS_ANDROID)\n"
+            "  return value + %d;\n"
+            "#else\n"
+            "  return value - %d;\n"
+            "#endif\n"
+            "}\n" % (index, i, i, i)
+        )
+    return (
+        _slash_header()
+        + '#include "%s"\n\nnamespace lynx {\n\n' % header
+        + "\n".join(body)
+        + "\n}  // namespace lynx\n"
+    )
+
+
+def _java_source(index, functions):
+    body = "".join(
+        "  public int method%d(int value) {\n    return value + %d;\n  }\n\n" % (i, i)
+        for i in range(functions)
+    )
+    return (
+        _slash_header()
+        + "package com.lynx.bench;\n\n"
+        + "public class Bench%d {\n" % index
+        + body
+        + "}\n"
+    )
+
+
+def _gn_source(index, sources):
+    return (
+        _pound_header()
+        + 'source_set("bench_%d") {\n' % index
+        + "  sources = [\n"
+        + "".join('    "%s",\n' % s for s in sources)
+        + "  ]\n}\n"
+    )
+
+
+def _yaml_source(index, entries):
+    return (
+        _pound_header()
+        + "bench_%d:\n" % index
+        + "".join("  key_%d: value_%d\n" % (i, i) for i in range(entries))
+    )
+
+
+def _appended_lines(path, start, count):
+    if path.endswith(".cc"):
+        return [
+            "int Added%d(int value) { return value * %d; }  // NOLINT" % (i, i)
+            for i in range(start, start + count)
+        ]
+    if path.endswith(".java"):
+        return ["// added line %d" % i for i in range(start, start + count)]
+    if path.endswith((".gn", ".yml")):
+        return ["# added line %d" % i for i in range(start, start + count)]
+    return []
+
+
+def _git(repo, *args):
+    subprocess.check_call(
+        ["git"] + list(args),
+        cwd=repo,
+        stdout=subprocess.DEVNULL,
+        env=dict(
+            os.environ,
+            GIT_AUTHOR_NAME="bench",
+            GIT_AUTHOR_EMAIL="bench@example.com",
+            GIT_COMMITTER_NAME="bench",
+            GIT_COMMITTER_EMAIL="bench@example.com",
+        ),
+    )
+
+
+def _write(repo, path, content):
+    full_path = os.path.join(repo, path)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    with open(full_path, "w") as f:
+        f.write(content)
+
+
+def generate_repo(
+    repo,
+    cpp_files=100,
+    java_files=20,
+    gn_files=10,
+    yaml_files=10,
+    diff_lines=1000,
+    functions_per_file=20,
+    files_per_dir=25,
+    seed=0,
+):
+    """
+    Create the repository at |repo|, which must not exist yet.
+
+    cpp_files is the number of .h/.cc pairs. diff_lines lines are spread
+    over the generated files in the last commit.
+
+    Returns:
+      A dict with the number of generated files and diff lines.
+    """
+    rng = random.Random(seed)
+    os.makedirs(repo)
+    _git(repo, "init", "-q")
+    _write(repo, "cspell.config.yml", "version: '0.2'\nignorePaths: []\n")
+
+    files = []
+
+    def place(kind, index, ext):
+        path = "%s/dir%d/%s_%d%s" % (kind, index // files_per_dir, kind, index, ext)
+        files.append(path)
+        return path
+
+    for i in range(cpp_files):
+        header = place("core", i, ".h")
+        _write(repo, header, _cpp_header(header, i, functions_per_file))
+        source = header[: -len(".h")] + ".cc"
+        files.append(source)
+        _write(repo, source, _cpp_source(header, i, functions_per_file))
+    for i in range(java_files):
+        path = place("java", i, ".java")
+        _write(repo, path, _java_source(i, functions_per_file))
+    for i in range(gn_files):
+        path = place("gn", i, ".gn")
+        sources = ["source_%d.cc" % j for j in range(functions_per_file)]
+        _write(repo, path, _gn_source(i, sources))
+    for i in range(yaml_files):
+        path = place("yaml", i, ".yml")
+        _write(repo, path, _yaml_source(i, functions_per_file))
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-q", "-m", ADD_MESSAGE)
+
+    targets = [f for f in files if not f.endswith(".h")]
+    per_file = {}
+    for _ in range(diff_lines if targets else 0):
+        path = rng.choice(targets)
+        per_file[path] = per_file.get(path, 0) + 1
+    added = 0
+    for path, count in sorted(per_file.items()):
+        lines = _appended_lines(path, added, count)
+        with open(os.path.join(repo, path), "a") as f:
+            f.write("".join(line + "\n" for line in lines))
+        added += len(lines)
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-q", "--allow-empty", "-m", APPEND_MESSAGE)
+
+    return {
+        "files": len(files),
+        "changed_files": len(per_file),
+        "diff_lines": added,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("repo", help="Directory of the new repository")
+    parser.add_argument("--cpp-files", type=int, default=100)
+    parser.add_argument("--java-files", type=int, default=20)
+    parser.add_argument("--gn-files", type=int, default=10)
+    parser.add_argument("--yaml-files", type=int, default=10)
+    parser.add_argument("--diff-lines", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    stats = generate_repo(
+        args.repo,
+        cpp_files=args.cpp_files,
+        java_files=args.java_files,
+        gn_files=args.gn_files,
+        yaml_files=args.yaml_files,
+        diff_lines=args.diff_lines,
+        seed=args.seed,
+    )
+    print(stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ import re
 import subprocess
 import sys
 from checkers.checker import Checker, CheckResult
+from checkers.checker_profiler import profile_file
 from default_env import Env
 
 DEFAULT_XML_CONTENT = """<?xml version="1.0"?>
@@ -51,13 +52,7 @@ class AndroidCodeStyleChecker(Checker):
         return True, None
 
     def get_changed_lines_of_target_file(self, file, line_indexes):
-        result = []
-        for key in line_indexes.keys():
-            file_hash_code, changed_line = line_indexes[key]
-            file_name = self.get_file_name(file_hash_code)
-            if file == file_name:
-                result.append(changed_line)
-        return result
+        return line_indexes.changed_lines_of(self.get_file_key(file))
 
     def get_error_line_of_target_file(self, error_message):
         if error_message is None:
@@ -87,7 +82,8 @@ class AndroidCodeStyleChecker(Checker):
         errors = []
         for changed_java_file in changed_java_files:
             print(f"checking {changed_java_file}")
-            success, output = self.run_check_style(changed_java_file)
+            with profile_file(changed_java_file):
+                success, output = self.run_check_style(changed_java_file)
             if not success:
                 changed_lines = self.get_changed_lines_of_target_file(
                     changed_java_file, line_indexes
@@ -118,7 +114,8 @@ class AndroidCodeStyleChecker(Checker):
         for changed_java_file in changed_java_files:
             print(f"checking {changed_java_file}")
             print(subprocess.check_output("pwd", shell=True))
-            success, output = self.run_check_style(changed_java_file)
+            with profile_file(changed_java_file):
+                success, output = self.run_check_style(changed_java_file)
             if not success:
                 error_messages = output.splitlines()
                 for error_message in error_messages:
@@ -2,6 +2,12 @@
 # Licensed under the Apache License Version 2.0 that can be found in the
 # LICENSE file in the root directory of this source tree.
 import re
+from array import array
+from bisect import bisect_right
+from collections.abc import Mapping
+
+_FILE_HEADER_PATTERN = re.compile(r"\+\+\+ b/(.*)")
+_HUNK_HEADER_PATTERN = re.compile(r"@@ -\d+(,\d+)? \+(\d+)(,\d+)? @@.*")
 
 
 class CheckResult:
@@ -13,8 +19,12 @@ class SimpleCache:
     def __init__(self):
         self._cache = {}
 
+    @staticmethod
+    def key(value):
+        return hash(value)
+
     def set(self, value):
-        key = hash(value)
+        key = self.key(value)
         self._cache.setdefault(key, value)
         return key
 
@@ -22,13 +32,139 @@ class SimpleCache:
         return self._cache.get(key)
 
 
+def iter_diff_hunks(diff_lines):
+    """
+    Parse `git diff -U0` output lazily and yield a (file_name, start_line,
+    added_lines) record for every hunk which adds lines.
+    """
+    current_file = None
+    current_start_line = 0
+    current_lines = []
+    for line in diff_lines:
+        if line.startswith("-"):
+            continue
+        elif line.startswith("+++"):
+            if current_lines:
+                yield current_file, current_start_line, current_lines
+            current_lines = []
+            matches = _FILE_HEADER_PATTERN.match(line)
+            if matches:
+                current_file = matches.group(1)
+        elif line.startswith("@@"):
+            if current_lines:
+                yield current_file, current_start_line, current_lines
+            current_lines = []
+            matches = _HUNK_HEADER_PATTERN.match(line)
+            if matches:
+                current_start_line = int(matches.group(2))
+        elif line.startswith("+"):
+            current_lines.append(line[1:])
+    if current_lines:
+        yield current_file, current_start_line, current_lines
+
+
+class ChangedLinesIndex(Mapping):
+    """
+    Maps the offset of a line in the flattened list of changed lines to its
+    (file_key, line_no). The hunks are kept in parallel arrays of start
+    offsets, start lines and file keys, so a lookup by offset bisects the
+    start offsets instead of going through an entry per line.
+
+    Checkers walking all lines should use iter_locations(), and
+    changed_lines_of() to ask which lines of a file were changed.
+    """
+
+    def __init__(self):
+        self._hunk_offsets = array("q")
+        self._hunk_start_lines = array("q")
+        self._hunk_file_keys = []
+        self._size = 0
+        self._lines_by_file = None
+
+    def add_hunk(self, file_key, start_line, line_count):
+        self._hunk_offsets.append(self._size)
+        self._hunk_start_lines.append(start_line)
+        self._hunk_file_keys.append(file_key)
+        self._size += line_count
+        self._lines_by_file = None
+
+    def location(self, offset):
+        if not isinstance(offset, int) or not 0 <= offset < self._size:
+            raise KeyError(offset)
+        i = bisect_right(self._hunk_offsets, offset) - 1
+        line_no = self._hunk_start_lines[i] + offset - self._hunk_offsets[i]
+        return self._hunk_file_keys[i], line_no
+
+    def iter_hunks(self):
+        # Yields (file_key, start_line, line_count) for each hunk in order.
+        for i, file_key in enumerate(self._hunk_file_keys):
+            end = (
+                self._hunk_offsets[i + 1]
+                if i + 1 < len(self._hunk_offsets)
+                else self._size
+            )
+            yield file_key, self._hunk_start_lines[i], end - self._hunk_offsets[i]
+
+    def iter_locations(self):
+        # Yields (file_key, line_no) for every offset in order.
+        for file_key, start_line, line_count in self.iter_hunks():
+            for line_no in range(start_line, start_line + line_count):
+                yield file_key, line_no
+
+    def changed_lines_of(self, file_key):
+        # Set of changed line numbers of a file, built once for all files.
+        if self._lines_by_file is None:
+            self._lines_by_file = {}
+            for file_key_, start_line, line_count in self.iter_hunks():
+                self._lines_by_file.setdefault(file_key_, set()).update(
+                    range(start_line, start_line + line_count)
+                )
+        return self._lines_by_file.get(file_key, frozenset())
+
+    def __getitem__(self, offset):
+        return self.location(offset)
+
+    def __iter__(self):
+        return iter(range(self._size))
+
+    def __len__(self):
+        return self._size
+
+
 class Checker:
     name = None
     help = None
+    # Whether the checker is CPU-bound Python code that should run in a
+    # separate process when checkers are executed concurrently.
+    run_in_process = False
+    # Whether the result of the checker for a file only depends on the
+    # content of the file, the configuration under config_keys and the
+    # tracked files named config_file_names. `check --all --incremental`
+    # then skips files which passed the checker before.
+    incremental = False
+    # Paths into Config used by the checker, None for the whole Config.
+    config_keys = None
+    config_file_names = ()
+    # Modules besides the one of the checker whose code decides its results.
+    helper_modules = ()
 
     def __init__(self):
         self._file_name_cache = SimpleCache()
 
+    def code_version(self):
+        """
+        Version of code outside of the checker module and helper_modules
+        which decides the results of the checker, e.g. of bundled or external
+        tools.
+        """
+        return ""
+
+    def related_files(self, filename):
+        """
+        Other files whose content the checker reads when checking |filename|.
+        """
+        return ()
+
     def check_changed_lines(self, options, lines, line_indexes, changed_files):
         pass
 
@@ -38,74 +174,39 @@ class Checker:
     def get_file_name(self, key):
         return self._file_name_cache.get(key)
 
+    def get_file_key(self, file_name):
+        return self._file_name_cache.key(file_name)
+
     def _check_changed_lines(
         self, options, changed_files, changed_lines, verbose=False
     ):
-        current_file = None
-        current_start_line = 0
-        current_lines = []
-        sections = []
-
-        def finish_section(file, start_line, lines):
-            if lines:
-                key = self._file_name_cache.set(file)
-                sections.append((key, start_line, lines))
-
-        for line in changed_lines:
-            if line.startswith("-"):
-                continue
-            elif line.startswith("+++"):
-                finish_section(current_file, current_start_line, current_lines)
-                current_lines = []
-                matches = re.match(r"\+\+\+ b/(.*)", line)
-                if not matches:
-                    continue
-                (current_file,) = matches.groups()
-            elif line.startswith("@@"):
-                finish_section(current_file, current_start_line, current_lines)
-                current_lines = []
-
-                matches = re.match(r"@@ -\d+(,\d+)? \+(\d+)(,\d+)? @@.*", line)
-                if not matches:
-                    continue
-                line_number = matches.groups()[1]
-                current_start_line = int(line_number)
-            elif line.startswith("+"):
-                current_lines.append(line[1:])
-
-        finish_section(current_file, current_start_line, current_lines)
-
-        # calculate offsets
-        line_indexes = {}
-        current_offset = -1
-        changed_lines = []
-        for section in sections:
-            # section => (file_name_index, base_line_number, lines)
+        # |changed_lines| may be any iterable of `git diff -U0` output lines,
+        # it is consumed hunk by hunk.
+        lines = []
+        line_indexes = ChangedLinesIndex()
+        for file_name, start_line, hunk_lines in iter_diff_hunks(changed_lines):
+            key = self._file_name_cache.set(file_name)
             if verbose:
-                print(f"check section {section[0]}:{section[1]}")
-            for i in range(len(section[2])):
-                current_offset += 1
-                line_indexes[current_offset] = (section[0], section[1] + i)
-            changed_lines.extend(section[2])
+                print(f"check section {key}:{start_line}")
+            line_indexes.add_hunk(key, start_line, len(hunk_lines))
+            lines.extend(hunk_lines)
 
         if verbose:
-            for i, line in enumerate(changed_lines):
+            for i, line in enumerate(lines):
                 print(f"{i}: {line}")
                 file_name_index, line_no = line_indexes[i]
                 print(self._file_name_cache.get(file_name_index) + ":" + str(line_no))
 
-        return self.check_changed_lines(
-            options, changed_lines, line_indexes, changed_files
-        )
+        return self.check_changed_lines(options, lines, line_indexes, changed_files)
 
     def run(self, options, mr, changed_files):
         if options.all:
             return self.check_changed_files(options, mr, changed_files)
         else:
             if options.changed:
-                changed_lines = mr.GetChangedLines().split("\n")
+                changed_lines = mr.IterChangedLines()
             else:
-                changed_lines = mr.GetLastCommitLines().split("\n")
+                changed_lines = mr.IterLastCommitLines()
 
             return self._check_changed_lines(
                 options, changed_files, changed_lines, options.verbose
@@ -0,0 +1,279 @@
+# Copyright 2026 The Lynx Authors. All rights reserved.
+# Licensed under the Apache License Version 2.0 that can be found in the
+# LICENSE file in the root directory of this source tree.
+import hashlib
+import importlib
+import json
+import os
+import signal
+import socket
+import sys
+import tempfile
+import traceback
+
+# Seconds between two looks at the watched files while the daemon is idle.
+POLL_INTERVAL = 1.0
+# Separates the output of a request from its exit code in the reply.
+_EXIT_MARKER = b"\0lynx-exit:"
+# Modules used by every check, imported when the daemon warms up.
+_WARM_MODULES = [
+    "checkers.checker_manager",
+    "checkers.checker_profiler",
+    "checkers.checker_scheduler",
+    "checkers.utils",
+    "utils.merge_request",
+]
+
+# Whether this process is a child of the daemon running a request.
+_in_daemon_child = False
+
+# Functions called with the repository root whenever the daemon (re)warms,
+# i.e. on start and after the configuration or the checked out tree changed,
+# as (module, function) names.
+_WARMUPS = [
+    # Lists the files of HEAD and the header candidates.
+    ("checkers.process_header_path_helper", "warmTreeCaches"),
+]
+
+
+def in_daemon_child():
+    return _in_daemon_child
+
+
+def default_socket_path(root):
+    # Unix socket paths are limited to ~100 bytes, so the socket does not go
+    # into the repository but into the temp directory.
+    digest = hashlib.sha1(os.path.abspath(root).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(
+        tempfile.gettempdir(), "lynx-daemon-%d-%s.sock" % (os.getuid(), digest)
+    )
+
+
+def _watched_files(root, git_dir):
+    return [
+        os.path.join(root, ".tools_shared"),
+        os.path.join(root, "cspell.config.yml"),
+        os.path.join(git_dir, "HEAD"),
+        os.path.join(git_dir, "index"),
+    ]
+
+
+def _mtimes(paths):
+    result = []
+    for path in paths:
+        try:
+            result.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            result.append(None)
+    return result
+
+
+def _read_message(conn):
+    data = b""
+    while not data.endswith(b"\n"):
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+    return json.loads(data.decode("utf-8")) if data.strip() else None
+
+
+class CheckerDaemon:
+    """
+    Serves `git lynx check` requests of one repository over a Unix socket.
+
+    The daemon imports the checkers and reads the configuration once. Every
+    request is run in a child forked from it, so it starts warm, and whatever
+    the checkers cache while running is dropped with the child and never
+    goes stale. The configuration files and the git HEAD and index are
+    polled, when they change the configuration is read again and the
+    warmups run again, e.g. the files of HEAD and the header candidates are
+    listed again.
+    """
+
+    def __init__(self, root, git_dir, socket_path, handler):
+        self.root = root
+        self.git_dir = git_dir
+        self.socket_path = socket_path
+        # Runs a check with a list of command line arguments, in the child.
+        self.handler = handler
+        self._watched = _watched_files(root, git_dir)
+        self._state = None
+        self._children = set()
+        self._running = False
+
+    def warm(self):
+        from checkers.checker_registry import BUILTIN_CHECKERS
+        from config import Config
+
+        Config.reset()
+        Config.init()
+        for module in _WARM_MODULES:
+            importlib.import_module(module)
+        for entry in BUILTIN_CHECKERS:
+            try:
+                entry.load()
+            except Exception as e:
+                print(f"Can not load checker {entry.name}: {e}")
+        for module, function in _WARMUPS:
+            try:
+                getattr(importlib.import_module(module), function)(self.root)
+            except Exception:
+                traceback.print_exc()
+        self._state = _mtimes(self._watched)
+
+    def _warm_if_changed(self):
+        if _mtimes(self._watched) != self._state:
+            print("Configuration or checkout changed, warming up again.")
+            self.warm()
+
+    def _reap_children(self):
+        for pid in list(self._children):
+            try:
+                done, _ = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                done = pid
+            if done:
+                self._children.discard(pid)
+
+    def serve_forever(self):
+        if os.path.exists(self.socket_path):
+            if is_daemon_running(self.socket_path):
+                print(f"A daemon is already serving {self.socket_path}")
+                return 1
+            os.remove(self.socket_path)
+        self.warm()
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+        server.listen(16)
+        server.settimeout(POLL_INTERVAL)
+        print(f"git lynx daemon serving {self.root} on {self.socket_path}")
+        self._running = True
+        try:
+            while self._running:
+                self._reap_children()
+                try:
+                    conn, _ = server.accept()
+                except socket.timeout:
+                    self._warm_if_changed()
+                    continue
+                with conn:
+                    self._handle(server, conn)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.close()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+        return 0
+
+    def _handle(self, server, conn):
+        conn.settimeout(None)
+        try:
+            request = _read_message(conn)
+        except ValueError:
+            return
+        if not request:
+            return
+        command = request.get("command")
+        if command == "ping":
+            conn.sendall(json.dumps({"root": self.root}).encode("utf-8") + b"\n")
+        elif command == "stop":
+            self._running = False
+            conn.sendall(b"stopping\n")
+        elif command == "check":
+            self._warm_if_changed()
+            pid = os.fork()
+            if pid == 0:
+                server.close()
+                self._run_child(conn, request)
+            self._children.add(pid)
+
+    def _run_child(self, conn, request):
+        global _in_daemon_child
+        _in_daemon_child = True
+        code = 1
+        try:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            os.chdir(request["cwd"])
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os.dup2(conn.fileno(), 1)
+            os.dup2(conn.fileno(), 2)
+            try:
+                code = self.handler(request["args"]) or 0
+            except SystemExit as e:
+                code = e.code if isinstance(e.code, int) else (1 if e.code else 0)
+            except Exception:
+                traceback.print_exc()
+        finally:
+            try:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                conn.sendall(_EXIT_MARKER + str(code).encode("utf-8") + b"\n")
+            finally:
+                os._exit(code)
+
+
+def _send(socket_path, request, timeout=None):
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    conn.settimeout(timeout)
+    conn.connect(socket_path)
+    conn.sendall(json.dumps(request).encode("utf-8") + b"\n")
+    return conn
+
+
+def is_daemon_running(socket_path):
+    try:
+        with _send(socket_path, {"command": "ping"}, timeout=2) as conn:
+            return _read_message(conn) is not None
+    except (OSError, ValueError):
+        return False
+
+
+def stop_daemon(socket_path):
+    try:
+        with _send(socket_path, {"command": "stop"}, timeout=2) as conn:
+            conn.recv(64)
+        return True
+    except OSError:
+        return False
+
+
+def run_in_daemon(socket_path, args, out=None):
+    """
+    Run `git lynx check |args|` in the daemon listening on |socket_path|,
+    copying its output to |out|. Returns the exit code, or None if no daemon
+    is listening.
+    """
+    out = out or sys.stdout.buffer
+    try:
+        conn = _send(
+            socket_path, {"command": "check", "cwd": os.getcwd(), "args": args}
+        )
+    except OSError:
+        return None
+    code = 1
+    with conn:
+        # Hold back what could be the start of the exit marker.
+        pending = b""
+        while True:
+            chunk = conn.recv(65536)
+            if not chunk:
+                break
+            pending += chunk
+            index = pending.rfind(_EXIT_MARKER)
+            keep = len(_EXIT_MARKER) + 8
+            if index < 0 and len(pending) > keep:
+                out.write(pending[:-keep])
+                out.flush()
+                pending = pending[-keep:]
+        index = pending.rfind(_EXIT_MARKER)
+        if index >= 0:
+            out.write(pending[:index])
+            code = int(pending[index + len(_EXIT_MARKER) :].strip() or 1)
+        else:
+            out.write(pending)
+        out.flush()
+    return code
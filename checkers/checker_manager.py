@@ -2,12 +2,12 @@
 # Licensed under the Apache License Version 2.0 that can be found in the
 # LICENSE file in the root directory of this source tree.
 
-import checkers
 import os
 import sys
 import importlib
 from config import Config
 from checkers.checker import Checker
+from checkers.checker_registry import BUILTIN_CHECKERS, CheckerEntry
 from utils.find_classes import find_classes
 from utils.merge_request import MergeRequest
 
@@ -17,10 +17,15 @@ def is_checker(cls):
 
 
 class CheckerManager:
-    def __init__(self, ignore):
-        self.checker_classes = {
-            c.name: c for c in find_classes(checkers, is_checker, recursive=False)
-        }
+    """
+    Knows the available checkers by name. Built-in checkers come from the
+    static registry and their modules are only imported when a checker is
+    loaded, external checkers are imported when they are discovered.
+    """
+
+    def __init__(self, ignore, mr=None):
+        self.mr = mr or MergeRequest()
+        self.checkers = {entry.name: entry for entry in BUILTIN_CHECKERS}
 
         self.load_external_checker()
         self.remove_ignore_checker(ignore)
@@ -32,11 +37,19 @@ class CheckerManager:
         disable_checkers = ",".join(default_disable_checkers)
         self.remove_ignore_checker(disable_checkers)
 
+    @property
+    def checker_classes(self):
+        # Imports every checker, use |checkers| to avoid that.
+        return {name: entry.load() for name, entry in self.checkers.items()}
+
+    def load_checker(self, name):
+        return self.checkers[name].load()
+
     def remove_ignore_checker(self, ignore):
-        old_checker_class = self.checker_classes
-        self.checker_classes = {
-            name: cls
-            for name, cls in old_checker_class.items()
+        old_checkers = self.checkers
+        self.checkers = {
+            name: entry
+            for name, entry in old_checkers.items()
             if name not in ignore.split(",")
         }
 
@@ -44,8 +57,7 @@ class CheckerManager:
         external_checker_path = Config.value("external-checker-path")
         if external_checker_path is None:
             return
-        mr = MergeRequest()
-        project_root = mr.GetRootDirectory()
+        project_root = self.mr.GetRootDirectory()
         abs_dir_path = os.path.abspath(external_checker_path)
         if not os.path.isdir(abs_dir_path):
             raise NotADirectoryError(f"The path {abs_dir_path} is not a directory.")
@@ -58,7 +70,7 @@ class CheckerManager:
                 external_checkers_module, is_checker, recursive=False
             )
             for c in classes:
-                self.checker_classes[c.name] = c
+                self.checkers[c.name] = CheckerEntry.from_class(c)
         except Exception as e:
             print(f"Import external checker error {e}")
 
@@ -0,0 +1,244 @@
+# Copyright 2026 The Lynx Authors. All rights reserved.
+# Licensed under the Apache License Version 2.0 that can be found in the
+# LICENSE file in the root directory of this source tree.
+import contextlib
+import json
+import subprocess
+import threading
+import time
+
+# Number of slowest files listed in the summary table.
+SLOWEST_FILES_COUNT = 10
+
+_local = threading.local()
+_lock = threading.Lock()
+# Profiles of the checkers currently running in this process.
+_active_profiles = []
+# Subprocesses that could not be attributed to a checker.
+_unattributed = {"count": 0, "time": 0.0}
+_hooks_installed = False
+
+
+class CheckerProfile:
+    """
+    Timing of one checker run: wall and CPU time of the checker itself, time
+    spent in each file for checkers that report it, and the number and total
+    wall time of the subprocesses it started.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.start = 0.0
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.subprocess_count = 0
+        self.subprocess_time = 0.0
+        # (filename, start, seconds)
+        self.files = []
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "start": self.start,
+            "wall_time": self.wall_time,
+            "cpu_time": self.cpu_time,
+            "subprocess_count": self.subprocess_count,
+            "subprocess_time": self.subprocess_time,
+            "files": self.files,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        profile = cls(data["name"])
+        profile.start = data["start"]
+        profile.wall_time = data["wall_time"]
+        profile.cpu_time = data["cpu_time"]
+        profile.subprocess_count = data["subprocess_count"]
+        profile.subprocess_time = data["subprocess_time"]
+        profile.files = [tuple(f) for f in data["files"]]
+        return profile
+
+
+def current_profile():
+    """
+    The profile of the checker running on this thread. Threads started by a
+    checker are attributed to it only if no other checker is running.
+    """
+    profile = getattr(_local, "profile", None)
+    if profile is None:
+        with _lock:
+            if len(_active_profiles) == 1:
+                profile = _active_profiles[0]
+    return profile
+
+
+def _hooked_popen_init(original):
+    def __init__(self, *args, **kwargs):
+        original(self, *args, **kwargs)
+        self._lynx_profile = current_profile()
+        self._lynx_start = time.perf_counter()
+        self._lynx_recorded = False
+
+    return __init__
+
+
+def _hooked_popen_wait(original):
+    def wait(self, *args, **kwargs):
+        returncode = original(self, *args, **kwargs)
+        if hasattr(self, "_lynx_start") and not self._lynx_recorded:
+            self._lynx_recorded = True
+            elapsed = time.perf_counter() - self._lynx_start
+            with _lock:
+                if self._lynx_profile is not None:
+                    self._lynx_profile.subprocess_count += 1
+                    self._lynx_profile.subprocess_time += elapsed
+                else:
+                    _unattributed["count"] += 1
+                    _unattributed["time"] += elapsed
+        return returncode
+
+    return wait
+
+
+def install_subprocess_hooks():
+    """
+    Count subprocesses and the time until they are waited for. Processes
+    that are only polled are not timed.
+    """
+    global _hooks_installed
+    if _hooks_installed:
+        return
+    _hooks_installed = True
+    subprocess.Popen.__init__ = _hooked_popen_init(subprocess.Popen.__init__)
+    subprocess.Popen.wait = _hooked_popen_wait(subprocess.Popen.wait)
+
+
+def unattributed_subprocesses():
+    return dict(_unattributed)
+
+
+@contextlib.contextmanager
+def profile_checker(name):
+    profile = CheckerProfile(name)
+    _local.profile = profile
+    with _lock:
+        _active_profiles.append(profile)
+    profile.start = time.time()
+    wall_start = time.perf_counter()
+    cpu_start = time.thread_time()
+    try:
+        yield profile
+    finally:
+        profile.wall_time = time.perf_counter() - wall_start
+        profile.cpu_time = time.thread_time() - cpu_start
+        with _lock:
+            _active_profiles.remove(profile)
+        _local.profile = None
+
+
+def record_file_time(filename, start, seconds):
+    profile = current_profile()
+    if profile is not None:
+        profile.files.append((filename, start, seconds))
+
+
+@contextlib.contextmanager
+def profile_file(filename):
+    # Cheap no-op unless a checker is being profiled.
+    if current_profile() is None:
+        yield
+        return
+    start = time.time()
+    wall_start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_file_time(filename, start, time.perf_counter() - wall_start)
+
+
+def print_profile_table(profiles):
+    header = "%-28s %10s %10s %8s %10s %8s" % (
+        "checker",
+        "wall(s)",
+        "cpu(s)",
+        "procs",
+        "procs(s)",
+        "files",
+    )
+    print(header)
+    print("-" * len(header))
+    for p in sorted(profiles, key=lambda p: p.wall_time, reverse=True):
+        print(
+            "%-28s %10.3f %10.3f %8d %10.3f %8d"
+            % (
+                p.name,
+                p.wall_time,
+                p.cpu_time,
+                p.subprocess_count,
+                p.subprocess_time,
+                len(p.files),
+            )
+        )
+    unattributed = unattributed_subprocesses()
+    if unattributed["count"]:
+        print(
+            "%-28s %10s %10s %8d %10.3f"
+            % ("(unattributed)", "", "", unattributed["count"], unattributed["time"])
+        )
+    files = [(seconds, p.name, f) for p in profiles for f, _, seconds in p.files]
+    if files:
+        print("\nSlowest files:")
+        for seconds, name, filename in sorted(files, reverse=True)[
+            :SLOWEST_FILES_COUNT
+        ]:
+            print("  %8.3f  %-20s %s" % (seconds, name, filename))
+
+
+def _trace_events(profiles):
+    # Chrome trace-event format, one row per checker.
+    if not profiles:
+        return []
+    origin = min(p.start for p in profiles)
+    events = []
+    for tid, p in enumerate(profiles, 1):
+        events.append(
+            {
+                "name": p.name,
+                "cat": "checker",
+                "ph": "X",
+                "pid": 1,
+                "tid": tid,
+                "ts": (p.start - origin) * 1e6,
+                "dur": p.wall_time * 1e6,
+                "args": {
+                    "cpu_time": p.cpu_time,
+                    "subprocess_count": p.subprocess_count,
+                    "subprocess_time": p.subprocess_time,
+                },
+            }
+        )
+        for filename, start, seconds in p.files:
+            events.append(
+                {
+                    "name": filename,
+                    "cat": "file",
+                    "ph": "X",
+                    "pid": 1,
+                    "tid": tid,
+                    "ts": (start - origin) * 1e6,
+                    "dur": seconds * 1e6,
+                }
+            )
+    return events
+
+
+def write_profile(profiles, path, format="json"):
+    if format == "trace":
+        data = {"traceEvents": _trace_events(profiles)}
+    else:
+        data = {
+            "checkers": [p.to_dict() for p in profiles],
+            "unattributed_subprocesses": unattributed_subprocesses(),
+        }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
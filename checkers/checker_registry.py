@@ -0,0 +1,107 @@
+# Copyright 2026 The Lynx Authors. All rights reserved.
+# Licensed under the Apache License Version 2.0 that can be found in the
+# LICENSE file in the root directory of this source tree.
+import importlib
+
+
+class CheckerEntry:
+    """
+    A checker known by its name and help text without importing its module.
+    The module is imported by load(), i.e. only for checkers which run.
+    """
+
+    def __init__(self, name, module, class_name, help, cls=None):
+        self.name = name
+        self.module = module
+        self.class_name = class_name
+        self.help = help
+        self._cls = cls
+
+    @classmethod
+    def from_class(cls, checker_class):
+        return cls(
+            checker_class.name,
+            checker_class.__module__,
+            checker_class.__name__,
+            checker_class.help,
+            checker_class,
+        )
+
+    def load(self):
+        if self._cls is None:
+            module = importlib.import_module(self.module)
+            self._cls = getattr(module, self.class_name)
+        return self._cls
+
+
+# Built-in checkers. Keep name and help in sync with the checker classes,
+# test_checker_registry verifies it.
+BUILTIN_CHECKERS = [
+    CheckerEntry(
+        "android-check-style",
+        "checkers.android_code_style_checker",
+        "AndroidCodeStyleChecker",
+        "java and kotlin code style check",
+    ),
+    CheckerEntry(
+        "api-check", "checkers.api_checker", "APIChecker", "Update api metadata"
+    ),
+    CheckerEntry(
+        "arkts-lint",
+        "checkers.arkts_lint_checker",
+        "ArkTsLintChecker",
+        "Run arkts / ts lint in harmony directory",
+    ),
+    CheckerEntry(
+        "coding-style",
+        "checkers.coding_style_checker",
+        "CodingStyleChecker",
+        "Check coding style",
+    ),
+    CheckerEntry(
+        "commit-message",
+        "checkers.commit_message_checker",
+        "CommitMessageChecker",
+        "Check style of commit message",
+    ),
+    CheckerEntry(
+        "copyright",
+        "checkers.copyright_notice_checker",
+        "CopyrightNoticeChecker",
+        "Check copyright notice",
+    ),
+    CheckerEntry(
+        "cpp-header-path",
+        "checkers.cpp_header_path_checker",
+        "CppHeaderPathChecker",
+        "Check cpp header path",
+    ),
+    CheckerEntry(
+        "cpplint", "checkers.cpplint_checker", "CpplintChecker", "Run cpplint"
+    ),
+    CheckerEntry(
+        "deps",
+        "checkers.dependency_check",
+        "DependencyChecker",
+        "Check dependency validity",
+    ),
+    CheckerEntry(
+        "file-type", "checkers.file_type_checker", "FileTypeChecker", "Check file type"
+    ),
+    CheckerEntry(
+        "gn-relative-path-check",
+        "checkers.gn_relative_path_checker",
+        "GnRelativePathChecker",
+        "Check gn files with relative path",
+    ),
+    CheckerEntry(
+        "java-lint", "checkers.java_lint_checker", "CpplintChecker", "Run java lint"
+    ),
+    CheckerEntry(
+        "macro",
+        "checkers.macro_checker",
+        "MacroChecker",
+        "Check if macro is used in c/c++/objective-c",
+    ),
+    CheckerEntry("spell", "checkers.spell_checker", "SpellChecker", "Check file type"),
+]
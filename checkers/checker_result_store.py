@@ -0,0 +1,200 @@
+# Copyright 2026 The Lynx Authors. All rights reserved.
+# Licensed under the Apache License Version 2.0 that can be found in the
+# LICENSE file in the root directory of this source tree.
+import hashlib
+import importlib
+import inspect
+import json
+import os
+
+from checkers.checker import CheckResult
+from config import Config
+
+
+def _working_tree_digest(filename):
+    try:
+        with open(filename, "rb") as f:
+            return "worktree:" + hashlib.sha1(f.read()).hexdigest()
+    except OSError:
+        return "missing"
+
+
+def checker_fingerprint(checker, file_blobs, dirty_files=()):
+    """
+    Digest of everything besides the checked files that decides the result
+    of |checker|: its code and that of its helper modules, the versions of
+    the tools it runs, its configuration and the content of the tracked
+    files configuring it. That content is the blob in HEAD, or what is in
+    the working tree for the files in |dirty_files|.
+    """
+    digest = hashlib.sha1(checker.name.encode("utf-8"))
+    code_files = [inspect.getfile(type(checker))] + [
+        importlib.import_module(module).__file__ for module in checker.helper_modules
+    ]
+    for code_file in code_files:
+        with open(code_file, "rb") as f:
+            digest.update(f.read())
+    digest.update(checker.code_version().encode("utf-8"))
+    if checker.config_keys is None:
+        config = Config.data
+    else:
+        config = [Config.value(*key) for key in checker.config_keys]
+    digest.update(json.dumps(config, sort_keys=True, default=str).encode("utf-8"))
+    for filename in sorted(file_blobs):
+        if os.path.basename(filename) in checker.config_file_names:
+            if filename in dirty_files:
+                content = _working_tree_digest(filename)
+            else:
+                content = file_blobs[filename]
+            digest.update(("%s %s\n" % (filename, content)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class CheckerResultStore:
+    """
+    Remembers the files which passed a checker, one file per checker holding
+    the fingerprint of the checker and the sorted "blob path" entries. The
+    path is part of an entry as checkers look at it too, e.g. for header
+    guards or allow lists. Entries of a checker whose fingerprint changed are
+    dropped.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _path(self, name):
+        return os.path.join(self.directory, name + ".txt")
+
+    def passed_files(self, name, fingerprint):
+        """
+        Returns the (path, blob) pairs which passed the checker.
+        """
+        try:
+            with open(self._path(name), "r", encoding="utf-8") as f:
+                lines = f.read().split("\n")
+        except OSError:
+            return set()
+        if not lines or lines[0] != fingerprint:
+            return set()
+        passed = set()
+        for line in lines[1:]:
+            blob, _, path = line.partition(" ")
+            if path:
+                passed.add((path, blob))
+        return passed
+
+    def record_passed(self, name, fingerprint, files, live_files):
+        """
+        Add the (path, blob) pairs |files| to the passed files of the checker,
+        keeping only those which are still in |live_files| so that the store
+        does not grow with every version of every file.
+        """
+        passed = (self.passed_files(name, fingerprint) & live_files) | set(files)
+        entries = sorted("%s %s" % (blob, path) for path, blob in passed)
+        path = self._path(name)
+        tmp_path = "%s.%d.tmp" % (path, os.getpid())
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write("\n".join([fingerprint] + entries) + "\n")
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Failed to write check results {path}: {e}")
+
+
+class IncrementalChecker:
+    """
+    Runs |checker| on |filenames| only, the files which did not pass it
+    before, instead of the files given to run().
+    """
+
+    def __init__(self, checker, filenames, skipped_count):
+        self.checker = checker
+        self.filenames = filenames
+        self.skipped_count = skipped_count
+        self.name = checker.name
+        self.help = checker.help
+        self.run_in_process = checker.run_in_process
+
+    def run(self, options, mr, changed_files):
+        if self.skipped_count:
+            print(f"skipping {self.skipped_count} files which passed before")
+        if not self.filenames:
+            return CheckResult.PASSED
+        return self.checker.run(options, mr, self.filenames)
+
+
+class IncrementalRun:
+    """
+    Skips, for the incremental checkers, the files whose path and blob passed
+    them before, and records the files checked by the checkers which pass.
+    The blob of a file is combined with those of its related_files(). Files
+    with uncommitted changes, or related to one, are always checked and never
+    recorded, their content is not the blob in HEAD.
+    """
+
+    def __init__(self, store, mr):
+        self.store = store
+        self.file_blobs = mr.GetAllFileBlobs()
+        self.dirty_files = set(mr.GetChangedFiles())
+        # checker name -> (fingerprint, checked (path, blob) pairs, checker)
+        self._pending = {}
+
+    def _file_entry(self, checker, filename):
+        """
+        Returns the (path, blob) pair of |filename| in HEAD for |checker|.
+        """
+        blob = self.file_blobs[filename]
+        related_blobs = [
+            self.file_blobs.get(related, "-")
+            for related in checker.related_files(filename)
+        ]
+        if related_blobs:
+            blob = "+".join([blob] + related_blobs)
+        return (filename, blob)
+
+    def _checked_entry(self, checker, filename):
+        """
+        Returns the entry of |filename| for |checker|, None if it cannot be
+        recorded as the checked content is not in HEAD.
+        """
+        if filename not in self.file_blobs or filename in self.dirty_files:
+            return None
+        for related in checker.related_files(filename):
+            if related in self.dirty_files:
+                return None
+        return self._file_entry(checker, filename)
+
+    def wrap(self, checkers, changed_files):
+        wrapped = []
+        for checker in checkers:
+            if not checker.incremental:
+                wrapped.append(checker)
+                continue
+            fingerprint = checker_fingerprint(
+                checker, self.file_blobs, self.dirty_files
+            )
+            passed = self.store.passed_files(checker.name, fingerprint)
+            filenames = []
+            checked_files = []
+            for f in changed_files:
+                entry = self._checked_entry(checker, f)
+                if entry is None:
+                    filenames.append(f)
+                elif entry not in passed:
+                    filenames.append(f)
+                    checked_files.append(entry)
+            self._pending[checker.name] = (fingerprint, checked_files, checker)
+            wrapped.append(
+                IncrementalChecker(
+                    checker, filenames, len(changed_files) - len(filenames)
+                )
+            )
+        return wrapped
+
+    def record(self, reports):
+        for report in reports:
+            if report.passed and report.name in self._pending:
+                fingerprint, files, checker = self._pending[report.name]
+                live_files = set(self._file_entry(checker, f) for f in self.file_blobs)
+                self.store.record_passed(report.name, fingerprint, files, live_files)
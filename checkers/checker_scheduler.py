@@ -0,0 +1,245 @@
+# Copyright 2026 The Lynx Authors. All rights reserved.
+# Licensed under the Apache License Version 2.0 that can be found in the
+# LICENSE file in the root directory of this source tree.
+import contextlib
+import io
+import sys
+import threading
+import traceback
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+
+from checkers.checker import CheckResult
+from checkers.checker_profiler import (
+    CheckerProfile,
+    install_subprocess_hooks,
+    profile_checker,
+)
+from checkers.utils import cutting_line, print_cutting_line
+from config import Config
+
+
+class CheckerReport:
+    def __init__(self, name, result, output="", profile=None):
+        self.name = name
+        self.result = result
+        self.output = output
+        self.profile = profile
+
+    @property
+    def passed(self):
+        return self.result == CheckResult.PASSED
+
+
+class _ThreadOutputRouter(io.TextIOBase):
+    """
+    A stand-in for sys.stdout/sys.stderr that sends writes from a capturing
+    thread to that thread's buffer and everything else to the real stream.
+    """
+
+    def __init__(self, fallback, local):
+        self._fallback = fallback
+        self._local = local
+
+    def _target(self):
+        return getattr(self._local, "buffer", None) or self._fallback
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        return self._target().write(text)
+
+    def flush(self):
+        self._target().flush()
+
+
+def _call_checker(checker, options, mr, changed_files):
+    try:
+        return checker.run(options, mr, changed_files)
+    except (Exception, SystemExit):
+        traceback.print_exc()
+        return CheckResult.FAILED
+
+
+def _run_checker(checker, options, mr, changed_files, profile=False):
+    # Returns (result, profile), the profile is None unless profiling.
+    if not profile:
+        return _call_checker(checker, options, mr, changed_files), None
+    with profile_checker(checker.name) as checker_profile:
+        result = _call_checker(checker, options, mr, changed_files)
+    return result, checker_profile
+
+
+# Whether this process is a worker of the process pool of a scheduler.
+_in_process_worker = False
+
+
+def in_process_worker():
+    """
+    Whether the checker runs in a worker of the scheduler's process pool,
+    next to other checkers using the --jobs budget. It should then not start
+    a pool of its own.
+    """
+    return _in_process_worker
+
+
+def _init_process_worker(config_data, profile=False):
+    global _in_process_worker
+    _in_process_worker = True
+    # Workers started with "spawn" do not inherit the parent's configuration.
+    Config.data = config_data
+    Config.initialized = True
+    if profile:
+        install_subprocess_hooks()
+
+
+def _run_checker_in_process(checker, options, mr, changed_files, profile=False):
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer), contextlib.redirect_stderr(buffer):
+        result, checker_profile = _run_checker(
+            checker, options, mr, changed_files, profile
+        )
+    if checker_profile:
+        checker_profile = checker_profile.to_dict()
+    return result, buffer.getvalue(), checker_profile
+
+
+class CheckerScheduler:
+    """
+    Runs checkers either one after another (jobs == 1) or concurrently.
+
+    In concurrent mode, checkers declaring run_in_process are sent to a
+    process pool and the others to a thread pool. Output printed by each
+    checker is buffered and flushed as a single block once it finishes.
+    Output written directly to the terminal by child processes (e.g. tools
+    started with subprocess.check_call) is not captured.
+
+    With profile set, every report carries a CheckerProfile.
+    """
+
+    def __init__(self, jobs=1, fail_fast=False, profile=False):
+        self.jobs = max(1, jobs or 1)
+        self.fail_fast = fail_fast
+        self.profile = profile
+
+    def run(self, checkers, options, mr, changed_files):
+        if self.profile:
+            install_subprocess_hooks()
+        if self.jobs == 1 or len(checkers) <= 1:
+            reports = self._run_sequentially(checkers, options, mr, changed_files)
+        else:
+            reports = self._run_concurrently(checkers, options, mr, changed_files)
+        self._print_summary(reports)
+        return reports
+
+    def _run_sequentially(self, checkers, options, mr, changed_files):
+        reports = []
+        for c in checkers:
+            print_cutting_line(c.name)
+            res, profile = _run_checker(c, options, mr, changed_files, self.profile)
+            print("\n[%s] %s" % (c.name, res))
+            print_cutting_line()
+            print("")
+            reports.append(CheckerReport(c.name, res, profile=profile))
+            if res != CheckResult.PASSED and self.fail_fast:
+                break
+        return reports
+
+    def _run_concurrently(self, checkers, options, mr, changed_files):
+        in_process = [c for c in checkers if c.run_in_process]
+        in_thread = [c for c in checkers if not c.run_in_process]
+        local = threading.local()
+        stdout, stderr = sys.stdout, sys.stderr
+        process_pool = None
+        if in_process:
+            process_pool = ProcessPoolExecutor(
+                max_workers=min(self.jobs, len(in_process)),
+                initializer=_init_process_worker,
+                initargs=(Config.data, self.profile),
+            )
+        thread_pool = ThreadPoolExecutor(max_workers=self.jobs)
+
+        def run_in_thread(checker):
+            buffer = io.StringIO()
+            local.buffer = buffer
+            try:
+                result, profile = _run_checker(
+                    checker, options, mr, changed_files, self.profile
+                )
+            finally:
+                local.buffer = None
+            return result, buffer.getvalue(), profile
+
+        futures = {}
+        reports = {}
+        try:
+            # Submit process-bound work before any thread starts printing.
+            for c in in_process:
+                future = process_pool.submit(
+                    _run_checker_in_process,
+                    c,
+                    options,
+                    mr,
+                    changed_files,
+                    self.profile,
+                )
+                futures[future] = c
+            sys.stdout = _ThreadOutputRouter(stdout, local)
+            sys.stderr = _ThreadOutputRouter(stderr, local)
+            for c in in_thread:
+                futures[thread_pool.submit(run_in_thread, c)] = c
+
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    c = futures[future]
+                    if future.cancelled():
+                        continue
+                    profile = None
+                    try:
+                        res, output, profile = future.result()
+                    except Exception:
+                        res, output = CheckResult.FAILED, traceback.format_exc()
+                    if isinstance(profile, dict):
+                        profile = CheckerProfile.from_dict(profile)
+                    report = CheckerReport(c.name, res, output, profile)
+                    reports[c.name] = report
+                    self._print_report(report, stdout)
+                    if not report.passed and self.fail_fast:
+                        for f in pending:
+                            f.cancel()
+        finally:
+            sys.stdout, sys.stderr = stdout, stderr
+            thread_pool.shutdown(wait=True, cancel_futures=True)
+            if process_pool:
+                process_pool.shutdown(wait=True, cancel_futures=True)
+        return [reports[c.name] for c in checkers if c.name in reports]
+
+    @staticmethod
+    def _print_report(report, stream):
+        # Write the whole block at once so that it is not interleaved with
+        # output of other checkers.
+        stream.write(
+            cutting_line(report.name)
+            + "\n"
+            + report.output
+            + "\n[%s] %s\n" % (report.name, report.result)
+            + cutting_line()
+            + "\n\n"
+        )
+        stream.flush()
+
+    @staticmethod
+    def _print_summary(reports):
+        if len(reports) <= 1:
+            return
+        print_cutting_line("summary")
+        for report in reports:
+            print("  [%s] %s" % (report.name, report.result))
+        print_cutting_line()
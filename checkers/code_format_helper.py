@@ -4,10 +4,17 @@
 # LICENSE file in the root directory of this source tree.
 
 import subprocess, sys, os
+from concurrent.futures import ThreadPoolExecutor
 from utils.merge_request import MergeRequest
 from config import Config
 from checkers.envsetup_utils import PRETTIER_FULL_NAME
 
+# Number of files passed to a single clang-format invocation.
+CLANG_FORMAT_FILES_PER_CHUNK = 50
+# Number of files passed to a single prettier invocation. Starting node and
+# resolving prettier through npx is slow, so the chunks are much larger.
+PRETTIER_FILES_PER_CHUNK = 500
+
 
 def runCommand(cmd):
     p = subprocess.Popen(
@@ -44,10 +51,37 @@ def get_check_format_command(path):
     return "clang-format -style=file"
 
 
+def format_tool_versions():
+    """
+    The versions of clang-format and of the prettier used, which decide the
+    format of the checked files as much as their configuration does.
+    """
+    versions = []
+    for command in ("clang-format", get_check_format_command(".ts")):
+        try:
+            result = subprocess.run(
+                command.split() + ["--version"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                timeout=60,
+            )
+            versions.append(result.stdout.strip())
+        except (OSError, subprocess.TimeoutExpired):
+            versions.append("")
+    return "\n".join(versions)
+
+
 def check_end_of_newline(path):
-    cmd = "tail -c1 < {}".format(path)
-    output = runCommand(cmd)
-    return len(output) == 1 and output[0] == b"\n"
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return False
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+    except OSError:
+        return False
 
 
 def check_gn_suffix(path):
@@ -72,6 +106,123 @@ def check_format(path):
     return not lines and check_end_of_newline(path)
 
 
+def is_clang_format_file(path):
+    return not check_gn_suffix(path) and get_check_format_command(path).startswith(
+        "clang-format"
+    )
+
+
+def is_prettier_file(path):
+    return not check_gn_suffix(path) and get_check_format_command(path).startswith(
+        "npx"
+    )
+
+
+def split_into_chunks(paths, chunk_size):
+    return [paths[i : i + chunk_size] for i in range(0, len(paths), chunk_size)]
+
+
+def check_clang_format_chunk(paths):
+    """
+    Check a chunk of files with a single clang-format invocation.
+
+    clang-format prints one replacements document per file, in the order of
+    the arguments. A file is well formatted if its document contains no
+    replacement and it ends with a newline.
+
+    Returns:
+      The paths in the chunk that are not well formatted.
+    """
+    result = subprocess.run(
+        ["clang-format", "-style=file", "--output-replacements-xml"] + paths,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    documents = result.stdout.split("<?xml")[1:]
+    if result.returncode != 0 or len(documents) != len(paths):
+        # Fall back to checking files one by one to find the culprit.
+        return [path for path in paths if not check_format(path)]
+    return [
+        path
+        for path, document in zip(paths, documents)
+        if "<replacement " in document or not check_end_of_newline(path)
+    ]
+
+
+def check_prettier_chunk(paths):
+    """
+    Check a chunk of files with a single prettier invocation.
+
+    prettier --list-different prints the files that are not well formatted
+    and exits with 1 if there are any. Other exit codes mean prettier could
+    not process some file, e.g. due to a syntax error.
+
+    Returns:
+      The paths in the chunk that are not well formatted.
+    """
+    cmd = "{} --list-different {}".format(
+        get_check_format_command(paths[0]), " ".join(paths)
+    )
+    result = subprocess.run(
+        cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+    )
+    if result.returncode not in (0, 1):
+        # Fall back to checking files one by one to find the culprit.
+        return [path for path in paths if not check_format(path)]
+    listed = set(
+        os.path.normpath(line.strip())
+        for line in result.stdout.splitlines()
+        if line.strip()
+    )
+    return [
+        path
+        for path in paths
+        if os.path.normpath(path) in listed or not check_end_of_newline(path)
+    ]
+
+
+def check_format_batch(paths, jobs=1):
+    """
+    Check the format of many files. clang-format and prettier files are
+    checked in chunks on a pool of |jobs| threads, other files one by one.
+
+    Returns:
+      The paths that are not well formatted, in the order of |paths|.
+    """
+    clang_format_paths = []
+    prettier_paths = []
+    other_paths = []
+    for path in paths:
+        if os.path.islink(path) and not check_gn_suffix(path):
+            continue
+        elif is_clang_format_file(path):
+            clang_format_paths.append(path)
+        elif is_prettier_file(path):
+            prettier_paths.append(path)
+        else:
+            other_paths.append(path)
+
+    failed = set()
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        futures = [
+            executor.submit(check_clang_format_chunk, chunk)
+            for chunk in split_into_chunks(
+                clang_format_paths, CLANG_FORMAT_FILES_PER_CHUNK
+            )
+        ]
+        futures += [
+            executor.submit(check_prettier_chunk, chunk)
+            for chunk in split_into_chunks(prettier_paths, PRETTIER_FILES_PER_CHUNK)
+        ]
+        for future in futures:
+            failed.update(future.result())
+    for path in other_paths:
+        if not check_format(path):
+            failed.add(path)
+    return [path for path in paths if path in failed]
+
+
 def cd_to_git_root_directory():
     dir_path = os.path.dirname(os.path.realpath(__file__))
     os.chdir(dir_path)
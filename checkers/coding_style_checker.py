@@ -13,9 +13,27 @@ from config import Config
 class CodingStyleChecker(Checker):
     name = "coding-style"
     help = "Check coding style"
+    incremental = True
+    config_keys = [
+        ("checker-config", "coding-style-checker"),
+        ("prefer_local_prettier",),
+    ]
+    config_file_names = (
+        ".clang-format",
+        ".prettierrc",
+        ".prettierrc.json",
+        ".prettierrc.yml",
+    )
+    helper_modules = (
+        "checkers.code_format_helper",
+        "checkers.envsetup_utils",
+        "checkers.format_file_filter",
+    )
+
+    def code_version(self):
+        return code_format_helper.format_tool_versions()
 
     def run(self, options, mr, changed_files):
-        failed_path = []
         print("Checking file format.")
         forbidden_suffix = Config.value(
             "checker-config", "coding-style-checker", "ignore-suffixes"
@@ -25,13 +43,17 @@ class CodingStyleChecker(Checker):
         )
         code_format_env_setup()
 
-        for filename in changed_files:
+        filenames = [
+            filename
+            for filename in changed_files
             if format_file_filter.shouldFormatFile(
                 filename, forbidden_suffix, forbidden_dirs
-            ):
-                print(f"checking {filename}")
-                if not code_format_helper.check_format(filename):
-                    failed_path.append(filename)
+            )
+        ]
+        print(f"checking {len(filenames)} files")
+        failed_path = code_format_helper.check_format_batch(
+            filenames, getattr(options, "jobs", 1) or 1
+        )
         if len(failed_path) > 0:
             print("The following file(s) do not satisfy `clang-format` or `prettier`!")
             for filename in failed_path:
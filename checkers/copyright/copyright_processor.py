@@ -5,11 +5,16 @@
 # LICENSE file in the root directory of this source tree.
 
 import argparse
+import collections
+import functools
+import io
+import itertools
 import subprocess
 import os
 import re
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
 
 # Add the path of this file to system path, so we can import log
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -31,6 +36,8 @@ class ConstVars:
         ".gradle",
     ]
     suffixes_pound_as_comment = [".gn", ".py", ".sh"]
+    # For a single str.endswith() check.
+    suffixes_supported = tuple(suffixes_slash_as_comment + suffixes_pound_as_comment)
 
     # Traverse result will be saved in this.
     file_list_unfiltered_template = "file_unfiltered_{}.list"
@@ -41,14 +48,35 @@ class ConstVars:
     # This list is such high maintenance. DARN IT.
     third_party_list_file_name = "third_party_copyright_list"
     third_party_list = []
+    # The entries of third_party_list as one alternation, compiled when the list is loaded.
+    third_party_pattern = None
+    # How many times each entry of third_party_list matched a copyright.
+    third_party_hits = collections.Counter()
 
     # TODO(yueming): Add more to block list, or load from gitignore
     # If a directory contains any of these words, it's blocked
     directory_keyword_block_list = ["/.cxx", "/build"]
 
+    # The process pool is fed with this many files at a time, so that files are processed while being listed.
+    pool_batch_size = 1024
+
+    # Copyrights are in the starting comment, so only this many characters are read from the head of a file,
+    # unless the starting comment goes on after them.
+    head_read_size = 16 * 1024
+
     class ActionType:
         CHECK = 0
         TRAVERSE = 1
+        AUDIT = 2
+
+    # The result of checking a file without changing it.
+    class FileStatus:
+        NEEDS_UPDATE = "needs update"
+        THIRD_PARTY = "third party"
+        ALREADY_NEW = "already new"
+        ESCAPED = "escaped"
+        UNREADABLE = "unreadable"
+        UNSUPPORTED = "unsupported"
 
     class TargetType:
         FILES = 1
@@ -56,6 +84,7 @@ class ConstVars:
         COMMIT = 3
         DIRECTORY = 4
         PROJ_LYNX = 5
+        RANGE = 6
 
     class ErrorCode:
         OK = 0
@@ -84,6 +113,9 @@ class Settings:
     save_lists_to_files = False
     interrupt_after_list_saved = False
 
+    # List the files of a directory with git, skipping ignored files, when the directory is in a git repository.
+    git_aware_traversal = True
+
     # Save files that have escaped to a list, so that we shall re-process them after we make some changes.
     # This could be used for both debug purpose and actual online feature.
     save_escaped_cases_to_list = False
@@ -182,17 +214,47 @@ class AbstractCodeProcessor:
 
         self.current_year = time.localtime().tm_year
 
+    def _scan_file_starting_comment(self, content):
+        """
+        Get the starting comment part in a file, and where it ends.
+        This is an abstract method for derived classes to override.
+
+        Parameters:
+        content: string contains the whole file
+        Returns:
+        string: the starting comment part.
+        int: the index of the line after the starting comment, len(content) if the comment never ends.
+        """
+        return "", 0
+
     def _get_file_starting_comment(self, content):
         """
         Get the starting comment part in a file.
-        This is an abstract method for derived classes to override.
 
         Parameters:
         content: string contains the whole file
         Returns:
         string: the starting comment part.
         """
-        return ""
+        return self._scan_file_starting_comment(content)[0]
+
+    def _read_head(self, file):
+        """
+        Read the head of a file, i.e. the beginning of the file up to the end of the starting comment.
+
+        Parameters:
+        file: the file opened for reading
+        Returns:
+        string: the head of the file
+        string: what was read after the head, the rest of the file is still in the file
+        """
+        content = file.read(ConstVars.head_read_size)
+        head_end = self._scan_file_starting_comment(content)[1]
+        if len(content) == ConstVars.head_read_size and "\n" not in content[head_end:]:
+            # The starting comment may go on after what was read, or the line ending it was cut.
+            content += file.read()
+            head_end = self._scan_file_starting_comment(content)[1]
+        return content[:head_end], content[head_end:]
 
     def _insert_copyright(self, content):
         """
@@ -243,8 +305,8 @@ class AbstractCodeProcessor:
         new_pattern = self._get_new_pattern_for_sub()
         i = 0
         for old in old_patterns:
-            updated_content = re.sub(
-                old, new_pattern.format(self._get_sub_group_index()[i]), content
+            updated_content = old.sub(
+                new_pattern.format(self._get_sub_group_index()[i]), content
             )
             i += 1
             if updated_content != content:
@@ -264,6 +326,9 @@ class AbstractCodeProcessor:
         """
         # FIXME(yueming): multi copyright, the latter ones could be lost
         #   mainly Chromium copyright in cc files
+        if ConstVars.third_party_pattern is None:
+            # No third party list loaded
+            return False
         buffer = comments
         # Here 9 means the length of "Copyright"
         while len(buffer) > 9:
@@ -281,8 +346,10 @@ class AbstractCodeProcessor:
             # slice the single line
             sliced_single_line = buffer[:newline_index]
             # log.d(sliced_single_line)
-            if any(sliced_single_line.find(e) >= 0 for e in ConstVars.third_party_list):
+            match = ConstVars.third_party_pattern.search(sliced_single_line)
+            if match:
                 # log.d("Found 3rd party copyright: {}".format(sliced_single_line))
+                ConstVars.third_party_hits[match.group(0)] += 1
                 return True
 
             # Move on the next part
@@ -300,15 +367,16 @@ class AbstractCodeProcessor:
         Match: new copyright of short version or full version if pattern matched, otherwise null
         """
         # Try short version
-        match = re.match(self._get_new_pattern_for_match(), content)
+        match = self._get_new_pattern_for_match().match(content)
         if not match:
             # Try full version
-            match = re.match(self._get_new_pattern_for_match_full(), content)
+            match = self._get_new_pattern_for_match_full().match(content)
         return match
 
     def _process_file_inner(self, file_path_name):
         """
-        read content of the file, and update the copyright if necessary
+        read the head of the file, and update the copyright if necessary.
+        The rest of the file is only read if the copyright is updated.
 
         Parameters:
         file_path_name: string of the path and the name of the file
@@ -318,24 +386,38 @@ class AbstractCodeProcessor:
         boolean: whether new copyright already exists
         string: content after substitution, could be the same if not matched any pattern
         """
-        changed = False
-        is_third_party_copyright = False
-        is_already_new = False
-        updated_content = ""
         with open(file_path_name, "r") as file:
             try:
-                content = file.read()
+                head, rest = self._read_head(file)
+                changed, is_third_party_copyright, is_already_new, updated_head = (
+                    self._process_content(head)
+                )
+                updated_content = ""
+                if changed:
+                    updated_content = updated_head + rest + file.read()
             except UnicodeDecodeError:
                 log.e("Couldn't read the file {}".format(file_path_name))
                 file.close()
                 # early return
-                return (
-                    changed,
-                    is_third_party_copyright,
-                    is_already_new,
-                    updated_content,
-                )
+                return False, False, False, ""
+        return changed, is_third_party_copyright, is_already_new, updated_content
+
+    def _process_content(self, content):
+        """
+        Update the copyright in the head of a file if necessary
 
+        Parameters:
+        content: string contains the head of the file, see _read_head()
+        Returns:
+        boolean: whether file content matches any pattern
+        boolean: whether we found 3rd-party copyright at the beginning part
+        boolean: whether new copyright already exists
+        string: content after substitution, could be the same if not matched any pattern
+        """
+        changed = False
+        is_third_party_copyright = False
+        is_already_new = False
+        updated_content = ""
         comment_part = self._get_file_starting_comment(content)
         if len(comment_part) == 0:
             # There were no comments at the beginning. We just insert the copyright.
@@ -357,9 +439,45 @@ class AbstractCodeProcessor:
                 else:
                     changed, updated_content = self._try_patterns(content)
 
-        file.close()
         return changed, is_third_party_copyright, is_already_new, updated_content
 
+    def check_file(self, file_path_name):
+        """
+        Check the copyright of a single file without changing it. Only the head of the file is read.
+
+        Parameters:
+        file_path_name: string of the path and the name of the file
+        Returns:
+        string: one of ConstVars.FileStatus
+        """
+        try:
+            with open(file_path_name, "r") as file:
+                return self.check_opened_file(file)
+        except (OSError, UnicodeDecodeError):
+            log.e("Couldn't read the file {}".format(file_path_name))
+            return ConstVars.FileStatus.UNREADABLE
+
+    def check_opened_file(self, file):
+        """
+        Check the copyright of a file opened for reading in text mode. Only the head of the file is read.
+
+        Parameters:
+        file: the file object
+        Returns:
+        string: one of ConstVars.FileStatus
+        """
+        content, _ = self._read_head(file)
+        changed, is_third_party_copyright, is_already_new, _ = self._process_content(
+            content
+        )
+        if changed:
+            return ConstVars.FileStatus.NEEDS_UPDATE
+        elif is_third_party_copyright:
+            return ConstVars.FileStatus.THIRD_PARTY
+        elif is_already_new:
+            return ConstVars.FileStatus.ALREADY_NEW
+        return ConstVars.FileStatus.ESCAPED
+
     @staticmethod
     def _process_file_inner_post(
         file_path_name,
@@ -415,34 +533,44 @@ class AbstractCodeProcessor:
 
 
 class SlashCommentCodeProcessor(AbstractCodeProcessor):
+    # The patterns are compiled once for all the processors.
+    compiled_old_patterns = [
+        re.compile(Patterns.slash_pattern_1),
+        re.compile(Patterns.slash_pattern_2),
+        re.compile(Patterns.slash_pattern_3),
+        re.compile(Patterns.slash_pattern_4),
+    ]
+    # Ignore the starting characters
+    compiled_new_pattern_for_match = re.compile(
+        Patterns.new_meta_pattern.format("[\S\s]*//", "\d{4}", "//", "//")
+    )
+    # Just use directly the pattern with no format, assuming that the copyright is at the start.
+    compiled_new_pattern_for_match_full = re.compile(
+        Patterns.new_pattern_for_match_slash_full
+    )
+
     def __init__(self):
         super().__init__()
-        self.old_patterns = [
-            Patterns.slash_pattern_1,
-            Patterns.slash_pattern_2,
-            Patterns.slash_pattern_3,
-            Patterns.slash_pattern_4,
-        ]
+        self.old_patterns = self.compiled_old_patterns
         self.new_pattern_for_sub = Patterns.new_meta_pattern.format(
             "//", "\g<{}>", "//", "//"
         )
         self.sub_group_index = Patterns.slash_substitution_group_index
-        # Ignore the starting characters
-        self.new_pattern_for_match = Patterns.new_meta_pattern.format(
-            "[\S\s]*//", "\d{4}", "//", "//"
-        )
-        # Just use directly the pattern with no format, assuming that the copyright is at the start.
-        self.new_pattern_for_match_full = Patterns.new_pattern_for_match_slash_full
+        self.new_pattern_for_match = self.compiled_new_pattern_for_match
+        self.new_pattern_for_match_full = self.compiled_new_pattern_for_match_full
         self.new_pattern_for_concat = Patterns.new_meta_pattern.format(
             "//", self.current_year, "//", "//"
         )
 
-    def _get_file_starting_comment(self, content):
+    def _scan_file_starting_comment(self, content):
         lines = content.split("\n")
         comments = []
         in_multi_line_mode = False
+        end = 0
 
         for line in lines:
+            line_start = end
+            end += len(line) + 1
             line = line.strip()
 
             if len(line) == 0:
@@ -459,6 +587,7 @@ class SlashCommentCodeProcessor(AbstractCodeProcessor):
                     comments.append(line[1:].strip())
                 else:
                     # End of comments. And the real code starts with an '*'
+                    end = line_start
                     break
             elif line.startswith("*/"):
                 # FIXME(yueming): What if '*/' was at the end of a line
@@ -467,9 +596,10 @@ class SlashCommentCodeProcessor(AbstractCodeProcessor):
                 if in_multi_line_mode:
                     comments.append(line.strip())
                 else:
+                    end = line_start
                     break
 
-        return "\n".join(comments)
+        return "\n".join(comments), min(end, len(content))
 
     def _insert_copyright(self, content):
         # Just insert at the beginning
@@ -477,31 +607,39 @@ class SlashCommentCodeProcessor(AbstractCodeProcessor):
 
 
 class PoundCommentCodeProcessor(AbstractCodeProcessor):
+    # The patterns are compiled once for all the processors.
+    compiled_old_patterns = [re.compile(Patterns.pound_pattern_1)]
+    # Ignore the starting characters
+    compiled_new_pattern_for_match = re.compile(
+        Patterns.new_meta_pattern.format("[\S\s]*#", "\d{4}", "#", "#")
+    )
+    # Just leave a dummy regex here since the case is unlikely
+    compiled_new_pattern_for_match_full = re.compile(r"This is a dummy regex")
+
     def __init__(self):
         super().__init__()
-        self.old_patterns = [Patterns.pound_pattern_1]
+        self.old_patterns = self.compiled_old_patterns
         self.new_pattern_for_sub = Patterns.new_meta_pattern.format(
             "#", "\g<{}>", "#", "#"
         )
         self.sub_group_index = Patterns.pound_substitution_group_index
-        # Ignore the starting characters
-        self.new_pattern_for_match = Patterns.new_meta_pattern.format(
-            "[\S\s]*#", "\d{4}", "#", "#"
-        )
-        # Just leave a dummy regex here since the case is unlikely
-        self.new_pattern_for_match_full = r"This is a dummy regex"
+        self.new_pattern_for_match = self.compiled_new_pattern_for_match
+        self.new_pattern_for_match_full = self.compiled_new_pattern_for_match_full
         self.new_pattern_for_concat = Patterns.new_meta_pattern.format(
             "#", self.current_year, "#", "#"
         )
         self.shebang = ""
 
-    def _get_file_starting_comment(self, content):
+    def _scan_file_starting_comment(self, content):
         lines = content.split("\n")
         shebang_checked = False
         comments = []
         in_multi_line_mode = False
+        end = 0
 
         for line in lines:
+            line_start = end
+            end += len(line) + 1
             line = line.strip()
 
             if len(line) == 0:
@@ -529,9 +667,10 @@ class PoundCommentCodeProcessor(AbstractCodeProcessor):
                 if in_multi_line_mode:
                     continue
                 else:
+                    end = line_start
                     break
 
-        return "\n".join(comments)
+        return "\n".join(comments), min(end, len(content))
 
     def _insert_copyright(self, content):
         first_next_line = content.find("\n")
@@ -579,6 +718,116 @@ class Utils:
         return string_list
 
 
+class CheckReport:
+    """
+    The status of each checked file, see ConstVars.FileStatus.
+    """
+
+    def __init__(self):
+        self.file_status = {}
+
+    def add(self, file_path_name, status):
+        self.file_status[file_path_name] = status
+
+    def files_with_status(self, status):
+        return [f for f, s in self.file_status.items() if s == status]
+
+    def counts(self):
+        counts = {}
+        for status in self.file_status.values():
+            counts[status] = counts.get(status, 0) + 1
+        return counts
+
+
+def processor_class_for_file(file_path_name):
+    """
+    Returns:
+    class: the processor for the file, or None if the suffix is not supported.
+    """
+    if not file_path_name.endswith(ConstVars.suffixes_supported):
+        return None
+    if file_path_name.endswith(tuple(ConstVars.suffixes_slash_as_comment)):
+        return SlashCommentCodeProcessor
+    return PoundCommentCodeProcessor
+
+
+def _init_worker(third_party_list):
+    # Workers started with "spawn" do not inherit the loaded list.
+    set_third_party_list(third_party_list)
+
+
+def _call_in_worker(function, file_path_name):
+    # Hand the third party hits of the worker back to the main process.
+    ConstVars.third_party_hits.clear()
+    return function(file_path_name), dict(ConstVars.third_party_hits)
+
+
+def _check_file(file_path_name):
+    processor_class = processor_class_for_file(file_path_name)
+    if processor_class is None:
+        return file_path_name, ConstVars.FileStatus.UNSUPPORTED
+    return file_path_name, processor_class().check_file(file_path_name)
+
+
+def _process_file(processor_class, file_path_name):
+    return file_path_name, processor_class().process_file(file_path_name)
+
+
+def map_files(function, file_list, jobs=1):
+    """
+    Call function on each file, in a pool of jobs processes if there are more than one.
+
+    Parameters:
+    file_list: list or iterable of files, an iterable is consumed in batches while the pool works
+    Returns:
+    list: the results in the order of file_list.
+    """
+    if jobs <= 1 or (isinstance(file_list, list) and len(file_list) <= 1):
+        return [function(f) for f in file_list]
+    results = []
+    file_iter = iter(file_list)
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_worker,
+        initargs=(ConstVars.third_party_list,),
+    ) as executor:
+        while True:
+            batch = list(itertools.islice(file_iter, ConstVars.pool_batch_size))
+            if not batch:
+                break
+            for result, hits in executor.map(
+                functools.partial(_call_in_worker, function), batch, chunksize=32
+            ):
+                results.append(result)
+                ConstVars.third_party_hits.update(hits)
+    return results
+
+
+def check_list_unfiltered(file_list, jobs=1):
+    """
+    Check a list containing files with unfiltered suffixes, without changing any file.
+
+    Parameters:
+    file_list: list or iterable of files with unfiltered suffixes
+    jobs: the number of processes checking files
+    Returns:
+    CheckReport: the status of every file
+    """
+    report = CheckReport()
+    for f, status in map_files(_check_file, file_list, jobs):
+        report.add(f, status)
+    log.i(
+        "Done checking list including {} files: {}".format(
+            len(report.file_status),
+            ", ".join(
+                "{} {}".format(status, count)
+                for status, count in sorted(report.counts().items())
+            ),
+        )
+    )
+    return report
+
+
 def list_files_in_directory(directory):
     """
     List all files under certain directory, excluding those directories in the block list
@@ -588,18 +837,104 @@ def list_files_in_directory(directory):
     Returns:
     list (of strings): file list.
     """
-    out_list = []
+    return list(walk_files_in_directory(directory))
+
+
+def is_blocked_directory(path):
+    return any(
+        path.find(block) != -1 for block in ConstVars.directory_keyword_block_list
+    )
+
+
+def walk_files_in_directory(directory):
+    """
+    Walk all files under certain directory, not descending into directories in the block list
+
+    Parameters:
+    directory (string): the directory to be traversed
+    Returns:
+    iterator (of strings): the files.
+    """
+    if is_blocked_directory(directory):
+        return
     for root, dirs, files in os.walk(directory):
-        if any(
-            root.find(block) != -1 for block in ConstVars.directory_keyword_block_list
-        ):
-            # log.d("Path skipped: {}".format(root))
-            continue
+        # Prune before descending. Every path below a blocked directory contains the keyword as well.
+        dirs[:] = [
+            d
+            for d in dirs
+            if d != ".git" and not is_blocked_directory(os.path.join(root, d))
+        ]
         # log.d("{} has {} dirs and {} files in total".format(root, len(dirs), len(files)))
         for file in files:
-            full_file_name = os.path.join(root, file)
-            out_list.append(full_file_name)
-    return out_list
+            yield os.path.join(root, file)
+
+
+def git_files_in_directory(directory):
+    """
+    List the files under certain directory known to git, i.e. tracked or untracked but not ignored.
+
+    Parameters:
+    directory (string): the directory to be traversed
+    Returns:
+    iterator (of strings): the files, nothing is yielded if the directory is not in a git repository.
+    """
+    cmd = [
+        "git",
+        "-C",
+        directory,
+        "ls-files",
+        "-z",
+        "--cached",
+        "--others",
+        "--exclude-standard",
+    ]
+    with subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    ) as process:
+        pending = b""
+        while True:
+            chunk = process.stdout.read(65536)
+            if not chunk:
+                break
+            names = (pending + chunk).split(b"\0")
+            pending = names.pop()
+            for name in names:
+                yield os.path.join(directory, os.fsdecode(name))
+        if pending:
+            yield os.path.join(directory, os.fsdecode(pending))
+
+
+def is_git_directory(directory):
+    cmd = ["git", "-C", directory, "rev-parse", "--is-inside-work-tree"]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    return result.returncode == 0 and result.stdout.strip() == "true"
+
+
+def iter_supported_files_in_directory(directory):
+    """
+    Stream the files with supported suffixes under certain directory, excluding those directories in the block
+    list. Files ignored by git are skipped if the directory is in a git repository.
+
+    Parameters:
+    directory (string): the directory to be traversed
+    Returns:
+    iterator (of strings): the files.
+    """
+    if Settings.git_aware_traversal and is_git_directory(directory):
+        if is_blocked_directory(directory):
+            return
+        for f in git_files_in_directory(directory):
+            # Deleted files are still listed until the deletion is staged, submodules are listed as directories.
+            if (
+                f.endswith(ConstVars.suffixes_supported)
+                and not is_blocked_directory(os.path.dirname(f))
+                and os.path.isfile(f)
+            ):
+                yield f
+    else:
+        for f in walk_files_in_directory(directory):
+            if f.endswith(ConstVars.suffixes_supported):
+                yield f
 
 
 def process_file_unfiltered(file_path_name):
@@ -611,17 +946,11 @@ def process_file_unfiltered(file_path_name):
     Returns:
     int: the number of files whose content has been changed, 1 or 0 in this case.
     """
-    if any(
-        file_path_name.endswith(slash) for slash in ConstVars.suffixes_slash_as_comment
-    ):
-        processor = SlashCommentCodeProcessor()
-    elif any(
-        file_path_name.endswith(pound) for pound in ConstVars.suffixes_pound_as_comment
-    ):
-        processor = PoundCommentCodeProcessor()
-    else:
+    processor_class = processor_class_for_file(file_path_name)
+    if processor_class is None:
         log.d("{} is not supported, skipping...".format(file_path_name))
         return 0
+    processor = processor_class()
 
     changed, is_third_party_copyright, is_already_new = processor.process_file(
         file_path_name
@@ -629,13 +958,14 @@ def process_file_unfiltered(file_path_name):
     return 1 if changed else 0
 
 
-def process_list_of_one_type_with_processor(file_list, processor):
+def process_list_of_one_type_with_processor(file_list, processor, jobs=1):
     """
     Process a list of files with suffixes of the same category (e.g. slash, pound), using specified processor.
 
     Parameters:
     file_list: list of files with certain suffixes of the same category.
     processor: processor to use
+    jobs: the number of processes processing files, each uses a processor of the same class
     Returns:
     int: the number of files whose content has been changed.
     """
@@ -644,8 +974,13 @@ def process_list_of_one_type_with_processor(file_list, processor):
     already_new_count = 0
     escaped_list = []
 
-    for f in file_list:
-        changed, is_third_party_copyright, is_already_new = processor.process_file(f)
+    if jobs > 1:
+        results = map_files(
+            functools.partial(_process_file, type(processor)), file_list, jobs
+        )
+    else:
+        results = [(f, processor.process_file(f)) for f in file_list]
+    for f, (changed, is_third_party_copyright, is_already_new) in results:
         if changed:
             changed_count += 1
         elif is_third_party_copyright:
@@ -672,7 +1007,7 @@ def process_list_of_one_type_with_processor(file_list, processor):
     return changed_count
 
 
-def process_lists_filtered(slash_file_list, pound_file_list):
+def process_lists_filtered(slash_file_list, pound_file_list, jobs=1):
     """
     Process two lists containing files with filtered suffixes.
     Each list contains one category of file (slash, pound).
@@ -680,6 +1015,7 @@ def process_lists_filtered(slash_file_list, pound_file_list):
     Parameters:
     slash_file_list: list of files using slash as comment
     pound_file_list: list of files using pound as comment
+    jobs: the number of processes processing files
     Returns:
     int: the number of files whose content has been changed
     """
@@ -687,29 +1023,36 @@ def process_lists_filtered(slash_file_list, pound_file_list):
     if len(slash_file_list) > 0:
         slash_processor = SlashCommentCodeProcessor()
         changed_count = changed_count + process_list_of_one_type_with_processor(
-            slash_file_list, slash_processor
+            slash_file_list, slash_processor, jobs
         )
     if len(pound_file_list) > 0:
         pound_processor = PoundCommentCodeProcessor()
         changed_count = changed_count + process_list_of_one_type_with_processor(
-            pound_file_list, pound_processor
+            pound_file_list, pound_processor, jobs
         )
     return changed_count
 
 
 def process_list_unfiltered_from_memory(
-    file_list, save_lists_to_files=False, interrupt_after_list_saved=False
+    file_list,
+    save_lists_to_files=False,
+    interrupt_after_list_saved=False,
+    jobs=1,
+    dry_run=False,
 ):
     """
     Process a list containing files with unfiltered suffixes.
     In this method, we also check if we need to save list to a file on disk and if we need to interrupt after that.
 
     Parameters:
-    file_list_of_one_suffix: list of files with unfiltered suffixes
+    file_list_of_one_suffix: list or iterable of files with unfiltered suffixes
+    jobs: the number of processes processing files
+    dry_run: only check the files and log those needing an update, without changing them
     Returns:
-    int: the number of files whose content has been changed
+    int: the number of files whose content has been changed, or needs to be changed for a dry run
     """
     if save_lists_to_files:
+        file_list = list(file_list)
         current_time = int(time.time())
         Utils.save_list_to_file(
             file_list, ConstVars.file_list_unfiltered_template.format(current_time)
@@ -717,21 +1060,32 @@ def process_list_unfiltered_from_memory(
         if interrupt_after_list_saved:
             return 0
 
-    log.i("file count: {}".format(len(file_list)))
+    if dry_run:
+        needs_update = check_list_unfiltered(file_list, jobs).files_with_status(
+            ConstVars.FileStatus.NEEDS_UPDATE
+        )
+        for f in needs_update:
+            log.i("Copyright needs update:\t{}".format(f))
+        return len(needs_update)
+
+    file_count = 0
     slash_file_list = []
     pound_file_list = []
     for f in file_list:
-        if any(f.endswith(slash) for slash in ConstVars.suffixes_slash_as_comment):
+        file_count += 1
+        processor_class = processor_class_for_file(f)
+        if processor_class is SlashCommentCodeProcessor:
             slash_file_list.append(f)
-        elif any(f.endswith(pound) for pound in ConstVars.suffixes_pound_as_comment):
+        elif processor_class is PoundCommentCodeProcessor:
             pound_file_list.append(f)
         else:
             log.d("{} is not supported, skipping...".format(f))
 
-    return process_lists_filtered(slash_file_list, pound_file_list)
+    log.i("file count: {}".format(file_count))
+    return process_lists_filtered(slash_file_list, pound_file_list, jobs)
 
 
-def process_list_unfiltered_from_disk(file_path_name):
+def process_list_unfiltered_from_disk(file_path_name, jobs=1, dry_run=False):
     """
     Load a list containing files from disk and process it
 
@@ -741,10 +1095,12 @@ def process_list_unfiltered_from_disk(file_path_name):
     int: the number of files whose content is changed
     """
     file_list = Utils.load_list_from_file(file_path_name)
-    return process_list_unfiltered_from_memory(file_list, save_lists_to_files=False)
+    return process_list_unfiltered_from_memory(
+        file_list, save_lists_to_files=False, jobs=jobs, dry_run=dry_run
+    )
 
 
-def process_commit(commit_id):
+def process_commit(commit_id, jobs=1, dry_run=False):
     """
     Process all changed files in the commit
 
@@ -776,23 +1132,180 @@ def process_commit(commit_id):
         log.e("Maybe this script is not called from the root of the repository.")
         return 0
 
-    return process_list_unfiltered_from_memory(file_list, save_lists_to_files=False)
+    return process_list_unfiltered_from_memory(
+        file_list, save_lists_to_files=False, jobs=jobs, dry_run=dry_run
+    )
 
 
-def process_directory(directory):
+def iter_added_files_in_range(revision_range):
+    """
+    List the files added by each commit in a range of commits
+
+    Parameters:
+    revision_range: the range of commits, e.g. A..B
+    Returns:
+    iterator (of tuples): commit id, file name and blob id of each added regular file
+    """
+    cmd = [
+        "git",
+        "log",
+        "--raw",
+        "--no-abbrev",
+        "--no-renames",
+        "--diff-filter=A",
+        "--format=commit %H",
+        "-z",
+        revision_range,
+    ]
+    result = subprocess.run(cmd, capture_output=True, check=True)
+    # The output is NUL separated: "commit <id>", then ":<modes> <blob ids> A" and the file name for each file.
+    tokens = iter(result.stdout.split(b"\0"))
+    commit_id = None
+    for token in tokens:
+        token = os.fsdecode(token).lstrip("\n")
+        if token.startswith("commit "):
+            commit_id = token[len("commit ") :]
+        elif token.startswith(":"):
+            file_name = os.fsdecode(next(tokens, b""))
+            _, new_mode, _, blob_id, _ = token[1:].split(" ")
+            # Skip symbolic links and submodules
+            if new_mode in ("100644", "100755"):
+                yield commit_id, file_name, blob_id
+
+
+def iter_blobs(blob_ids):
+    """
+    Read blobs from git through a single "git cat-file --batch" process
+
+    Parameters:
+    blob_ids: iterable of blob ids
+    Returns:
+    iterator (of tuples): blob id and content of each blob, the content is None if the blob is missing
+    """
+    with subprocess.Popen(
+        ["git", "cat-file", "--batch"], stdin=subprocess.PIPE, stdout=subprocess.PIPE
+    ) as process:
+        for blob_id in blob_ids:
+            process.stdin.write(blob_id.encode("ascii") + b"\n")
+            process.stdin.flush()
+            header = process.stdout.readline().split()
+            if len(header) != 3:
+                # "<id> missing"
+                yield blob_id, None
+                continue
+            size = int(header[2])
+            content = process.stdout.read(size)
+            # Skip the newline after the content
+            process.stdout.read(1)
+            yield blob_id, content
+        process.stdin.close()
+
+
+def _check_blob(item):
+    file_name, content = item
+    processor_class = processor_class_for_file(file_name)
+    if processor_class is None:
+        return ConstVars.FileStatus.UNSUPPORTED
+    if content is None:
+        return ConstVars.FileStatus.UNREADABLE
+    try:
+        # Decode like a file opened in text mode
+        with io.TextIOWrapper(io.BytesIO(content)) as file:
+            return processor_class().check_opened_file(file)
+    except UnicodeDecodeError:
+        log.e("Couldn't read the file {}".format(file_name))
+        return ConstVars.FileStatus.UNREADABLE
+
+
+def check_range(revision_range, jobs=1):
+    """
+    Check the files added by the commits in a range, reading them from git without a checkout and without changing
+    anything. Each blob is only checked once, even if several commits add it.
+
+    Parameters:
+    revision_range: the range of commits, e.g. A..B
+    jobs: the number of processes checking files
+    Returns:
+    CheckReport: the status of every added file, keyed by "<commit id>:<file name>"
+    """
+    added_files = [
+        (commit_id, file_name, blob_id)
+        for commit_id, file_name, blob_id in iter_added_files_in_range(revision_range)
+        if file_name.endswith(ConstVars.suffixes_supported)
+    ]
+    # One supported file name per blob, enough to choose the processor.
+    blob_names = {}
+    for _, file_name, blob_id in added_files:
+        blob_names.setdefault(blob_id, file_name)
+    blob_ids = list(blob_names)
+    items = (
+        (blob_names[blob_id], content) for blob_id, content in iter_blobs(blob_ids)
+    )
+    blob_status = dict(zip(blob_ids, map_files(_check_blob, items, jobs)))
+
+    report = CheckReport()
+    for commit_id, file_name, blob_id in added_files:
+        report.add("{}:{}".format(commit_id, file_name), blob_status[blob_id])
+    log.i(
+        "Done checking {} added files ({} blobs) in {}: {}".format(
+            len(added_files),
+            len(blob_ids),
+            revision_range,
+            ", ".join(
+                "{} {}".format(status, count)
+                for status, count in sorted(report.counts().items())
+            ),
+        )
+    )
+    return report
+
+
+def process_range(revision_range, jobs=1):
+    """
+    Check all files added in a range of commits. Files are read from git and never changed.
+
+    Parameters:
+    revision_range: the range of commits, e.g. A..B
+    Returns:
+    int: the number of files which need to be changed
+    """
+    try:
+        report = check_range(revision_range, jobs)
+    except subprocess.CalledProcessError as e:
+        log.e(
+            "Couldn't list the commits in {}: {}".format(
+                revision_range, os.fsdecode(e.stderr).strip()
+            )
+        )
+        return 0
+    needs_update = report.files_with_status(ConstVars.FileStatus.NEEDS_UPDATE)
+    for f in needs_update:
+        log.i("Copyright needs update:\t{}".format(f))
+    return len(needs_update)
+
+
+def process_directory(directory, jobs=1, dry_run=False):
     """
     Process all files in current directory
 
     Parameters:
     directory: the directory to be processed
+    jobs: the number of processes processing files
+    dry_run: only check the files, without changing them
     Returns:
     int: the number of files whose content is changed
     """
-    unfiltered_file_list = list_files_in_directory(directory)
+    if Settings.save_lists_to_files:
+        # The saved list is meant to be unfiltered.
+        file_list = list_files_in_directory(directory)
+    else:
+        file_list = iter_supported_files_in_directory(directory)
     return process_list_unfiltered_from_memory(
-        unfiltered_file_list,
+        file_list,
         save_lists_to_files=Settings.save_lists_to_files,
         interrupt_after_list_saved=Settings.interrupt_after_list_saved,
+        jobs=jobs,
+        dry_run=dry_run,
     )
 
 
@@ -814,7 +1327,7 @@ def locate_project_root():
     return root_directory
 
 
-def process_project_lynx():
+def process_project_lynx(jobs=1, dry_run=False):
     """
     Process all files in current "template-assembler" project
 
@@ -827,10 +1340,41 @@ def process_project_lynx():
     count = 0
     for e in ConstVars.ProjectLynxVars.directory_allow_list:
         d = os.path.join(root_directory, e)
-        count = count + process_directory(d)
+        count = count + process_directory(d, jobs, dry_run)
     return count
 
 
+def set_third_party_list(third_party_list):
+    """
+    Set the third party allowlist and compile its matcher
+
+    Parameters:
+    third_party_list: list of strings, a copyright containing any of them belongs to a third party
+    """
+    ConstVars.third_party_list = third_party_list
+    if third_party_list:
+        # Longer entries first, so that an entry containing another one is the one counted.
+        ConstVars.third_party_pattern = re.compile(
+            "|".join(
+                re.escape(e) for e in sorted(third_party_list, key=len, reverse=True)
+            )
+        )
+    else:
+        ConstVars.third_party_pattern = None
+
+
+def third_party_match_statistics():
+    """
+    Returns:
+    list of (string, int): each entry of the third party allowlist and how many times it matched a copyright,
+    the most matched first
+    """
+    return sorted(
+        ((e, ConstVars.third_party_hits[e]) for e in ConstVars.third_party_list),
+        key=lambda item: (-item[1], item[0]),
+    )
+
+
 def load_third_party_list():
     """
     Load third party allowlist from file
@@ -842,9 +1386,9 @@ def load_third_party_list():
         with open(abs_file_path, "r") as file:
             third_party_list = file.readlines()
         # Remove the newline character at the end of each line
-        ConstVars.third_party_list = [
-            line.strip() for line in third_party_list if not line.startswith("#")
-        ]
+        set_third_party_list(
+            [line.strip() for line in third_party_list if not line.startswith("#")]
+        )
     except FileExistsError:
         log.e(f"File not exist:{ConstVars.third_party_list_file_name}")
         return False
@@ -862,6 +1406,13 @@ def parse_args():
         help="check if the target files meet the requirement and update",
         action="store_true",
     )
+    actions.add_argument(
+        "--audit",
+        "-a",
+        help="check if the target files meet the requirement without "
+        "changing them, and list those needing an update",
+        action="store_true",
+    )
     actions.add_argument(
         "--traverse-only",
         "-t",
@@ -881,6 +1432,12 @@ def parse_args():
         "--list-file", "-l", help="process all the files in the given list file"
     )
     targets.add_argument("--commit", "-m", help="process files in the given commit-id")
+    targets.add_argument(
+        "--range",
+        "-r",
+        help="check files added by the commits in the given range, e.g. A..B. "
+        "Files are read from git, so no checkout is needed and no file is changed",
+    )
     targets.add_argument(
         "--directory", "-d", help="process recursively given directory"
     )
@@ -894,15 +1451,35 @@ def parse_args():
 
     parser.add_argument("--verbose", "-v", help="more logs", action="store_true")
 
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="the number of processes processing files",
+    )
+
     parser.add_argument(
         "--save-escape", help="save escaped cases to a file", action="store_true"
     )
 
+    parser.add_argument(
+        "--walk-all",
+        help="traverse directories with os.walk instead of git, including files ignored by git",
+        action="store_true",
+    )
+
+    parser.add_argument(
+        "--third-party-stats",
+        help="log how many times each third party copyright entry matched",
+        action="store_true",
+    )
+
     # Parse the arguments
     args = parser.parse_args()
 
-    # success, action_type, target_type, target
-    err_ret = False, None, None, None
+    # success, action_type, target_type, target, args
+    err_ret = False, None, None, None, None
 
     v = True if args.verbose else False
     log.init(verbose=v)
@@ -910,6 +1487,8 @@ def parse_args():
     # Retrieve the action_type
     if args.check:
         action_type = ConstVars.ActionType.CHECK
+    elif args.audit:
+        action_type = ConstVars.ActionType.AUDIT
     elif args.traverse_only:
         action_type = ConstVars.ActionType.TRAVERSE
         Settings.save_lists_to_files = True
@@ -928,6 +1507,9 @@ def parse_args():
     elif args.commit:
         target_type = ConstVars.TargetType.COMMIT
         target = args.commit
+    elif args.range:
+        target_type = ConstVars.TargetType.RANGE
+        target = args.range
     elif args.directory:
         target_type = ConstVars.TargetType.DIRECTORY
         target = args.directory
@@ -941,12 +1523,14 @@ def parse_args():
     # Advanced settings
     if args.save_escape:
         Settings.save_escaped_cases_to_list = True
+    if args.walk_all:
+        Settings.git_aware_traversal = False
 
-    return True, action_type, target_type, target
+    return True, action_type, target_type, target, args
 
 
 def main():
-    success, action_type, target_type, target = parse_args()
+    success, action_type, target_type, target, args = parse_args()
     if not success:
         log.e("Parsing arguments failed")
         return ConstVars.ErrorCode.INVALID_PARAMETER
@@ -962,14 +1546,18 @@ def main():
     if not load_third_party_list():
         return ConstVars.ErrorCode.INVALID_SETTINGS
 
+    jobs = args.jobs
+    dry_run = action_type is ConstVars.ActionType.AUDIT
     if target_type is ConstVars.TargetType.FILES:
-        process_list_unfiltered_from_memory(target)
+        process_list_unfiltered_from_memory(target, jobs=jobs, dry_run=dry_run)
     elif target_type is ConstVars.TargetType.LIST:
-        process_list_unfiltered_from_disk(target)
+        process_list_unfiltered_from_disk(target, jobs, dry_run)
     elif target_type is ConstVars.TargetType.COMMIT:
-        process_commit(target)
+        process_commit(target, jobs, dry_run)
+    elif target_type is ConstVars.TargetType.RANGE:
+        process_range(target, jobs)
     elif target_type is ConstVars.TargetType.DIRECTORY:
-        process_directory(target)
+        process_directory(target, jobs, dry_run)
     elif target_type is ConstVars.TargetType.PROJ_LYNX:
         # TODO(yueming): check this later
         log.w(
@@ -977,6 +1565,10 @@ def main():
         )
         # process_project_lynx()
 
+    if args.third_party_stats:
+        for entry, hits in third_party_match_statistics():
+            log.i("Third party copyright {}:\t{}".format(entry, hits))
+
     return ConstVars.ErrorCode.OK
 
 
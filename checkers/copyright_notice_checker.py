@@ -4,30 +4,44 @@
 # Licensed under the Apache License Version 2.0 that can be found in the
 # LICENSE file in the root directory of this source tree.
 
-import subprocess
+import os
 from checkers.checker import Checker, CheckResult
-from checkers.copyright.copyright_processor import process_list_unfiltered_from_memory
+from checkers.copyright.copyright_processor import (
+    ConstVars,
+    check_list_unfiltered,
+    load_third_party_list,
+)
+
+PROCESSOR_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "copyright", "copyright_processor.py"
+)
 
 
 class CopyrightNoticeChecker(Checker):
     name = "copyright"
     help = "Check copyright notice"
+    run_in_process = True
 
     def run(self, options, mr, changed_files):
-        changed = process_list_unfiltered_from_memory(
-            changed_files, save_lists_to_files=False
-        )
-        if changed > 0:
+        load_third_party_list()
+        report = check_list_unfiltered(changed_files)
+        needs_update = report.files_with_status(ConstVars.FileStatus.NEEDS_UPDATE)
+        if needs_update:
             print("Found files possibly not containing proper copyright notice.")
-            cmd = ["git", "diff", "--name-only"]
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            print(result.stdout)
-            print('Please run "git status" or "git diff" to check local changes.')
+            for file in needs_update:
+                print(file)
+            print(" ")
+            print("To update the copyright notice of these files, run:")
+            print(
+                "  python3 {} --check --files {}".format(
+                    PROCESSOR_PATH, " ".join(needs_update)
+                )
+            )
             print(" ")
             print("This checker is EXPERIMENTAL at the moment and may make mistakes.")
             print(
                 'If the result seems a false alarm, you shall utilize CQ Options (add "SkipChecks:copyright" in the'
-                " commit message) to skip this. Don't forget to restore local changes if necessary."
+                " commit message) to skip this."
             )
             print("Sorry for your trouble. Appreciate your help.")
             return CheckResult.FAILED
@@ -5,7 +5,9 @@ import sys
 
 import checkers.format_file_filter as format_file_filter
 from checkers.checker import Checker, CheckResult
+from checkers.checker_profiler import profile_file
 from checkers.process_header_path_helper import (
+    HeaderPathMatcher,
     shouldProcessIncludeHeader,
     findSearchHeaders,
 )
@@ -23,6 +25,7 @@ class CppHeaderPathChecker(Checker):
         result = True
         print("Checking cpp header path...")
         search_headers = findSearchHeaders()
+        matcher = HeaderPathMatcher.fromConfig()
         forbidden_suffix = Config.value(
             "checker-config", "header-path-checker", "ignore-suffixes"
         )
@@ -31,8 +34,9 @@ class CppHeaderPathChecker(Checker):
         )
         for filename in changed_files:
             if format_file_filter.shouldFormatFile(filename):
-                if shouldProcessIncludeHeader(filename, search_headers):
-                    result = False
+                with profile_file(filename):
+                    if shouldProcessIncludeHeader(filename, search_headers, matcher):
+                        result = False
         if result:
             return CheckResult.PASSED
         else:
@@ -7149,13 +7149,23 @@ def ProcessFileWithSubDirs(filename, vlevel, sub_git_dirs, extra_check_functions
     Creating a .git tmp director in sub git dirs folder,
     to prevent header guard check failed in sub git dirs directory
     """
+    CreateSubGitDirs(sub_git_dirs)
+    ProcessFile(filename, vlevel, extra_check_functions)
+    RemoveSubGitDirs(sub_git_dirs)
+
+
+# Lynx added.
+def CreateSubGitDirs(sub_git_dirs):
+    """Creates the .git tmp directories used by ProcessFileWithSubDirs."""
     for sub_git_dir in sub_git_dirs:
         if os.path.exists(sub_git_dir):
             git_dir = os.path.join(sub_git_dir, ".git")
             os.makedirs(git_dir, exist_ok=True)
 
-    ProcessFile(filename, vlevel, extra_check_functions)
 
+# Lynx added.
+def RemoveSubGitDirs(sub_git_dirs):
+    """Removes the .git tmp directories created by CreateSubGitDirs."""
     for sub_git_dir in sub_git_dirs:
         git_dir = os.path.join(sub_git_dir, ".git")
         if os.path.exists(git_dir):
@@ -7163,6 +7173,22 @@ def ProcessFileWithSubDirs(filename, vlevel, sub_git_dirs, extra_check_functions
             shutil.rmtree(git_dir)
 
 
+# Lynx added.
+def ProcessFileIsolated(filename, vlevel, extra_check_functions=[]):
+    """Lints a single file and returns only the errors it produced.
+
+    The module-wide error state is reset before processing, so this can be
+    called repeatedly from a worker process which handles several files.
+
+    Returns:
+      The list of error strings reported for |filename|.
+    """
+    _cpplint_state.ResetErrorCounts()
+    _cpplint_state.error_string_list = []
+    ProcessFile(filename, vlevel, extra_check_functions)
+    return list(_cpplint_state.error_string_list)
+
+
 def main():
     filenames = ParseArguments(sys.argv[1:])
 
@@ -0,0 +1,154 @@
+# Copyright 2026 The Lynx Authors. All rights reserved.
+# Licensed under the Apache License Version 2.0 that can be found in the
+# LICENSE file in the root directory of this source tree.
+import hashlib
+import json
+import os
+
+import checkers.cpplint as cpplint
+import checkers.header_guard_processor as header_guard_processor
+
+# Bump this when the layout of cache entries changes.
+CACHE_FORMAT_VERSION = 1
+
+
+def file_digest(path):
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def cpplint_version():
+    """
+    The version of the lint rules, i.e. a digest of the modules that decide
+    which errors are reported.
+    """
+    digest = hashlib.sha1(str(CACHE_FORMAT_VERSION).encode("utf-8"))
+    for module in (cpplint, header_guard_processor):
+        digest.update((file_digest(module.__file__) or "").encode("utf-8"))
+    return digest.hexdigest()
+
+
+class CpplintCache:
+    """
+    An on-disk cache of cpplint errors.
+
+    An entry is keyed by the content of the linted file, the content of the
+    header belonging to a source file (cpplint reads it for include checks),
+    the path of the file in its repository or sub git dir, the CPPLINT.cfg
+    files that apply to the file, the global filters and the version of
+    cpplint itself. Entries are stored one per file so that they
+    can be written from several worker processes, and the least recently
+    used ones are removed once the cache grows beyond max_bytes.
+    """
+
+    def __init__(self, cache_dir, max_bytes, version=None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.version = version or cpplint_version()
+        self._config_digests = {}
+
+    def _config_digest(self, directory):
+        # Digest of all CPPLINT.cfg files from |directory| up to the root.
+        if directory in self._config_digests:
+            return self._config_digests[directory]
+        parent = os.path.dirname(directory)
+        digest = hashlib.sha1()
+        if parent != directory:
+            digest.update(self._config_digest(parent).encode("utf-8"))
+        cfg = file_digest(os.path.join(directory, "CPPLINT.cfg"))
+        digest.update((cfg or "").encode("utf-8"))
+        self._config_digests[directory] = digest.hexdigest()
+        return self._config_digests[directory]
+
+    def key(self, filename):
+        content = file_digest(filename)
+        if content is None:
+            return None
+        abs_filename = os.path.abspath(filename)
+        base, ext = os.path.splitext(filename)
+        header = ""
+        if cpplint._IsSourceExtension(ext[1:]):
+            header = file_digest(base + ".h") or ""
+        parts = [
+            self.version,
+            filename,
+            abs_filename,
+            content,
+            header,
+            # The path from the repository root names the header guard, the
+            # root is the closest directory with a .git, e.g. a sub git dir.
+            cpplint.FileInfo(abs_filename).RepositoryName(),
+            self._config_digest(os.path.dirname(abs_filename)),
+            ",".join(cpplint._Filters()),
+        ]
+        return hashlib.sha1("\0".join(parts).encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key[2:] + ".json")
+
+    def get(self, key):
+        path = self._entry_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                errors = json.load(f)
+            # Refresh the access time used for LRU eviction.
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return errors
+
+    def put(self, key, errors):
+        path = self._entry_path(key)
+        tmp_path = "%s.%d.tmp" % (path, os.getpid())
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(errors, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Failed to write cpplint cache {path}: {e}")
+
+    def evict(self):
+        entries = []
+        total_size = 0
+        if not os.path.isdir(self.cache_dir):
+            return
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total_size += stat.st_size
+        if total_size <= self.max_bytes:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_size -= size
+
+
+def lint_file_with_cache(filename, vlevel, cache=None):
+    """
+    Lint |filename| with cpplint.ProcessFileIsolated, reusing the errors of a
+    previous run if the cache has an entry for the same inputs.
+    """
+    key = cache.key(filename) if cache else None
+    if key:
+        errors = cache.get(key)
+        if errors is not None:
+            return errors
+    errors = cpplint.ProcessFileIsolated(filename, vlevel)
+    # cpplint may fix header guards in place, the result then belongs to the
+    # old content and must not be cached.
+    if key and cache.key(filename) == key:
+        cache.put(key, errors)
+    return errors
@@ -1,16 +1,109 @@
 # Copyright 2024 The Lynx Authors. All rights reserved.
 # Licensed under the Apache License Version 2.0 that can be found in the
 # LICENSE file in the root directory of this source tree.
+import contextlib
+import io
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 import checkers.cpplint as cpplint
 import checkers.format_file_filter as format_file_filter
 from checkers.checker import Checker, CheckResult
+from checkers.checker_profiler import profile_file, record_file_time
+from checkers.checker_scheduler import in_process_worker
+from checkers.cpplint_cache import CpplintCache, cpplint_version, lint_file_with_cache
 from config import Config
 import os
 
+# Number of files sent to a worker process at once.
+FILES_PER_TASK = 8
+
+
+def lint_file(filename, cache=None):
+    """
+    Lint one file in a worker process. cpplint's own progress messages on
+    stderr are dropped, the errors are returned instead, together with the
+    start time and duration of the lint.
+    """
+    start = time.time()
+    wall_start = time.perf_counter()
+    with contextlib.redirect_stderr(io.StringIO()):
+        errors = lint_file_with_cache(filename, 0, cache)
+    return filename, errors, start, time.perf_counter() - wall_start
+
+
+def error_sort_key(filename, error):
+    # Errors look like "<filename>:<line>:  <message>  [<category>] [<level>]".
+    line = error[len(filename) + 1 :].split(":", 1)[0]
+    return (filename, int(line) if line.isdigit() else 0)
+
+
+def lint_files(filenames, sub_git_dirs, jobs, cache=None):
+    """
+    Lint files, across a pool of worker processes if jobs > 1. Each worker
+    keeps its own cpplint state. Returns the merged errors sorted by file
+    and line.
+    """
+    errors = []
+    cpplint.CreateSubGitDirs(sub_git_dirs)
+    try:
+        if jobs > 1 and len(filenames) > 1:
+            print(f"checking {len(filenames)} files with {jobs} workers")
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                results = []
+                for filename, file_errors, start, seconds in executor.map(
+                    lint_file,
+                    filenames,
+                    [cache] * len(filenames),
+                    chunksize=FILES_PER_TASK,
+                ):
+                    record_file_time(filename, start, seconds)
+                    results.append((filename, file_errors))
+        else:
+            results = []
+            for filename in filenames:
+                print(f"checking {filename}")
+                with profile_file(filename):
+                    file_errors = lint_file_with_cache(filename, 0, cache)
+                results.append((filename, file_errors))
+    finally:
+        cpplint.RemoveSubGitDirs(sub_git_dirs)
+    for filename, file_errors in results:
+        errors.extend((error_sort_key(filename, e), e) for e in file_errors)
+    return [e for _, e in sorted(errors, key=lambda item: item[0])]
+
+
+def create_cache(mr):
+    if not Config.value("checker-config", "cpplint-checker", "enable-cache"):
+        return None
+    cache_dir = Config.value("checker-config", "cpplint-checker", "cache-dir")
+    if not cache_dir:
+        git_dir = mr.GetGitDirectory()
+        if not git_dir:
+            return None
+        cache_dir = os.path.join(git_dir, "tools-shared", "cpplint-cache")
+    max_bytes = Config.value("checker-config", "cpplint-checker", "cache-max-bytes")
+    return CpplintCache(cache_dir, max_bytes)
+
 
 class CpplintChecker(Checker):
     name = "cpplint"
     help = "Run cpplint"
+    run_in_process = True
+    incremental = True
+    config_keys = [("checker-config", "cpplint-checker")]
+    config_file_names = ("CPPLINT.cfg",)
+    helper_modules = ("checkers.format_file_filter",)
+
+    def code_version(self):
+        return cpplint_version()
+
+    def related_files(self, filename):
+        # cpplint reads the header of a source file for include checks.
+        base, ext = os.path.splitext(filename)
+        if cpplint._IsSourceExtension(ext[1:]):
+            return (base + ".h",)
+        return ()
 
     def run(self, options, mr, changed_files):
         forbidden_suffix = Config.value(
@@ -23,15 +116,24 @@ class CpplintChecker(Checker):
         sub_dirs = [
             os.path.join(mr.GetRootDirectory(), sub_dir) for sub_dir in sub_git_dirs
         ]
-        for filename in changed_files:
+        filenames = [
+            filename
+            for filename in changed_files
             if format_file_filter.shouldFormatFile(
                 filename, forbidden_suffix, forbidden_dirs
-            ):
-                print(f"checking {filename}")
-                cpplint.ProcessFileWithSubDirs(filename, 0, sub_git_dirs)
-        if (cpplint.GetErrorCount()) > 0:
+            )
+        ]
+        cache = create_cache(mr)
+        jobs = getattr(options, "jobs", 1) or 1
+        if in_process_worker():
+            # The other workers of the scheduler already use the CPUs.
+            jobs = 1
+        errors = lint_files(filenames, sub_git_dirs, jobs, cache)
+        if cache:
+            cache.evict()
+        if len(errors) > 0:
             print("Please check the following errors:\n")
-            for error in cpplint.GetErrorStingList():
+            for error in errors:
                 print(("    %s" % error))
             return CheckResult.FAILED
         else:
@@ -9,7 +9,16 @@ checker_default_config = {
         "binary-files-allow-list": [],
     },
     "coding-style-checker": {"ignore-suffixes": [], "ignore-dirs": []},
-    "cpplint-checker": {"ignore-suffixes": [], "ignore-dirs": [], "sub-git-dirs": []},
+    "cpplint-checker": {
+        "ignore-suffixes": [],
+        "ignore-dirs": [],
+        "sub-git-dirs": [],
+        # Cache of lint results, stored in .git/tools-shared/cpplint-cache
+        # unless cache-dir is set.
+        "enable-cache": True,
+        "cache-dir": None,
+        "cache-max-bytes": 64 * 1024 * 1024,
+    },
     "header-path-checker": {
         "processed-file-dirs": [],
         "exclude-processed-file-dirs": [],
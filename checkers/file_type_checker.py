@@ -6,13 +6,9 @@ import os
 import subprocess
 
 from checkers.checker import Checker, CheckResult
+from checkers.checker_profiler import profile_file
 from config import Config
 
-
-BINARY_FILES_ALLOW_LIST = Config.value(
-    "checker-config", "file-type-checker", "binary-files-allow-list"
-)
-
 _LFS_FILES_CACHE = None
 _ACCEPTED_CHARS = bytearray(
     {7, 8, 9, 10, 12, 13, 27} | set(range(0x20, 0x100)) - {0x7F}
@@ -25,7 +21,10 @@ def is_binary(file_path):
 
 
 def in_allow_list(file_path):
-    for r in BINARY_FILES_ALLOW_LIST:
+    allow_list = Config.value(
+        "checker-config", "file-type-checker", "binary-files-allow-list"
+    )
+    for r in allow_list:
         if re.search(r, file_path):
             return True
     return False
@@ -50,19 +49,23 @@ def get_lfs_files():
 class FileTypeChecker(Checker):
     name = "file-type"
     help = "Check file type"
+    incremental = True
+    config_keys = [("checker-config", "file-type-checker")]
+    config_file_names = (".gitattributes",)
 
     def run(self, options, mr, changed_files):
         binary_files = []
         for filename in changed_files:
             print(f"checking {filename}")
-            if in_allow_list(filename):
-                continue
-            if os.path.isdir(filename):
-                continue
-            if is_lfs_files(filename):
-                continue
-            if is_binary(filename):
-                binary_files.append(filename)
+            with profile_file(filename):
+                if in_allow_list(filename):
+                    continue
+                if os.path.isdir(filename):
+                    continue
+                if is_lfs_files(filename):
+                    continue
+                if is_binary(filename):
+                    binary_files.append(filename)
 
         if len(binary_files) > 0:
             print("Please check the following errors:\n")
@@ -6,6 +6,7 @@
 import re
 import sys, os, subprocess
 import platform
+from concurrent.futures import ProcessPoolExecutor
 from utils.merge_request import MergeRequest
 from config import Config
 import checkers.cpplint as cpplint
@@ -41,6 +42,13 @@ _FORMAT_COMMAND = {
     ".gni": ["{} format ".format(gn_path)],
 }
 
+# Files formatted by prettier, which are formatted with a single command.
+_PRETTIER_FILE_EXTENSIONS = [".yml", ".yaml", ".ts", ".tsx"]
+# Number of files passed to a single prettier command.
+_PRETTIER_FILES_PER_COMMAND = 500
+# Number of files passed to a single clang-format or gn command.
+_FILES_PER_COMMAND = 50
+
 __FORMAT_COMMAND_NO_INSTALL = {
     ".yml": ["npx", "--quiet", "--no-install", "prettier", "-w"],
     ".yaml": ["npx", "--quiet", "--no-install", "prettier", "-w"],
@@ -102,6 +110,104 @@ def getEndWithNewlineCommand(path):
         ]
 
 
+def isPrettierFile(path):
+    return any(path.endswith(ext) for ext in _PRETTIER_FILE_EXTENSIONS)
+
+
+def isHeaderFile(path):
+    return path.endswith("h") or path.endswith("hpp")
+
+
+def isGnFile(path):
+    return path.endswith(".gn") or path.endswith(".gni")
+
+
+def _splitIntoChunks(paths, chunk_size):
+    return [paths[i : i + chunk_size] for i in range(0, len(paths), chunk_size)]
+
+
+def getPrettierFormatCommands(paths):
+    """
+    Return the commands formatting |paths| with prettier, one command per
+    chunk of files instead of one per file.
+    """
+    format_command = _FORMAT_COMMAND
+    if Config.get("prefer_local_prettier"):
+        format_command = __FORMAT_COMMAND_NO_INSTALL
+    command = format_command[_PRETTIER_FILE_EXTENSIONS[0]]
+    return [
+        command + chunk
+        for chunk in _splitIntoChunks(paths, _PRETTIER_FILES_PER_COMMAND)
+    ]
+
+
+def getGroupedFormatCommands(paths):
+    """
+    Group |paths| by formatter.
+
+    Returns:
+      The commands formatting the clang-format, gn and prettier files of
+      |paths| in chunks, and the remaining paths, which still need to be
+      formatted one by one with getFormatCommand.
+    """
+    clang_format_paths = []
+    gn_paths = []
+    prettier_paths = []
+    other_paths = []
+    for path in paths:
+        if isPrettierFile(path):
+            prettier_paths.append(path)
+        elif isGnFile(path):
+            gn_paths.append(path)
+        elif any(path.endswith(ext) for ext in _FORMAT_COMMAND):
+            other_paths.append(path)
+        else:
+            clang_format_paths.append(path)
+    commands = [
+        ["clang-format", "-i"] + chunk
+        for chunk in _splitIntoChunks(clang_format_paths, _FILES_PER_COMMAND)
+    ]
+    commands += [
+        [gn_path, "format"] + chunk
+        for chunk in _splitIntoChunks(gn_paths, _FILES_PER_COMMAND)
+    ]
+    commands += getPrettierFormatCommands(prettier_paths)
+    return commands, other_paths
+
+
+def _fixHeaderGuard(path):
+    # Level 6 is above every error confidence, so cpplint reports nothing
+    # and only fixes the header guard.
+    cpplint.ProcessFileIsolated(path, 6)
+
+
+def fixHeaderGuards(paths, jobs=1):
+    """Fix the header guards of |paths| with cpplint on |jobs| processes."""
+    sub_git_dirs = Config.value("checker-config", "cpplint-checker", "sub-git-dirs")
+    cpplint.CreateSubGitDirs(sub_git_dirs)
+    try:
+        if jobs > 1 and len(paths) > 1:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                list(executor.map(_fixHeaderGuard, paths, chunksize=8))
+        else:
+            for path in paths:
+                _fixHeaderGuard(path)
+    finally:
+        cpplint.RemoveSubGitDirs(sub_git_dirs)
+
+
+def ensureEndWithNewline(path):
+    """Append a newline to |path| if it does not end with one."""
+    with open(path, "rb+") as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() == 0:
+            f.write(b"\n")
+            return
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b"\n":
+            f.write(b"\n")
+
+
 def getFormatCommand(path):
     format_command = _FORMAT_COMMAND
 
@@ -119,7 +225,7 @@ def getFormatCommand(path):
                 return ["powershell", "-Command", f"{command_str}; {newline_command}"]
             else:
                 return command + [path] + [";"] + getEndWithNewlineCommand(path)
-    if path.endswith("h") or path.endswith("hpp"):
+    if isHeaderFile(path):
         sub_git_dirs = Config.value("checker-config", "cpplint-checker", "sub-git-dirs")
         cpplint.ProcessFileWithSubDirs(path, 6, sub_git_dirs)
     # defaults to clang-format
@@ -33,6 +33,7 @@ defined_expr := DEFINED ( LPAREN IDENT RPAREN | IDENT ) ;
 """
 from checkers.checker import Checker, CheckResult
 
+import bisect
 import os
 import re
 
@@ -58,35 +59,71 @@ def _pp_directive_kind(line):
     m = _PP_KIND_RE.match(line)
     return m.group(1) if m else None
 
-# find the corresponding if/def/ndef/elif directive lines for a given #else line number
-def _collect_upper_level_condition_lines(all_lines, else_line_no):
-    depth = 0
-    elif_lines_reversed = []
-
-    for idx in range(else_line_no - 1, 0, -1):
-        line = all_lines[idx - 1]
-        kind = _pp_directive_kind(line)
-        if kind is None:
-            continue
+# the conditional directives of a file, indexed in one forward pass.
+# for every directive it keeps the state of the innermost open #if group
+# after that directive, so that the pairing directives of any line are
+# found by a binary search instead of walking back through the file.
+class _DirectiveIndex:
+    def __init__(self, all_lines):
+        # line numbers of the directives, ascending
+        self.directive_line_nos = []
+        # (condition lines of the innermost open group, how many of them
+        # precede the directive, whether the group has seen #else),
+        # or None outside of any group
+        self.states = []
+
+        # each open group is [condition lines, else seen]
+        stack = []
+        for line_no, line in enumerate(all_lines, 1):
+            kind = _pp_directive_kind(line)
+            if kind is None:
+                continue
 
-        if kind == "endif":
-            depth += 1
-            continue
-        if kind in {"if", "ifdef", "ifndef"}:
-            if depth == 0:
-                condition_lines = [line.rstrip("\n")]
-                condition_lines.extend(reversed(elif_lines_reversed))
-                return condition_lines
-            depth -= 1
-            continue
-        if depth != 0:
-            continue
-        if kind == "elif":
-            elif_lines_reversed.append(line.rstrip("\n"))
-        elif kind == "else":
+            if kind in {"if", "ifdef", "ifndef"}:
+                stack.append([[line.rstrip("\n")], False])
+            elif kind == "elif":
+                if stack:
+                    stack[-1][0].append(line.rstrip("\n"))
+            elif kind == "else":
+                if stack:
+                    stack[-1][1] = True
+            elif kind == "endif":
+                if stack:
+                    stack.pop()
+
+            self.directive_line_nos.append(line_no)
+            if stack:
+                condition_lines, else_seen = stack[-1]
+                self.states.append((condition_lines, len(condition_lines), else_seen))
+            else:
+                self.states.append(None)
+
+    # find the corresponding if/def/ndef/elif directive lines for a given #else line number
+    def pairing_condition_lines(self, else_line_no):
+        pos = bisect.bisect_left(self.directive_line_nos, else_line_no) - 1
+        if pos < 0 or self.states[pos] is None:
+            return None
+        condition_lines, count, else_seen = self.states[pos]
+        if else_seen:
             return None
+        return condition_lines[:count]
+
+
+# the directive indexes of the files read in this run, with the mtime and
+# size of each file to notice when it changes
+_directive_indexes = {}
+
 
-    return None
+def _directive_index_of_file(file_path):
+    st = os.stat(file_path)
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _directive_indexes.get(file_path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    with open(file_path, "r", encoding="utf-8", errors="replace") as f:
+        index = _DirectiveIndex(f)
+    _directive_indexes[file_path] = (key, index)
+    return index
 
 # check if a #else directive change is illegal by checking if the 
 # condition of the enclosing #if/elif directive contains any macro that is not whitelisted
@@ -96,13 +133,12 @@ def _is_else_only_change_illegal(file_path, else_line_no):
         return True, None
  
     try:
-        with open(file_path, "r", encoding="utf-8", errors="replace") as f:
-            all_lines = f.readlines()
+        index = _directive_index_of_file(file_path)
     except Exception:
         print(f"Failed to read file {file_path}.")
         return True, None
  
-    condition_lines = _collect_upper_level_condition_lines(all_lines, else_line_no)
+    condition_lines = index.pairing_condition_lines(else_line_no)
     
     if condition_lines is None:
         print(f"Failed to find the corresponding conditional directives for #else line {else_line_no}.")
@@ -123,8 +159,9 @@ def _categorize_changed_lines(lines, line_indexes, get_file_name):
     else_only_targets = {}
     files_with_if_family = set()
 
-    for i, line in enumerate(lines):
-        file_name_index, line_no = line_indexes[i]
+    for line, (file_name_index, line_no) in zip(
+        lines, line_indexes.iter_locations()
+    ):
         file_name = get_file_name(file_name_index)
 
         if not match_file(file_name):
@@ -299,6 +336,7 @@ def match_file(filename):
 class MacroChecker(Checker):
     name = "macro"
     help = "Check if macro is used in c/c++/objective-c"
+    run_in_process = True
 
     def check_changed_lines(self, options, lines, line_indexes, changed_files):
 
@@ -324,8 +362,9 @@ class MacroChecker(Checker):
                         print("Grammar issue or script bug.")
                     result = CheckResult.FAILED
 
-        for i, line in enumerate(lines):
-            file_name_index, line_no = line_indexes[i]
+        for line, (file_name_index, line_no) in zip(
+            lines, line_indexes.iter_locations()
+        ):
             file_name = self.get_file_name(file_name_index)
             if not match_file(file_name):
                 continue
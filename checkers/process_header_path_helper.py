@@ -4,7 +4,7 @@
 # LICENSE file in the root directory of this source tree.
 
 """
-usage: process_header_path_helper.py [-h] [-pd PROCESS_DIR] [-epd EXCLUDE_PROCESS_DIR] [-sd SEARCH_DIR] [-fsd FIRST_SEARCH_PATH] [-mfs MATCH_FILE_SUFFIX] [-eh EXCLUDE_HEADER]
+usage: process_header_path_helper.py [-h] [-pd PROCESS_DIR] [-epd EXCLUDE_PROCESS_DIR] [-sd SEARCH_DIR] [-fsd FIRST_SEARCH_PATH] [-mfs MATCH_FILE_SUFFIX] [-eh EXCLUDE_HEADER] [-j JOBS]
 
 optional arguments:
   -h, --help            show this help message and exit
@@ -20,49 +20,39 @@ optional arguments:
                         The file suffixes that the header need to be processed
   -eh EXCLUDE_HEADER, --exclude-header EXCLUDE_HEADER
                         Headers that don't need to be processed
+  -j JOBS, --jobs JOBS  The number of processes rewriting files
 """
 
 import os
 import sys
 import re
 import argparse
+import functools
+import hashlib
+import json
+import shutil
 import subprocess
+from concurrent.futures import ProcessPoolExecutor
 from config import Config
 
-# Set the directory where the header path needs to be processed.
-DEFAULT_NEED_PROCESSED_FILE_DIRS = Config.value(
-    "checker-config", "header-path-checker", "processed-file-dirs"
-)
-
-# Set the directory where the header path doesn't need to be processed.
-DEFAULT_EXCLUDE_PROCESSED_FILES = Config.value(
-    "checker-config", "header-path-checker", "exclude-processed-file-dirs"
-)
-# Set the directory to find the header.
-DEFAULT_HEADER_SEARCH_DIRS = Config.value(
-    "checker-config", "header-path-checker", "header-search-paths"
-)
-# Set the prefix paths that can be omitted when including or importing header
-# files in DEFAULT_NEED_PROCESSED_FILE_DIRS files.
-HEADER_EXTEND_PREFIX_PATHS = Config.value(
-    "checker-config", "header-path-checker", "header-extend-prefixes"
-)
-# Set the paths that prioritizes lookup headers.
-DEFAULT_FIRST_SEARCH_PATHS = Config.value(
-    "checker-config", "header-path-checker", "first-header-search-paths"
-)
 # Set the file suffixes that the header need to be processed.
 DEFAULT_FILE_SUFFIX_MATCH = [".h", ".hpp", ".c", ".cc", ".cpp", ".m", ".mm"]
-# Set headers or header paths that don't need to be processed.
-DEFAULT_EXCLUDE_PROCESSED_HEADERS = Config.value(
-    "checker-config", "header-path-checker", "ignore-header-files"
-)
-# The following directories are managed by LCM
-HEADER_DIRS_MANAGED_BY_LCM = Config.value(
-    "checker-config", "header-path-checker", "header-dirs-managed-by-habitat"
-)
 # Project root directory
 ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+# The headers found by git are kept in this file of the git directory, until
+# the tree of HEAD changes.
+HEADER_CACHE_FILE = os.path.join("tools-shared", "header-candidates.json")
+# The files found by walking the habitat managed directories, kept with the
+# mtimes of the walked directories.
+HEADER_WALK_CACHE_FILE = os.path.join("tools-shared", "header-walk.json")
+# The suffixes of the search headers.
+HEADER_SUFFIXES = [".h", ".hpp"]
+
+
+def headerPathConfig(key):
+    # Read when used rather than at import, the daemon reads the
+    # configuration again without importing the checkers again.
+    return Config.value("checker-config", "header-path-checker", key)
 
 
 def formatString(string_set):
@@ -73,102 +63,325 @@ def formatString(string_set):
     return string_ret
 
 
+INCLUDE_LINE_PATTERN = re.compile(r'^ *#(include) +["].*["]')
+
+
 def isIncludeLine(include_str):
-    match = re.match(r'^ *#(include) +["].*["]', include_str)
+    match = INCLUDE_LINE_PATTERN.match(include_str)
     if match:
         return True
     return False
 
 
+@functools.lru_cache(maxsize=None)
+def compileDirsPattern(dirs):
+    # The configured dirs are regular expressions, matching the start of a
+    # path followed by "/".
+    if not dirs:
+        return None
+    return re.compile("(?:{})/".format("|".join("(?:{})".format(d) for d in dirs)))
+
+
+@functools.lru_cache(maxsize=None)
+def compileSubstringPattern(substrings):
+    if not substrings:
+        return None
+    return re.compile("|".join(re.escape(s) for s in substrings))
+
+
 def isInSpecifiedDir(file_relative_path, dirs):
-    for dir in dirs:
-        regex = r"^{}/".format(dir)
-        if re.match(regex, file_relative_path):
-            return True
-    return False
+    pattern = compileDirsPattern(tuple(dirs))
+    return bool(pattern and pattern.match(file_relative_path))
 
 
 def hasSubstring(str, substring_list):
-    for substring in substring_list:
-        if str.find(substring) != -1:
-            return True
-    return False
+    pattern = compileSubstringPattern(tuple(substring_list))
+    return bool(pattern and pattern.search(str))
+
+
+class HeaderPathMatcher:
+    """
+    The directories and files of the header path configuration, each list
+    compiled into one regular expression.
+    """
+
+    def __init__(
+        self,
+        processed_file_dirs,
+        exclude_processed_file_dirs,
+        header_search_paths,
+        ignore_header_files,
+    ):
+        self.processed_file_dirs = compileDirsPattern(tuple(processed_file_dirs))
+        self.exclude_processed_file_dirs = compileSubstringPattern(
+            tuple(exclude_processed_file_dirs)
+        )
+        self.header_search_paths = compileDirsPattern(tuple(header_search_paths))
+        self.ignore_header_files = compileSubstringPattern(tuple(ignore_header_files))
+
+    @staticmethod
+    def fromConfig():
+        return HeaderPathMatcher(
+            Config.value(
+                "checker-config", "header-path-checker", "processed-file-dirs"
+            ),
+            Config.value(
+                "checker-config", "header-path-checker", "exclude-processed-file-dirs"
+            ),
+            Config.value(
+                "checker-config", "header-path-checker", "header-search-paths"
+            ),
+            Config.value(
+                "checker-config", "header-path-checker", "ignore-header-files"
+            ),
+        )
+
+    def isInProcessedDir(self, file_name):
+        return bool(
+            self.processed_file_dirs and self.processed_file_dirs.match(file_name)
+        )
+
+    def isExcludedFile(self, file_name):
+        return bool(
+            self.exclude_processed_file_dirs
+            and self.exclude_processed_file_dirs.search(file_name)
+        )
+
+    def isInSearchPath(self, relative_path):
+        return bool(
+            self.header_search_paths and self.header_search_paths.match(relative_path)
+        )
+
+    def isIgnoredHeader(self, relative_path):
+        return bool(
+            self.ignore_header_files and self.ignore_header_files.search(relative_path)
+        )
+
+
+def runGitCommand(args):
+    result = subprocess.run(
+        ["git"] + args,
+        check=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    return result.stdout.strip()
+
+
+# Memoized per run: the files of HEAD and the git directory.
+_tree_files = None
+_git_dir = None
+
+
+def listTreeFiles():
+    global _tree_files
+    if _tree_files is None:
+        try:
+            result = subprocess.run(
+                ["git", "ls-tree", "-r", "-z", "--name-only", "HEAD"],
+                check=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+            _tree_files = [
+                name.decode("utf-8", errors="replace")
+                for name in result.stdout.split(b"\0")
+                if name
+            ]
+        except Exception as e:
+            print("An error occurred:", e)
+            _tree_files = []
+    return _tree_files
+
+
+def gitDirectory():
+    global _git_dir
+    if _git_dir is None:
+        _git_dir = runGitCommand(["rev-parse", "--git-common-dir"])
+    return _git_dir
+
+
+def warmTreeCaches(root):
+    """
+    Lists the files of HEAD in |root| again and brings the header candidates
+    cache up to date, for a daemon forking the checks from this process.
+    """
+    global _tree_files, _git_dir
+    _tree_files = None
+    _git_dir = None
+    old_cwd = os.getcwd()
+    os.chdir(root)
+    try:
+        listTreeFiles()
+        # Absolute, the checks may run in another directory than |root|.
+        _git_dir = os.path.abspath(gitDirectory())
+        findHeaderCandidatesByGitCached(headerPathConfig("header-search-paths"))
+    finally:
+        os.chdir(old_cwd)
+
+
+def removeTmpFile(tmp_path):
+    try:
+        os.remove(tmp_path)
+    except OSError:
+        pass
+
+
+def writeJsonCache(cache_path, data):
+    tmp_path = "{}.{}.tmp".format(cache_path, os.getpid())
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        removeTmpFile(tmp_path)
+        print("Failed to write cache {}: {}".format(cache_path, e))
+    except BaseException:
+        removeTmpFile(tmp_path)
+        raise
+
+
+def filterTreeFiles(dirs, suffixes):
+    if not dirs:
+        return []
+    pattern = re.compile(r"^({})/".format(formatString(dirs)))
+    suffixes = tuple(suffixes)
+    return [
+        file
+        for file in listTreeFiles()
+        if file.endswith(suffixes) and pattern.match(file)
+    ]
+
+
+def walkDir(dir):
+    files = []
+    dir_mtimes = {}
+    for dirpath, dirnames, filenames in os.walk(os.path.join(ROOT_DIR, dir)):
+        dir_mtimes[dirpath] = os.stat(dirpath).st_mtime_ns
+        files += [
+            os.path.join(dirpath, file).replace(ROOT_DIR + "/", "")
+            for file in filenames
+        ]
+    return files, dir_mtimes
+
+
+def isWalkUpToDate(dir_mtimes):
+    # Adding, removing or renaming an entry changes the mtime of its
+    # directory, so the walk is up to date while no directory changed.
+    for dirpath, mtime in dir_mtimes.items():
+        try:
+            if os.stat(dirpath).st_mtime_ns != mtime:
+                return False
+        except OSError:
+            return False
+    return bool(dir_mtimes)
 
 
 def findHeaderCandidatesByOsWalk(dirs):
+    if not dirs:
+        return []
+    try:
+        cache_path = os.path.join(gitDirectory(), HEADER_WALK_CACHE_FILE)
+    except Exception:
+        cache_path = None
+    cache = {}
+    if cache_path:
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            pass
+    if not isinstance(cache, dict):
+        cache = {}
     file_path_list = []
+    changed = False
     for dir in dirs:
-        for dirpath, dirname, files in os.walk(os.path.join(ROOT_DIR, dir)):
-            file_paths = [
-                os.path.join(dirpath, file).replace(ROOT_DIR + "/", "")
-                for file in files
-            ]
-            file_path_list += file_paths
+        entry = cache.get(dir)
+        if not (isinstance(entry, dict) and isWalkUpToDate(entry.get("mtimes", {}))):
+            files, dir_mtimes = walkDir(dir)
+            entry = cache[dir] = {"files": files, "mtimes": dir_mtimes}
+            changed = True
+        file_path_list += entry["files"]
+    if cache_path and changed:
+        writeJsonCache(cache_path, cache)
     return file_path_list
 
 
 def findHeaderCandidatesByGit(dirs):
+    return filterTreeFiles(dirs, HEADER_SUFFIXES)
+
+
+def findHeaderCandidatesByGitCached(dirs):
     if not dirs:
         return []
-    search_dir = formatString(dirs)
-    header_candidates = []
-    cmd = "git ls-tree -r HEAD --name-only | grep -E '^({})/.*(.h|.hpp)$'".format(
-        search_dir
-    )
     try:
-        result = subprocess.run(
-            cmd,
-            shell=True,
-            check=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
-        header_candidates = list(result.stdout.strip().split("\n"))
-    except Exception as e:
-        print("An error occurred:", e)
-    return header_candidates
+        tree = runGitCommand(["rev-parse", "HEAD^{tree}"])
+        cache_path = os.path.join(gitDirectory(), HEADER_CACHE_FILE)
+    except Exception:
+        return findHeaderCandidatesByGit(dirs)
+    dirs_key = hashlib.sha1(json.dumps(dirs).encode("utf-8")).hexdigest()
+    cache = {}
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        if dirs_key in cache["headers"] and cache["tree"] == tree:
+            return cache["headers"][dirs_key]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    headers = findHeaderCandidatesByGit(dirs)
+    if cache.get("tree") != tree or not isinstance(cache.get("headers"), dict):
+        cache = {"tree": tree, "headers": {}}
+    cache["headers"][dirs_key] = headers
+    writeJsonCache(cache_path, cache)
+    return headers
 
 
 def findHeaderCandidates(dirs):
     get_header_by_oswalk = []
     get_header_by_git = []
+    # The directories managed by LCM are not tracked by git.
+    managed_dirs = headerPathConfig("header-dirs-managed-by-habitat")
     for dir in dirs:
-        if isInSpecifiedDir(dir, HEADER_DIRS_MANAGED_BY_LCM):
+        if isInSpecifiedDir(dir, managed_dirs):
             get_header_by_oswalk.append(dir)
         else:
             get_header_by_git.append(dir)
     return findHeaderCandidatesByOsWalk(
         get_header_by_oswalk
-    ) + findHeaderCandidatesByGit(get_header_by_git)
+    ) + findHeaderCandidatesByGitCached(get_header_by_git)
 
 
 def findAllFiles(dirs):
-    if not dirs:
-        return []
-    search_dir = formatString(dirs)
-    file_suffix = formatString(DEFAULT_FILE_SUFFIX_MATCH)
-    file_candidates = []
-    cmd = "git ls-tree -r HEAD --name-only | grep -E '^({})/.*({})$'".format(
-        search_dir, file_suffix
-    )
-    try:
-        result = subprocess.run(
-            cmd,
-            shell=True,
-            check=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
-        file_candidates = list(result.stdout.strip().split("\n"))
-    except Exception as e:
-        print("An error occurred:", e)
-    return file_candidates
+    return filterTreeFiles(dirs, DEFAULT_FILE_SUFFIX_MATCH)
+
+
+class HeaderIndex:
+    """
+    The search headers grouped by file name, so that the candidates of an
+    include are found without going through all the headers. Candidates keep
+    the order of the headers, closest_match() depends on it.
+    """
+
+    def __init__(self, headers):
+        self.headers = headers
+        self.headers_by_name = {}
+        for header in headers:
+            self.headers_by_name.setdefault(os.path.basename(header), []).append(header)
+
+    def candidates(self, relative_path):
+        headers = self.headers_by_name.get(os.path.basename(relative_path), [])
+        return [header for header in headers if header.endswith(relative_path)]
 
 
 def findSearchHeaders():
-    return findHeaderCandidates(DEFAULT_HEADER_SEARCH_DIRS + HEADER_DIRS_MANAGED_BY_LCM)
+    return HeaderIndex(
+        findHeaderCandidates(
+            headerPathConfig("header-search-paths")
+            + headerPathConfig("header-dirs-managed-by-habitat")
+        )
+    )
 
 
 def closest_match(paths, target):
@@ -184,7 +397,9 @@ def closest_match(paths, target):
 def is_correct_path(old_path, full_path):
     prefix_path = full_path.partition(old_path)[0]
     is_correct = False
-    for prefix_search_path in HEADER_EXTEND_PREFIX_PATHS:
+    # The prefix paths that can be omitted when including or importing
+    # header files in the processed files.
+    for prefix_search_path in headerPathConfig("header-extend-prefixes"):
         partitions = prefix_path.lower().partition(prefix_search_path.lower())
         if len(partitions[0]) == 0 and len(partitions[2].replace(os.sep, "")) == 0:
             is_correct = True
@@ -192,24 +407,18 @@ def is_correct_path(old_path, full_path):
     return is_correct
 
 
-def replaceFullPath(
-    file, include_str, search_headers, search_dir, exclude_processed_headers
-):
+def replaceFullPath(file, include_str, search_headers, matcher):
     str_list = re.split(r'(["])', include_str)
     relative_path = str_list[2]
     path_candidates = []
 
-    if isInSpecifiedDir(relative_path, search_dir):
+    if matcher.isInSearchPath(relative_path):
         return include_str, path_candidates
 
-    if hasSubstring(relative_path, exclude_processed_headers):
+    if matcher.isIgnoredHeader(relative_path):
         return include_str, path_candidates
 
-    for header in search_headers:
-        if header.endswith(relative_path) and os.path.basename(
-            relative_path
-        ) == os.path.basename(header):
-            path_candidates.append(header)
+    path_candidates = search_headers.candidates(relative_path)
     if path_candidates:
         str_list[2] = closest_match(path_candidates, file)
         if not is_correct_path(relative_path, str_list[2]):
@@ -217,46 +426,101 @@ def replaceFullPath(
     return include_str, path_candidates
 
 
+def rewriteFile(file, content):
+    # Write to a temporary file first and replace, so that the file is
+    # never left half written.
+    tmp_file = "{}.{}.tmp".format(file, os.getpid())
+    try:
+        with open(tmp_file, "w", newline="") as f:
+            f.write(content)
+        shutil.copymode(file, tmp_file)
+        os.replace(tmp_file, file)
+    except BaseException:
+        removeTmpFile(tmp_file)
+        raise
+
+
+def processIncludeHeaderOfFile(file, search_headers, matcher):
+    """
+    Complete the include paths of |file|, returns the number of rewritten
+    includes. The file is only written if an include changed.
+    """
+    with open(file, "r", newline="") as context:
+        lines = context.readlines()
+    rewritten = 0
+    for idx, line in enumerate(lines):
+        if isIncludeLine(line):
+            lines[idx], _ = replaceFullPath(file, line, search_headers, matcher)
+            if lines[idx] != line:
+                rewritten += 1
+    if rewritten:
+        rewriteFile(file, "".join(lines))
+    return rewritten
+
+
+# The arguments of processIncludeHeaderOfFile() besides the file, set once
+# in each worker process instead of being sent with every file.
+_worker_args = None
+
+
+def initProcessWorker(*args):
+    global _worker_args
+    _worker_args = args
+
+
+def processIncludeHeaderInWorker(file):
+    try:
+        return file, processIncludeHeaderOfFile(file, *_worker_args), None
+    except (OSError, UnicodeDecodeError) as e:
+        return file, 0, str(e)
+
+
 def processIncludeHeader(
     files,
     search_headers,
-    search_dir,
+    matcher,
     match_file_suffix,
-    exclude_processed_headers,
-    exclude_processed_file_dirs,
+    jobs=1,
 ):
-    for file in files:
-        if hasSubstring(file, exclude_processed_file_dirs):
-            continue
-        file_suffix = os.path.splitext(file)[-1]
-        if file_suffix not in match_file_suffix:
-            continue
-
-        lines = []
-        with open(file, "r") as context:
-            lines = context.readlines()
-            for idx, line in enumerate(lines):
-                if isIncludeLine(line):
-                    lines[idx], _ = replaceFullPath(
-                        file,
-                        line,
-                        search_headers,
-                        search_dir,
-                        exclude_processed_headers,
-                    )
-            context.close()
-        with open(file, "w") as f:
-            f.writelines(lines)
-            f.close()
-
-
-def shouldProcessIncludeHeader(file_name, search_headers):
+    """
+    Complete the include paths of |files| with |jobs| processes, returns a
+    dict from each rewritten file to its number of rewritten includes.
+    """
+    files = [
+        file
+        for file in files
+        if not matcher.isExcludedFile(file)
+        and os.path.splitext(file)[-1] in match_file_suffix
+    ]
+    worker_args = (search_headers, matcher)
+    if jobs > 1 and len(files) > 1:
+        with ProcessPoolExecutor(
+            max_workers=jobs, initializer=initProcessWorker, initargs=worker_args
+        ) as executor:
+            results = list(
+                executor.map(processIncludeHeaderInWorker, files, chunksize=16)
+            )
+    else:
+        initProcessWorker(*worker_args)
+        results = [processIncludeHeaderInWorker(file) for file in files]
+
+    rewritten_files = {}
+    for file, rewritten, error in results:
+        if error:
+            print("Failed to process {}: {}".format(file, error))
+        elif rewritten:
+            rewritten_files[file] = rewritten
+    return rewritten_files
+
+
+def shouldProcessIncludeHeader(file_name, search_headers, matcher=None):
     # print("checking {} include header path.".format(file_name))
+    matcher = matcher or HeaderPathMatcher.fromConfig()
 
-    if not isInSpecifiedDir(file_name, DEFAULT_NEED_PROCESSED_FILE_DIRS):
+    if not matcher.isInProcessedDir(file_name):
         return False
 
-    if hasSubstring(file_name, DEFAULT_EXCLUDE_PROCESSED_FILES):
+    if matcher.isExcludedFile(file_name):
         return False
 
     file = os.path.join(ROOT_DIR, file_name)
@@ -270,11 +534,7 @@ def shouldProcessIncludeHeader(file_name, search_headers):
         for idx, line in enumerate(lines):
             if isIncludeLine(line):
                 new_line, header_candidates = replaceFullPath(
-                    file,
-                    line,
-                    search_headers,
-                    DEFAULT_HEADER_SEARCH_DIRS,
-                    DEFAULT_EXCLUDE_PROCESSED_HEADERS,
+                    file, line, search_headers, matcher
                 )
                 if header_candidates:
                     str_list = re.split(r'(["])', line)
@@ -299,7 +559,7 @@ def main():
         "--process-dir",
         type=list,
         required=False,
-        default=DEFAULT_NEED_PROCESSED_FILE_DIRS,
+        default=headerPathConfig("processed-file-dirs"),
         help="The directory where the header path needs to be processed",
     )
     parser.add_argument(
@@ -307,7 +567,7 @@ def main():
         "--exclude-process-dir",
         type=list,
         required=False,
-        default=DEFAULT_EXCLUDE_PROCESSED_FILES,
+        default=headerPathConfig("exclude-processed-file-dirs"),
         help="The directory where the header path doesn't need to be processed",
     )
     parser.add_argument(
@@ -315,7 +575,8 @@ def main():
         "--search-dir",
         type=list,
         required=False,
-        default=DEFAULT_HEADER_SEARCH_DIRS + HEADER_DIRS_MANAGED_BY_LCM,
+        default=headerPathConfig("header-search-paths")
+        + headerPathConfig("header-dirs-managed-by-habitat"),
         help="The directory to find the header",
     )
     parser.add_argument(
@@ -323,7 +584,7 @@ def main():
         "--first-search-path",
         type=list,
         required=False,
-        default=DEFAULT_FIRST_SEARCH_PATHS,
+        default=headerPathConfig("first-header-search-paths"),
         help="The paths that prioritizes lookup headers",
     )
     parser.add_argument(
@@ -339,9 +600,17 @@ def main():
         "--exclude-header",
         type=list,
         required=False,
-        default=DEFAULT_EXCLUDE_PROCESSED_HEADERS,
+        default=headerPathConfig("ignore-header-files"),
         help="Headers that don't need to be processed",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        required=False,
+        default=os.cpu_count() or 1,
+        help="The number of processes rewriting files",
+    )
     args = parser.parse_args()
 
     search_dir = args.search_dir
@@ -355,16 +624,24 @@ def main():
     first_search_headers = findHeaderCandidates(first_search_paths)
     search_headers = findHeaderCandidates(search_dir)
     search_headers.sort()
-    search_headers = first_search_headers + search_headers
+    search_headers = HeaderIndex(first_search_headers + search_headers)
     need_fix_files = findAllFiles(need_processed_file_dirs)
 
-    processIncludeHeader(
-        need_fix_files,
-        search_headers,
+    matcher = HeaderPathMatcher(
+        need_processed_file_dirs,
+        exclude_processed_file_dirs,
         search_dir,
-        match_file_suffix,
         exclude_processed_headers,
-        exclude_processed_file_dirs,
+    )
+    rewritten_files = processIncludeHeader(
+        need_fix_files, search_headers, matcher, match_file_suffix, args.jobs
+    )
+    for file in sorted(rewritten_files):
+        print("{}: {} includes rewritten".format(file, rewritten_files[file]))
+    print(
+        "Rewrote {} includes in {} of {} files.".format(
+            sum(rewritten_files.values()), len(rewritten_files), len(need_fix_files)
+        )
     )
     return 0
 
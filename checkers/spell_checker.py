@@ -34,6 +34,23 @@ BASE_COMMAND = [
 class SpellChecker(Checker):
     name = "spell"
     help = "Check file type"
+    incremental = True
+    config_keys = []
+    config_file_names = (CSPELL_CONFIG_FILE,)
+    helper_modules = ("checkers.utils",)
+
+    def code_version(self):
+        try:
+            result = subprocess.run(
+                ["npx", "--no-install", "cspell", "--version"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                timeout=60,
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return ""
+        return result.stdout.strip()
 
     def check_changed_lines(self, options, lines, line_indexes, changed_files):
         with open(CSPELL_CONFIG_FILE, "r") as f:
@@ -42,8 +59,9 @@ class SpellChecker(Checker):
         tmp_lines = lines
         lines = []
         ignored_files = dict()
-        for i, line in enumerate(tmp_lines):
-            file_name_index, line_no = line_indexes[i]
+        for line, (file_name_index, line_no) in zip(
+            tmp_lines, line_indexes.iter_locations()
+        ):
             file_name = self.get_file_name(file_name_index)
 
             if match_globs(file_name, config.get("ignorePaths", [])):
@@ -75,7 +93,7 @@ class SpellChecker(Checker):
                     continue
                 offset, message = match.groups()
                 offset = int(offset) - 1
-                file_name_index, line_no = line_indexes[offset]
+                file_name_index, line_no = line_indexes.location(offset)
                 file_name = self.get_file_name(file_name_index)
 
                 print(r"%s:%d%s" % (file_name, line_no, message))
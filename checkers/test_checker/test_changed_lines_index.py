@@ -0,0 +1,119 @@
+# Copyright 2026 The Lynx Authors. All rights reserved.
+# Licensed under the Apache License Version 2.0 that can be found in the
+# LICENSE file in the root directory of this source tree.
+
+import sys
+from pathlib import Path
+
+# a bit hacky, py needs to search for the checkers module
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from checkers.checker import ChangedLinesIndex, Checker, iter_diff_hunks
+
+# `git diff -U0` of two files: a.cc gets two hunks next to each other, the
+# second one replacing a line, b.cc loses a line and gets one added.
+DIFF = """\
+diff --git a/a.cc b/a.cc
+index 1111111..2222222 100644
+--- a/a.cc
++++ b/a.cc
+@@ -1,0 +2,2 @@ namespace lynx {
++int a = 1;
++int b = 2;
+@@ -3 +5 @@ int c;
+-int d = 3;
++int d = 4;
+diff --git a/b.cc b/b.cc
+index 3333333..4444444 100644
+--- a/b.cc
++++ b/b.cc
+@@ -7 +6,0 @@ void f() {
+-  g();
+@@ -20,0 +20 @@ void h() {
++  i();
+"""
+
+
+class RecordingChecker(Checker):
+    def check_changed_lines(self, options, lines, line_indexes, changed_files):
+        self.lines = lines
+        self.line_indexes = line_indexes
+        return None
+
+
+def test_hunks_of_diff():
+    hunks = list(iter_diff_hunks(DIFF.splitlines()))
+    assert hunks == [
+        ("a.cc", 2, ["int a = 1;", "int b = 2;"]),
+        ("a.cc", 5, ["int d = 4;"]),
+        # The pure deletion at b.cc:7 adds nothing and yields no hunk.
+        ("b.cc", 20, ["  i();"]),
+    ]
+
+
+def test_locations_of_lines():
+    checker = RecordingChecker()
+    checker._check_changed_lines(None, ["a.cc", "b.cc"], DIFF.splitlines())
+    lines, index = checker.lines, checker.line_indexes
+    assert lines == ["int a = 1;", "int b = 2;", "int d = 4;", "  i();"]
+    a, b = checker.get_file_key("a.cc"), checker.get_file_key("b.cc")
+    expected = [(a, 2), (a, 3), (a, 5), (b, 20)]
+    assert [index[i] for i in range(len(lines))] == expected
+    assert list(index.iter_locations()) == expected
+    assert len(index) == len(lines)
+    assert index.changed_lines_of(a) == {2, 3, 5}
+    assert index.changed_lines_of(b) == {20}
+
+
+def test_hunk_boundaries():
+    index = ChangedLinesIndex()
+    index.add_hunk("a", 10, 3)
+    index.add_hunk("a", 20, 1)
+    index.add_hunk("b", 1, 2)
+    # Last line of a hunk and first line of the next one.
+    assert index[2] == ("a", 12)
+    assert index[3] == ("a", 20)
+    assert index[4] == ("b", 1)
+    assert index[5] == ("b", 2)
+    for offset in (-1, 6, "0"):
+        try:
+            index[offset]
+        except KeyError:
+            pass
+        else:
+            raise AssertionError("offset %r is not in the index" % (offset,))
+
+
+def test_zero_length_hunks():
+    index = ChangedLinesIndex()
+    index.add_hunk("a", 5, 0)
+    index.add_hunk("a", 7, 2)
+    index.add_hunk("b", 3, 0)
+    index.add_hunk("b", 9, 1)
+    index.add_hunk("c", 1, 0)
+    assert len(index) == 3
+    assert list(index.iter_locations()) == [("a", 7), ("a", 8), ("b", 9)]
+    assert [index[i] for i in range(3)] == [("a", 7), ("a", 8), ("b", 9)]
+    assert index.changed_lines_of("a") == {7, 8}
+    assert index.changed_lines_of("c") == set()
+
+
+def test_file_not_in_diff():
+    index = ChangedLinesIndex()
+    assert index.changed_lines_of("a") == set()
+    assert list(index.iter_locations()) == []
+    index.add_hunk("a", 1, 1)
+    assert index.changed_lines_of("missing") == set()
+    checker = RecordingChecker()
+    checker._check_changed_lines(None, ["c.cc"], DIFF.splitlines())
+    assert checker.get_file_key("c.cc") not in {
+        file_key for file_key, _ in checker.line_indexes.iter_locations()
+    }
+
+
+if __name__ == "__main__":
+    test_hunks_of_diff()
+    test_locations_of_lines()
+    test_hunk_boundaries()
+    test_zero_length_hunks()
+    test_file_not_in_diff()
+    print("\033[92mTESTS PASSED\033[0m")
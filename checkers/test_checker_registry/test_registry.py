@@ -0,0 +1,32 @@
+# Copyright 2026 The Lynx Authors. All rights reserved.
+# Licensed under the Apache License Version 2.0 that can be found in the
+# LICENSE file in the root directory of this source tree.
+
+import sys
+from pathlib import Path
+
+# a bit hacky, py needs to search for the checkers module
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+import checkers
+from checkers.checker_manager import is_checker
+from checkers.checker_registry import BUILTIN_CHECKERS
+from utils.find_classes import find_classes
+
+
+def test_registry_matches_checker_classes():
+    classes = find_classes(checkers, is_checker, recursive=False)
+    expected = {c.name: (c.__module__, c.__name__, c.help) for c in classes}
+    registered = {e.name: (e.module, e.class_name, e.help) for e in BUILTIN_CHECKERS}
+    assert registered == expected
+
+
+def test_entry_loads_registered_class():
+    for entry in BUILTIN_CHECKERS:
+        cls = entry.load()
+        assert cls.name == entry.name
+
+
+if __name__ == "__main__":
+    test_registry_matches_checker_classes()
+    test_entry_loads_registered_class()
+    print("\033[92mTESTS PASSED\033[0m")
@@ -0,0 +1,132 @@
+# Copyright 2026 The Lynx Authors. All rights reserved.
+# Licensed under the Apache License Version 2.0 that can be found in the
+# LICENSE file in the root directory of this source tree.
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# a bit hacky, py needs to search for the checkers module
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from checkers.checker import Checker, CheckResult
+from checkers.checker_result_store import CheckerResultStore, IncrementalRun
+from checkers.checker_scheduler import CheckerReport
+
+
+class FakeMergeRequest:
+    def __init__(self, file_blobs, changed_files=()):
+        self.file_blobs = file_blobs
+        self.changed_files = list(changed_files)
+
+    def GetAllFileBlobs(self):
+        return self.file_blobs
+
+    def GetChangedFiles(self):
+        return self.changed_files
+
+
+class FakeChecker(Checker):
+    name = "fake"
+    help = "Remember the checked files"
+    incremental = True
+    config_keys = []
+    config_file_names = ("fake.cfg",)
+
+    def __init__(self, result=CheckResult.PASSED):
+        super().__init__()
+        self.result = result
+        self.checked = None
+
+    def run(self, options, mr, changed_files):
+        self.checked = list(changed_files)
+        return self.result
+
+
+def _check(store, file_blobs, changed_files=(), result=CheckResult.PASSED):
+    """
+    Runs FakeChecker incrementally on all files of |file_blobs|, returns the
+    files it checked.
+    """
+    checker = FakeChecker(result)
+    mr = FakeMergeRequest(file_blobs, changed_files)
+    run = IncrementalRun(store, mr)
+    (wrapped,) = run.wrap([checker], sorted(file_blobs))
+    result = wrapped.run(None, mr, sorted(file_blobs))
+    run.record([CheckerReport(checker.name, result)])
+    return checker.checked or []
+
+
+def test_passed_files_are_skipped():
+    with tempfile.TemporaryDirectory() as directory:
+        store = CheckerResultStore(directory)
+        blobs = {"a.cc": "1", "b.cc": "2", "fake.cfg": "3"}
+        assert _check(store, blobs) == ["a.cc", "b.cc", "fake.cfg"]
+        assert _check(store, blobs) == []
+
+
+def test_changed_content_is_checked_again():
+    with tempfile.TemporaryDirectory() as directory:
+        store = CheckerResultStore(directory)
+        _check(store, {"a.cc": "1", "b.cc": "2"})
+        assert _check(store, {"a.cc": "1", "b.cc": "4"}) == ["b.cc"]
+        # The same content under another path was not checked there.
+        assert _check(store, {"a.cc": "1", "b.cc": "4", "c.cc": "4"}) == ["c.cc"]
+
+
+def test_failed_checks_are_not_recorded():
+    with tempfile.TemporaryDirectory() as directory:
+        store = CheckerResultStore(directory)
+        blobs = {"a.cc": "1"}
+        _check(store, blobs, result=CheckResult.FAILED)
+        assert _check(store, blobs) == ["a.cc"]
+
+
+def test_files_with_uncommitted_changes_are_always_checked():
+    with tempfile.TemporaryDirectory() as directory:
+        store = CheckerResultStore(directory)
+        blobs = {"a.cc": "1", "b.cc": "2"}
+        _check(store, blobs)
+        assert _check(store, blobs, changed_files=["a.cc"]) == ["a.cc"]
+        assert _check(store, {"a.cc": "1", "b.cc": "5"}, ["b.cc"]) == ["b.cc"]
+        assert _check(store, {"a.cc": "1", "b.cc": "5"}) == ["b.cc"]
+
+
+def test_config_change_invalidates_passes():
+    with tempfile.TemporaryDirectory() as directory:
+        store = CheckerResultStore(directory)
+        _check(store, {"a.cc": "1", "fake.cfg": "3"})
+        assert _check(store, {"a.cc": "1", "fake.cfg": "6"}) == ["a.cc", "fake.cfg"]
+        assert _check(store, {"a.cc": "1", "fake.cfg": "6"}) == []
+
+
+def test_uncommitted_config_change_invalidates_passes():
+    with tempfile.TemporaryDirectory() as directory:
+        old_cwd = os.getcwd()
+        os.chdir(directory)
+        try:
+            store = CheckerResultStore(os.path.join(directory, "store"))
+            blobs = {"a.cc": "1", "fake.cfg": "3"}
+            _check(store, blobs)
+            with open("fake.cfg", "w") as f:
+                f.write("edited")
+            assert _check(store, blobs, ["fake.cfg"]) == ["a.cc", "fake.cfg"]
+            assert _check(store, blobs, ["fake.cfg"]) == ["fake.cfg"]
+            with open("fake.cfg", "w") as f:
+                f.write("edited again")
+            assert _check(store, blobs, ["fake.cfg"]) == ["a.cc", "fake.cfg"]
+            # Back to the committed configuration, nothing recorded under the
+            # edited ones applies.
+            assert _check(store, blobs) == ["a.cc", "fake.cfg"]
+        finally:
+            os.chdir(old_cwd)
+
+
+if __name__ == "__main__":
+    test_passed_files_are_skipped()
+    test_changed_content_is_checked_again()
+    test_failed_checks_are_not_recorded()
+    test_files_with_uncommitted_changes_are_always_checked()
+    test_config_change_invalidates_passes()
+    test_uncommitted_config_change_invalidates_passes()
+    print("\033[92mTESTS PASSED\033[0m")
@@ -0,0 +1,117 @@
+# Copyright 2026 The Lynx Authors. All rights reserved.
+# Licensed under the Apache License Version 2.0 that can be found in the
+# LICENSE file in the root directory of this source tree.
+
+import contextlib
+import io
+import sys
+import threading
+import time
+from pathlib import Path
+
+# a bit hacky, py needs to search for the checkers module
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from checkers.checker import Checker, CheckResult
+from checkers.checker_scheduler import CheckerScheduler, in_process_worker
+
+# Keeps the checkers waiting on it busy until the test is over.
+_release = threading.Event()
+
+
+class FakeChecker(Checker):
+    def __init__(self, name, result=CheckResult.PASSED, delay=0.0, wait=False):
+        super().__init__()
+        self.name = name
+        self.result = result
+        self.delay = delay
+        self.wait = wait
+
+    def run(self, options, mr, changed_files):
+        print("%s started" % self.name)
+        if self.wait:
+            _release.wait(0.5)
+        time.sleep(self.delay)
+        print("%s done" % self.name)
+        return self.result
+
+
+class ProcessChecker(FakeChecker):
+    run_in_process = True
+
+
+class WorkerChecker(Checker):
+    name = "worker"
+    run_in_process = True
+
+    def run(self, options, mr, changed_files):
+        print("in process worker: %s" % in_process_worker())
+        return CheckResult.PASSED
+
+
+def _run(checkers, jobs=1, fail_fast=False):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        reports = CheckerScheduler(jobs, fail_fast).run(checkers, None, None, [])
+    return reports, output.getvalue()
+
+
+def test_sequential_run_keeps_the_order():
+    reports, output = _run([FakeChecker("a"), FakeChecker("b", CheckResult.FAILED)])
+    assert [(r.name, r.passed) for r in reports] == [("a", True), ("b", False)]
+    assert output.index("a done") < output.index("b started")
+    assert "summary" in output
+
+
+def test_concurrent_run_reports_in_checker_order():
+    checkers = [
+        FakeChecker("slow", delay=0.3),
+        FakeChecker("fast"),
+        ProcessChecker("process", delay=0.1),
+    ]
+    reports, output = _run(checkers, jobs=3)
+    assert [r.name for r in reports] == ["slow", "fast", "process"]
+    assert all(r.passed for r in reports)
+    # Blocks are printed as the checkers finish, each one in one piece.
+    assert output.index("[fast]") < output.index("[slow]")
+    for report in reports:
+        block = "{0} started\n{0} done\n".format(report.name)
+        assert report.output == block
+        assert block + "\n[%s]" % report.name in output
+
+
+def test_fail_fast_stops_sequential_run():
+    checkers = [FakeChecker("a", CheckResult.FAILED), FakeChecker("b")]
+    reports, output = _run(checkers, fail_fast=True)
+    assert [r.name for r in reports] == ["a"]
+    assert "b started" not in output
+
+
+def test_fail_fast_cancels_pending_checkers():
+    checkers = [
+        FakeChecker("busy", wait=True),
+        FakeChecker("failing", CheckResult.FAILED),
+    ] + [FakeChecker("queued%d" % i, wait=True) for i in range(4)]
+    reports, output = _run(checkers, jobs=2, fail_fast=True)
+    names = [r.name for r in reports]
+    assert names[:2] == ["busy", "failing"]
+    # The worker of the failing checker took the next one before the failure
+    # was seen, the others were cancelled.
+    assert len(names) < len(checkers)
+    assert "queued3 started" not in output
+
+
+def test_checkers_know_when_they_run_in_a_process_worker():
+    _, output = _run([WorkerChecker()])
+    assert "in process worker: False" in output
+    _, output = _run([WorkerChecker(), FakeChecker("a")], jobs=2)
+    assert "in process worker: True" in output
+    assert not in_process_worker()
+
+
+if __name__ == "__main__":
+    test_sequential_run_keeps_the_order()
+    test_concurrent_run_reports_in_checker_order()
+    test_fail_fast_stops_sequential_run()
+    test_fail_fast_cancels_pending_checkers()
+    test_checkers_know_when_they_run_in_a_process_worker()
+    print("\033[92mTESTS PASSED\033[0m")
@@ -0,0 +1,172 @@
+# Copyright 2026 The Lynx Authors. All rights reserved.
+# Licensed under the Apache License Version 2.0 that can be found in the
+# LICENSE file in the root directory of this source tree.
+
+import os
+import stat
+import sys
+import tempfile
+from pathlib import Path
+
+# a bit hacky, py needs to search for the checkers module
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from checkers import code_format_helper
+from checkers.code_format_helper import (
+    check_clang_format_chunk,
+    check_format_batch,
+    check_prettier_chunk,
+)
+
+# The stubs below stand in for the formatters: two spaces in a row are bad
+# format, "<<<" is a syntax error. Their output is the one of the real tools.
+CLANG_FORMAT_STUB = """\
+#!{python}
+import sys
+
+paths = [arg for arg in sys.argv[1:] if not arg.startswith("-")]
+failed = False
+for path in paths:
+    with open(path) as f:
+        content = f.read()
+    if "--output-replacements-xml" not in sys.argv:
+        sys.stdout.write(content.replace("  ", " "))
+        continue
+    if "<<<" in content:
+        sys.stderr.write("error: unexpected token in " + path + "\\n")
+        failed = True
+        continue
+    print("<?xml version='1.0'?>")
+    print("<replacements xml:space='preserve' incomplete_format='false'>")
+    offset = content.find("  ")
+    if offset >= 0:
+        print("<replacement offset='%d' length='2'> </replacement>" % offset)
+    print("</replacements>")
+sys.exit(1 if failed else 0)
+"""
+
+NPX_STUB = """\
+#!{python}
+import os
+import sys
+
+paths = [arg for arg in sys.argv[1:] if not arg.startswith("-")][1:]
+code = 0
+for path in paths:
+    with open(path) as f:
+        content = f.read()
+    if "--list-different" not in sys.argv:
+        sys.stdout.write(content.replace("  ", " "))
+    elif "<<<" in content:
+        sys.stderr.write("[error] " + path + ": SyntaxError: Unexpected token\\n")
+        code = 2
+    elif "  " in content:
+        print(os.path.normpath(path))
+        code = max(code, 1)
+sys.exit(code)
+"""
+
+
+class _Tools:
+    """
+    A directory with the stub formatters first on PATH while in use.
+    """
+
+    def __enter__(self):
+        self.directory = tempfile.TemporaryDirectory()
+        for name, stub in (("clang-format", CLANG_FORMAT_STUB), ("npx", NPX_STUB)):
+            path = os.path.join(self.directory.name, name)
+            with open(path, "w") as f:
+                f.write(stub.format(python=sys.executable))
+            os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+        self.old_path = os.environ["PATH"]
+        os.environ["PATH"] = self.directory.name + os.pathsep + self.old_path
+        return self
+
+    def __exit__(self, *exc_info):
+        os.environ["PATH"] = self.old_path
+        self.directory.cleanup()
+
+    def write(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+
+def test_clang_format_chunk():
+    with _Tools() as tools:
+        good = tools.write("src/good.cc", "int a;\n")
+        bad = tools.write("src/bad.cc", "int  a;\n")
+        no_newline = tools.write("src/no_newline.h", "int a;")
+        assert check_clang_format_chunk([good]) == []
+        assert check_clang_format_chunk([good, bad, no_newline]) == [bad, no_newline]
+
+
+def test_clang_format_chunk_falls_back_to_single_files():
+    with _Tools() as tools:
+        good = tools.write("src/good.cc", "int a;\n")
+        bad = tools.write("src/bad.cc", "int  a;\n")
+        # No replacements document for it, the documents of the others can't
+        # be told apart.
+        broken = tools.write("src/broken.cc", "<<<\n")
+        assert check_clang_format_chunk([bad, broken, good]) == [bad]
+
+
+def test_prettier_chunk():
+    with _Tools() as tools:
+        good = tools.write("web/good.ts", "let a = 1;\n")
+        bad = tools.write("web/bad.yml", "a:  1\n")
+        no_newline = tools.write("web/no_newline.tsx", "let a = 1;")
+        assert check_prettier_chunk([good]) == []
+        # prettier lists the files by their normalized path.
+        unnormalized = os.path.join(tools.directory.name, "web", ".", "bad.yml")
+        assert check_prettier_chunk([good, unnormalized, no_newline]) == [
+            unnormalized,
+            no_newline,
+        ]
+        assert check_prettier_chunk([bad, good]) == [bad]
+
+
+def test_prettier_chunk_falls_back_to_single_files():
+    with _Tools() as tools:
+        good = tools.write("web/good.ts", "let a = 1;\n")
+        bad = tools.write("web/bad.ts", "let  a = 1;\n")
+        broken = tools.write("web/broken.yaml", "<<<\n")
+        assert check_prettier_chunk([good, broken, bad]) == [bad]
+
+
+def test_format_batch():
+    chunk_size = code_format_helper.CLANG_FORMAT_FILES_PER_CHUNK
+    code_format_helper.CLANG_FORMAT_FILES_PER_CHUNK = 2
+    try:
+        with _Tools() as tools:
+            paths = [
+                tools.write("src/a.cc", "int a;\n"),
+                tools.write("web/a.ts", "let  a = 1;\n"),
+                tools.write("src/b.h", "int  b;\n"),
+                tools.write("src/c.mm", "int c;\n"),
+                tools.write("web/b.yml", "b: 1\n"),
+                tools.write("src/d.cc", "int  d;\n"),
+            ]
+            link = os.path.join(tools.directory.name, "src", "link.cc")
+            os.symlink(paths[2], link)
+            # Failed files come in the order they were given, across chunks
+            # and tools, and symbolic links are not followed.
+            assert check_format_batch(paths + [link], jobs=3) == [
+                paths[1],
+                paths[2],
+                paths[5],
+            ]
+            assert check_format_batch([paths[0], paths[3], paths[4]]) == []
+    finally:
+        code_format_helper.CLANG_FORMAT_FILES_PER_CHUNK = chunk_size
+
+
+if __name__ == "__main__":
+    test_clang_format_chunk()
+    test_clang_format_chunk_falls_back_to_single_files()
+    test_prettier_chunk()
+    test_prettier_chunk_falls_back_to_single_files()
+    test_format_batch()
+    print("\033[92mTESTS PASSED\033[0m")
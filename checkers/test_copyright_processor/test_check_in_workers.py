@@ -0,0 +1,102 @@
+# Copyright 2026 The Lynx Authors. All rights reserved.
+# Licensed under the Apache License Version 2.0 that can be found in the
+# LICENSE file in the root directory of this source tree.
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# a bit hacky, py needs to search for the checkers module
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from checkers.copyright import copyright_processor
+from checkers.copyright.copyright_processor import ConstVars
+
+Status = ConstVars.FileStatus
+
+NEW_COPYRIGHT = """\
+// Copyright 2026 The Lynx Authors. All rights reserved.
+// Licensed under the Apache License Version 2.0 that can be found in the
+// LICENSE file in the root directory of this source tree.
+
+int a;
+"""
+
+# Each file and the status the check gives it.
+FILES = {
+    "new.cc": (NEW_COPYRIGHT, Status.ALREADY_NEW),
+    "missing.cc": ("int a;\n", Status.NEEDS_UPDATE),
+    "old.h": (
+        "// Copyright 2019 The Lynx Authors. All rights reserved.\n\nint a;\n",
+        Status.NEEDS_UPDATE,
+    ),
+    "google.cc": ("// Copyright 2012 Google Inc.\n\nint a;\n", Status.THIRD_PARTY),
+    "google.py": ("# Copyright 2012 Google Inc.\n\na = 1\n", Status.THIRD_PARTY),
+    "chromium.h": (
+        "// Copyright 2013 The Chromium Authors.\n\nint a;\n",
+        Status.THIRD_PARTY,
+    ),
+    "other.java": ("// Written by someone\n\nclass A {}\n", Status.ESCAPED),
+    "notes.txt": ("Copyright 2012 Google Inc.\n", Status.UNSUPPORTED),
+}
+
+
+def _write_files(directory, copies=1):
+    files = []
+    for i in range(copies):
+        for name, (content, _) in FILES.items():
+            path = os.path.join(directory, "%d_%s" % (i, name))
+            with open(path, "w") as f:
+                f.write(content)
+            files.append(path)
+    files.append(os.path.join(directory, "deleted.cc"))
+    return files
+
+
+def _check(files, jobs):
+    ConstVars.third_party_hits.clear()
+    report = copyright_processor.check_list_unfiltered(files, jobs)
+    return report, copyright_processor.third_party_match_statistics()
+
+
+def test_statuses_of_files():
+    copyright_processor.set_third_party_list(["Chromium", "Google"])
+    with tempfile.TemporaryDirectory() as directory:
+        files = _write_files(directory)
+        report, statistics = _check(files, 1)
+        expected = {
+            os.path.join(directory, "0_" + name): status
+            for name, (_, status) in FILES.items()
+        }
+        expected[files[-1]] = Status.UNREADABLE
+        assert report.file_status == expected
+        assert statistics == [("Google", 2), ("Chromium", 1)]
+
+
+def test_workers_report_like_a_single_process():
+    copyright_processor.set_third_party_list(["Chromium", "Google"])
+    batch_size = ConstVars.pool_batch_size
+    # Several batches, each one split among the workers.
+    ConstVars.pool_batch_size = 10
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            files = _write_files(directory, copies=5)
+            single_report, single_statistics = _check(files, 1)
+            report, statistics = _check(files, 3)
+            # An iterable is consumed while the pool works.
+            iter_report, iter_statistics = _check(iter(files), 3)
+    finally:
+        ConstVars.pool_batch_size = batch_size
+    assert list(report.file_status) == files
+    assert report.file_status == single_report.file_status
+    assert iter_report.file_status == single_report.file_status
+    # The hits counted in the workers add up in the main process.
+    assert single_statistics == [("Google", 10), ("Chromium", 5)]
+    assert statistics == single_statistics
+    assert iter_statistics == single_statistics
+
+
+if __name__ == "__main__":
+    test_statuses_of_files()
+    test_workers_report_like_a_single_process()
+    print("\033[92mTESTS PASSED\033[0m")
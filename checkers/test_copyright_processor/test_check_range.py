@@ -0,0 +1,144 @@
+# Copyright 2026 The Lynx Authors. All rights reserved.
+# Licensed under the Apache License Version 2.0 that can be found in the
+# LICENSE file in the root directory of this source tree.
+
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# a bit hacky, py needs to search for the checkers module
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from checkers.copyright import copyright_processor
+from checkers.copyright.copyright_processor import ConstVars
+
+Status = ConstVars.FileStatus
+
+GIT_ENV = dict(
+    os.environ,
+    GIT_AUTHOR_NAME="test",
+    GIT_AUTHOR_EMAIL="test@example.com",
+    GIT_COMMITTER_NAME="test",
+    GIT_COMMITTER_EMAIL="test@example.com",
+)
+
+NEW_COPYRIGHT = """\
+// Copyright 2026 The Lynx Authors. All rights reserved.
+// Licensed under the Apache License Version 2.0 that can be found in the
+// LICENSE file in the root directory of this source tree.
+
+int a;
+"""
+
+
+def _git(*args):
+    return subprocess.check_output(
+        ("git",) + args, env=GIT_ENV, universal_newlines=True
+    ).strip()
+
+
+def _commit(files):
+    for name, content in files.items():
+        with open(name, "w") as f:
+            f.write(content)
+    _git("add", "-A")
+    _git("commit", "-q", "-m", "change")
+    return _git("rev-parse", "HEAD")
+
+
+def _blob(revision, name):
+    return _git("rev-parse", "%s:%s" % (revision, name))
+
+
+class _Repo:
+    """
+    A temporary git repository, the current directory while in use.
+    """
+
+    def __enter__(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.old_cwd = os.getcwd()
+        os.chdir(self.directory.name)
+        _git("init", "-q")
+        return self
+
+    def __exit__(self, *exc_info):
+        os.chdir(self.old_cwd)
+        self.directory.cleanup()
+
+
+def test_added_files_in_range():
+    with _Repo():
+        base = _commit({"base.cc": "int a;\n"})
+        first = _commit({"a.cc": "int a;\n", "with space.h": NEW_COPYRIGHT})
+        os.symlink("a.cc", "link.cc")
+        os.rename("a.cc", "renamed.cc")
+        with open("base.cc", "a") as f:
+            f.write("int b;\n")
+        second = _commit({"tab\tname.py": "a = 1\n"})
+
+        added = list(copyright_processor.iter_added_files_in_range(base + "..HEAD"))
+        # Newest commit first. A rename adds the file under its new name, the
+        # symbolic link and the modified file are left out.
+        assert added == [
+            (second, "renamed.cc", _blob(second, "renamed.cc")),
+            (second, "tab\tname.py", _blob(second, "tab\tname.py")),
+            (first, "a.cc", _blob(first, "a.cc")),
+            (first, "with space.h", _blob(first, "with space.h")),
+        ]
+        assert added[0][2] == added[2][2]
+
+        # The root commit adds its files too.
+        assert list(copyright_processor.iter_added_files_in_range(base)) == [
+            (base, "base.cc", _blob(base, "base.cc"))
+        ]
+
+
+def test_missing_blobs():
+    with _Repo():
+        commit = _commit({"a.cc": "int a;\n"})
+        blob_id = _blob(commit, "a.cc")
+        missing_id = "0" * 40
+        assert list(copyright_processor.iter_blobs([missing_id, blob_id])) == [
+            (missing_id, None),
+            (blob_id, b"int a;\n"),
+        ]
+
+
+def test_check_range():
+    copyright_processor.set_third_party_list(["Google"])
+    with _Repo():
+        base = _commit({"base.cc": "int a;\n"})
+        first = _commit(
+            {
+                "new.cc": NEW_COPYRIGHT,
+                "google.py": "# Copyright 2012 Google Inc.\n\na = 1\n",
+                "notes.txt": "int a;\n",
+                "lost.h": "// Written by someone\n",
+            }
+        )
+        # Content added again is read and checked once, for both files.
+        second = _commit({"copy.cc": "int a;\n", "again.cc": NEW_COPYRIGHT})
+        # A blob missing from the object database, as in a partial clone.
+        lost_id = _blob(first, "lost.h")
+        os.remove(os.path.join(".git", "objects", lost_id[:2], lost_id[2:]))
+
+        report = copyright_processor.check_range(base + "..HEAD", jobs=2)
+        assert report.file_status == {
+            second + ":again.cc": Status.ALREADY_NEW,
+            second + ":copy.cc": Status.NEEDS_UPDATE,
+            first + ":google.py": Status.THIRD_PARTY,
+            first + ":lost.h": Status.UNREADABLE,
+            first + ":new.cc": Status.ALREADY_NEW,
+        }
+        assert copyright_processor.process_range(base + "..HEAD") == 1
+        # An unknown revision is logged, not raised.
+        assert copyright_processor.process_range("unknown..HEAD") == 0
+
+
+if __name__ == "__main__":
+    test_added_files_in_range()
+    test_missing_blobs()
+    test_check_range()
+    print("\033[92mTESTS PASSED\033[0m")
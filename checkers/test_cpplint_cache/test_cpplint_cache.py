@@ -0,0 +1,84 @@
+# Copyright 2026 The Lynx Authors. All rights reserved.
+# Licensed under the Apache License Version 2.0 that can be found in the
+# LICENSE file in the root directory of this source tree.
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# a bit hacky, py needs to search for the checkers module
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from checkers.cpplint_cache import CpplintCache, lint_file_with_cache
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def test_key_changes_with_the_inputs_of_cpplint():
+    with tempfile.TemporaryDirectory() as root:
+        os.makedirs(os.path.join(root, ".git"))
+        source = os.path.join(root, "sub", "lib", "a.cc")
+        _write(source, "int a;\n")
+        cache = CpplintCache(os.path.join(root, "cache"), 1 << 20)
+        keys = [cache.key(source)]
+        assert cache.key(source) == keys[-1]
+
+        _write(source, "int b;\n")
+        keys.append(cache.key(source))
+        _write(os.path.join(root, "sub", "lib", "a.h"), "int a();\n")
+        keys.append(cache.key(source))
+        # A sub git dir changes the path the header guards are named after.
+        os.makedirs(os.path.join(root, "sub", ".git"))
+        keys.append(cache.key(source))
+        # The CPPLINT.cfg digests are remembered by directory, a new cache
+        # sees the new file.
+        _write(os.path.join(root, "sub", "CPPLINT.cfg"), "filter=-build\n")
+        cache = CpplintCache(os.path.join(root, "cache"), 1 << 20)
+        keys.append(cache.key(source))
+        assert len(set(keys)) == len(keys)
+
+        assert cache.key(os.path.join(root, "missing.cc")) is None
+
+
+def test_cached_errors_are_returned_without_linting():
+    with tempfile.TemporaryDirectory() as root:
+        source = os.path.join(root, "a.cc")
+        _write(source, "int a;\n")
+        cache = CpplintCache(os.path.join(root, "cache"), 1 << 20)
+        cache.put(cache.key(source), ["a.cc:1:  cached  [test] [1]"])
+        assert lint_file_with_cache(source, 0, cache) == ["a.cc:1:  cached  [test] [1]"]
+
+
+def test_least_recently_used_entries_are_evicted():
+    with tempfile.TemporaryDirectory() as root:
+        cache = CpplintCache(os.path.join(root, "cache"), 0)
+        keys = ["%02x%s" % (i, "0" * 38) for i in range(4)]
+        for i, key in enumerate(keys):
+            cache.put(key, ["error %d" % i])
+            os.utime(cache._entry_path(key), (1000 + i, 1000 + i))
+        entry_size = os.path.getsize(cache._entry_path(keys[0]))
+        cache.max_bytes = 2 * entry_size
+
+        # Reading an entry makes it the most recently used one.
+        assert cache.get(keys[0]) == ["error 0"]
+        cache.evict()
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[2]) is None
+        assert cache.get(keys[0]) == ["error 0"]
+        assert cache.get(keys[3]) == ["error 3"]
+
+        # Nothing goes while the cache fits.
+        cache.evict()
+        assert cache.get(keys[0]) == ["error 0"]
+        assert cache.get(keys[3]) == ["error 3"]
+
+
+if __name__ == "__main__":
+    test_key_changes_with_the_inputs_of_cpplint()
+    test_cached_errors_are_returned_without_linting()
+    test_least_recently_used_entries_are_evicted()
+    print("\033[92mTESTS PASSED\033[0m")
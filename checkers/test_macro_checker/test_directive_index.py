@@ -0,0 +1,49 @@
+# Copyright 2026 The Lynx Authors. All rights reserved.
+# Licensed under the Apache License Version 2.0 that can be found in the
+# LICENSE file in the root directory of this source tree.
+
+import os
+import sys
+from pathlib import Path
+
+# a bit hacky, py needs to search for the checkers module
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from checkers.macro_checker import _DirectiveIndex, _directive_index_of_file
+
+
+def _fixture_path(name):
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+
+
+def test_pairing_condition_lines_of_each_else():
+    index = _DirectiveIndex(
+        [
+            "#if defined(A)\n",
+            "#if B\n",
+            "#else\n",
+            "#endif\n",
+            "#elif C\n",
+            "#else\n",
+            "#else\n",
+            "#endif\n",
+            "#else\n",
+        ]
+    )
+    assert index.pairing_condition_lines(3) == ["#if B"]
+    assert index.pairing_condition_lines(6) == ["#if defined(A)", "#elif C"]
+    # a second #else in the same group, and one outside of any group
+    assert index.pairing_condition_lines(7) is None
+    assert index.pairing_condition_lines(9) is None
+
+
+def test_index_is_cached_per_file():
+    path = _fixture_path("fixture_ok_multiple_else.c")
+    index = _directive_index_of_file(path)
+    assert _directive_index_of_file(path) is index
+    assert index.pairing_condition_lines(17) == ["#if (_WIN64)"]
+
+
+if __name__ == "__main__":
+    test_pairing_condition_lines_of_each_else()
+    test_index_is_cached_per_file()
+    print("\033[92mTESTS PASSED\033[0m")
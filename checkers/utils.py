@@ -9,3 +9,18 @@ def match_globs(target, patterns):
         if fnmatch.fnmatch(target, p):
             return True
     return False
+
+
+def cutting_line(desc="", width=80):
+    if desc:
+        half_line = "=" * int((width - len(desc) - 2) / 2)
+        line = half_line + " " + desc + " " + half_line
+        if len(line) < width:
+            line = line + "="
+    else:
+        line = "=" * width
+    return line
+
+
+def print_cutting_line(desc="", width=80):
+    print(cutting_line(desc, width))
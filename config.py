@@ -2,6 +2,7 @@
 # Licensed under the Apache License Version 2.0 that can be found in the
 # LICENSE file in the root directory of this source tree.
 
+import copy
 import os
 from utils.merge_request import MergeRequest
 import subprocess
@@ -17,12 +18,19 @@ from checkers.default_config import (
 
 class Config:
     data = {}
+    initialized = False
 
     @staticmethod
     def init():
-        # merge checker default config
-        Config.data["checker-config"] = checker_default_config
-        Config.data["command-config"] = command_default_config
+        # Commands and modules may each ask for the configuration, only the
+        # first call reads it.
+        if Config.initialized:
+            return
+        Config.initialized = True
+        # merge checker default config, copied so that init() can run again
+        # after reset()
+        Config.data["checker-config"] = copy.deepcopy(checker_default_config)
+        Config.data["command-config"] = copy.deepcopy(command_default_config)
         Config.data["external-checker-path"] = external_checker_path
         Config.data["ai-commit-request-url"] = ai_commit_request_url
         Config.data["prefer_local_prettier"] = prefer_local_prettier
@@ -43,6 +51,12 @@ class Config:
                     Config.data, yaml.load(config_f, Loader=yaml.FullLoader)
                 )
 
+    @staticmethod
+    def reset():
+        # Forget the configuration, the next init() reads it again.
+        Config.data = {}
+        Config.initialized = False
+
     @staticmethod
     def merge(target, source):
         for key, value in source.items():
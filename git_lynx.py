@@ -2,34 +2,14 @@
 # Copyright 2024 The Lynx Authors. All rights reserved.
 # Licensed under the Apache License Version 2.0 that can be found in the
 # LICENSE file in the root directory of this source tree.
-import inspect
-import json
+# Subcommands import what they need themselves and call Config.init() when
+# they read the configuration, so that light commands such as help and commit
+# start quickly.
 import optparse
 import os
-import pkgutil
-import requests
 
-import checkers
 import subcommand
 import sys
-import subprocess
-
-from checkers.checker import Checker, CheckResult
-from checkers.checker_manager import CheckerManager
-from checkers.envsetup_utils import code_format_env_setup
-from utils.merge_request import MergeRequest
-from config import Config
-
-
-def print_cutting_line(desc="", width=80):
-    if desc:
-        half_line = "=" * int((width - len(desc) - 2) / 2)
-        line = half_line + " " + desc + " " + half_line
-        if len(line) < width:
-            line = line + "="
-    else:
-        line = "=" * width
-    print(line)
 
 
 # git lynx build: Run build.
@@ -43,7 +23,12 @@ def CMDbuild(parser, args):
     parser.add_option("--debug", action="store_true", help="If --debug, Build debug ut")
     parser.add_option("--asan", action="store_true", help="run ut on asan mode")
     options, args = parser.parse_args(args)
-    mr = MergeRequest()
+    from config import Config
+    from utils.merge_request import RepositorySnapshot
+
+    # The CI build scripts may read the configuration.
+    Config.init()
+    mr = RepositorySnapshot()
     root_directory = mr.GetRootDirectory()
     try:
         ci_build_path = os.path.join(root_directory, "tools", "ci")
@@ -79,22 +64,91 @@ def CMDcheck(parser, args):
     parser.add_option(
         "--ignore", help="Ignore checkers, separated with commas", default="none"
     )
+    parser.add_option(
+        "--jobs",
+        "-j",
+        type="int",
+        default=1,
+        help="Number of checkers to run concurrently, 1 by default. Concurrent "
+        "checkers print their output in the order they finish and the output "
+        "of the tools they start may interleave",
+    )
+    parser.add_option(
+        "--fail-fast",
+        action="store_true",
+        help="Stop scheduling checkers after the first failure",
+    )
+    parser.add_option(
+        "--profile",
+        action="store_true",
+        help="Print the time spent in each checker, file and subprocess",
+    )
+    parser.add_option(
+        "--profile-out", help="Write the profile of the checkers to this file"
+    )
+    parser.add_option(
+        "--profile-format",
+        type="choice",
+        choices=["json", "trace"],
+        default="json",
+        help="Format of --profile-out: json or trace (Chrome trace events)",
+    )
+    parser.add_option(
+        "--incremental",
+        action="store_true",
+        help="With --all, skip files whose content passed a checker before",
+    )
+    parser.add_option(
+        "--incremental-store",
+        help="Directory of the results used by --incremental, "
+        "default .git/tools-shared/check-results",
+    )
+    parser.add_option(
+        "--daemon",
+        action="store_true",
+        help="Run the check in the running git lynx daemon, if any",
+    )
+    parser.add_option("--daemon-socket", help="Socket of the daemon, implies --daemon")
 
+    check_args = list(args)
     options, args = parser.parse_args(args)
 
-    checker_manager = CheckerManager(options.ignore)
+    if options.daemon or options.daemon_socket:
+        import checkers.checker_daemon as checker_daemon
+
+        if not checker_daemon.in_daemon_child():
+            from utils.merge_request import MergeRequest
+
+            socket_path = options.daemon_socket or checker_daemon.default_socket_path(
+                MergeRequest().GetRootDirectory()
+            )
+            code = checker_daemon.run_in_daemon(socket_path, check_args)
+            if code is not None:
+                return code
+            print("No git lynx daemon is running, checking without it.")
+
+    from checkers.checker_manager import CheckerManager
+    from checkers.checker_profiler import print_profile_table, write_profile
+    from checkers.checker_scheduler import CheckerScheduler
+    from checkers.utils import print_cutting_line
+    from config import Config
+    from utils.merge_request import RepositorySnapshot
+
+    Config.init()
+    # All git queries of this command are answered by one snapshot.
+    mr = RepositorySnapshot()
+    checker_manager = CheckerManager(options.ignore, mr)
 
     if options.list:
         print("Available checkers:")
         print(
             "\n\n".join(
-                "  " + name + ": " + cls.help
-                for name, cls in checker_manager.checker_classes.items()
+                "  " + name + ": " + entry.help
+                for name, entry in checker_manager.checkers.items()
             )
         )
         return
 
-    mr = MergeRequest()
     if options.all:
         changed_files = mr.GetAllFiles()
     elif options.changed:
@@ -125,32 +179,95 @@ def CMDcheck(parser, args):
     target_checkers = []
     if options.checkers == "all":
         target_checkers = [
-            c()
-            for c in checker_manager.checker_classes.values()
-            if c.name not in skipped_checks
+            checker_manager.load_checker(name)()
+            for name in checker_manager.checkers
+            if name not in skipped_checks
         ]
     else:
         checker_names = options.checkers.split(",")
         for name in checker_names:
-            if name not in checker_manager.checker_classes:
+            if name not in checker_manager.checkers:
                 raise Exception("Checker " + name + " not found")
             if name not in skipped_checks:
-                target_checkers.append(checker_manager.checker_classes.get(name)())
+                target_checkers.append(checker_manager.load_checker(name)())
+    incremental_run = None
+    if options.incremental and options.all:
+        from checkers.checker_result_store import CheckerResultStore, IncrementalRun
+
+        store_dir = options.incremental_store or os.path.join(
+            mr.GetGitDirectory(), "tools-shared", "check-results"
+        )
+        incremental_run = IncrementalRun(CheckerResultStore(store_dir), mr)
+        target_checkers = incremental_run.wrap(target_checkers, changed_files)
+    elif options.incremental:
+        print("--incremental only applies to --all, checking all files.")
+
     old_cwd = os.getcwd()
     os.chdir(mr.GetRootDirectory())
     try:
-        for c in target_checkers:
-            if options.checkers != "all" and c.name not in options.checkers.split(","):
-                continue
-            print_cutting_line(c.name)
-            res = c.run(options, mr, changed_files)
-            print("\n[%s] %s" % (c.name, res))
-            print_cutting_line()
-            print("")
-            if res != CheckResult.PASSED:
-                sys.exit(1)
+        scheduler = CheckerScheduler(
+            options.jobs,
+            options.fail_fast,
+            profile=bool(options.profile or options.profile_out),
+        )
+        reports = scheduler.run(target_checkers, options, mr, changed_files)
     finally:
         os.chdir(old_cwd)
+    if incremental_run:
+        incremental_run.record(reports)
+    profiles = [r.profile for r in reports if r.profile]
+    if options.profile:
+        print_cutting_line("profile")
+        print_profile_table(profiles)
+        print_cutting_line()
+    if options.profile_out:
+        write_profile(profiles, options.profile_out, options.profile_format)
+    if any(not r.passed for r in reports):
+        sys.exit(1)
+
+
+# git lynx daemon: Keep checkers and configuration loaded and serve
+# `git lynx check --daemon` requests over a Unix socket.
+def CMDdaemon(parser, args):
+    parser.add_option(
+        "--socket", help="Path of the Unix socket, by default in the temp directory"
+    )
+    parser.add_option("--stop", action="store_true", help="Stop the running daemon")
+    parser.add_option(
+        "--status", action="store_true", help="Tell whether a daemon is running"
+    )
+    options, args = parser.parse_args(args)
+    from checkers.checker_daemon import (
+        CheckerDaemon,
+        default_socket_path,
+        is_daemon_running,
+        stop_daemon,
+    )
+    from utils.merge_request import MergeRequest
+
+    mr = MergeRequest()
+    root = mr.GetRootDirectory()
+    socket_path = options.socket or default_socket_path(root)
+    if options.stop:
+        if not stop_daemon(socket_path):
+            print("No git lynx daemon is running.")
+            return 1
+        return 0
+    if options.status:
+        running = is_daemon_running(socket_path)
+        print(
+            f"git lynx daemon is running on {socket_path}"
+            if running
+            else "No git lynx daemon is running."
+        )
+        return 0 if running else 1
+    daemon = CheckerDaemon(
+        root,
+        mr.GetGitDirectory(),
+        socket_path,
+        lambda check_args: CMDcheck(OptionParser(), check_args),
+    )
+    return daemon.serve_forever()
 
 
 # git lynx format: Run clang-format for lynx
@@ -165,14 +282,28 @@ def CMDformat(parser, args):
     parser.add_option(
         "--ktlint", action="store_true", help="Enable kotlin format with ktlint"
     )
+    parser.add_option(
+        "--jobs",
+        "-j",
+        type="int",
+        default=os.cpu_count() or 1,
+        help="Number of formatter commands to run concurrently",
+    )
     options, args = parser.parse_args(args)
+    from concurrent.futures import ThreadPoolExecutor
+
+    from checkers.envsetup_utils import code_format_env_setup
+    from config import Config
+    from utils.merge_request import RepositorySnapshot
+
+    Config.init()
     try:
         import checkers.format_file_filter as format_file_filter
     except ImportError:
         print("Can not find format_file_filter in the project.")
         return 1
     old_cwd = os.getcwd()
-    mr = MergeRequest()
+    mr = RepositorySnapshot()
     os.chdir(mr.GetRootDirectory())
     forbidden_suffix = Config.value(
         "command-config", "format-command", "ignore-suffixes"
@@ -187,17 +318,39 @@ def CMDformat(parser, args):
             changed_files = mr.GetChangedFiles()
         else:
             changed_files = mr.GetLastCommitFiles()
-        for filename in changed_files:
+        filenames = [
+            filename
+            for filename in changed_files
             if format_file_filter.shouldFormatFile(
                 filename, forbidden_suffix, forbidden_dirs
+            )
+        ]
+        commands, other_files = format_file_filter.getGroupedFormatCommands(filenames)
+        other_file_set = set(other_files)
+        grouped_files = [f for f in filenames if f not in other_file_set]
+        format_file_filter.fixHeaderGuards(
+            [f for f in grouped_files if format_file_filter.isHeaderFile(f)],
+            options.jobs,
+        )
+        with ThreadPoolExecutor(max_workers=max(1, options.jobs)) as executor:
+            for command, (output, error) in zip(
+                commands, executor.map(mr.RunCommand, commands)
             ):
-                command = format_file_filter.getFormatCommand(filename)
-                output, error = mr.RunCommand(command)
                 if error:
-                    print(f"Error clang-format {filename}: {error}")
+                    print(f"Error {command[0]}: {error}")
                     continue
                 if options.verbose:
-                    print(f"Formatting {filename}: {output}")
+                    print(f"Formatting with {' '.join(command)}: {output}")
+        for filename in grouped_files:
+            format_file_filter.ensureEndWithNewline(filename)
+        for filename in other_files:
+            command = format_file_filter.getFormatCommand(filename)
+            output, error = mr.RunCommand(command)
+            if error:
+                print(f"Error formatting {filename}: {error}")
+                continue
+            if options.verbose:
+                print(f"Formatting {filename}: {output}")
     finally:
         os.chdir(old_cwd)
 
@@ -229,7 +382,14 @@ def CMDaicommit(parser, args):
         default=False,
     )
     options, args = parser.parse_args(args)
+    import json
 
+    import requests
+
+    from config import Config
+    from utils.merge_request import MergeRequest
+
+    Config.init()
     mr = MergeRequest()
 
     output, error = mr.RunCommand(["git", "diff", "--cached"])
@@ -324,9 +484,8 @@ def main(argv):
     usage = "git lynx subcommand"
     dispatcher = subcommand.CommandDispatcher(__name__)
 
-    dispatcher.execute(OptionParser(), argv)
+    return dispatcher.execute(OptionParser(), argv)
 
 
 if __name__ == "__main__":
-    Config.init()
     sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,112 @@
+# Copyright 2026 The Lynx Authors. All rights reserved.
+# Licensed under the Apache License Version 2.0 that can be found in the
+# LICENSE file in the root directory of this source tree.
+
+# `git lynx check --daemon` must behave like `git lynx check`: same output,
+# same exit code, whether the checkers run in the caller or in a child of
+# the daemon.
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GIT_LYNX = os.path.join(ROOT, "git_lynx.py")
+sys.path.insert(0, ROOT)
+from checkers.checker_daemon import is_daemon_running
+
+GIT_ENV = dict(
+    os.environ,
+    GIT_AUTHOR_NAME="test",
+    GIT_AUTHOR_EMAIL="test@example.com",
+    GIT_COMMITTER_NAME="test",
+    GIT_COMMITTER_EMAIL="test@example.com",
+)
+
+BAD_SOURCE = "int main() {\n    return 0;\n}\n"
+GOOD_SOURCE = "// Copyright 2026\n\nint main() { return 0; }\n"
+
+
+def _commit(repo, files):
+    for name, content in files.items():
+        with open(os.path.join(repo, name), "w") as f:
+            f.write(content)
+    subprocess.check_call(["git", "add", "."], cwd=repo)
+    subprocess.check_call(
+        ["git", "commit", "-q", "-m", "change"], cwd=repo, env=GIT_ENV
+    )
+
+
+def _check(repo, extra_args=()):
+    result = subprocess.run(
+        [sys.executable, GIT_LYNX, "check", "--checkers=cpplint", "--all"]
+        + list(extra_args),
+        cwd=repo,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        universal_newlines=True,
+        env=GIT_ENV,
+        timeout=120,
+    )
+    return result.returncode, result.stdout
+
+
+def _wait_for_daemon(socket_path, daemon):
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if daemon.poll() is not None:
+            raise AssertionError("daemon exited with %d" % daemon.returncode)
+        if is_daemon_running(socket_path):
+            return
+        time.sleep(0.1)
+    raise AssertionError("daemon did not start")
+
+
+def test_check_in_daemon_matches_direct_check():
+    with tempfile.TemporaryDirectory() as repo:
+        subprocess.check_call(["git", "init", "-q"], cwd=repo)
+        _commit(repo, {"bad.cc": BAD_SOURCE, "good.cc": GOOD_SOURCE})
+        socket_path = os.path.join(repo, "daemon.sock")
+        daemon = subprocess.Popen(
+            [sys.executable, GIT_LYNX, "daemon", "--socket", socket_path],
+            cwd=repo,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            env=GIT_ENV,
+        )
+        try:
+            _wait_for_daemon(socket_path, daemon)
+            daemon_args = ["--daemon-socket", socket_path]
+
+            # Files found in the cpplint cache are reported more briefly,
+            # fill it so that both runs find them there.
+            _check(repo)
+            code, output = _check(repo, daemon_args)
+            assert (code, output) == _check(repo)
+            assert code == 1
+            assert "bad.cc:0:  No copyright message found." in output
+            assert "checking without it" not in output
+
+            # The daemon warms up again for the new HEAD.
+            _commit(repo, {"bad.cc": GOOD_SOURCE})
+            _check(repo)
+            code, output = _check(repo, daemon_args)
+            assert (code, output) == _check(repo)
+            assert code == 0
+        finally:
+            subprocess.call(
+                [sys.executable, GIT_LYNX, "daemon", "--socket", socket_path, "--stop"],
+                cwd=repo,
+                stdout=subprocess.DEVNULL,
+            )
+            try:
+                daemon.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                daemon.kill()
+                daemon.wait()
+
+
+if __name__ == "__main__":
+    test_check_in_daemon_matches_direct_check()
+    print("\033[92mTESTS PASSED\033[0m")
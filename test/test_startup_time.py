@@ -0,0 +1,82 @@
+# Copyright 2026 The Lynx Authors. All rights reserved.
+# Licensed under the Apache License Version 2.0 that can be found in the
+# LICENSE file in the root directory of this source tree.
+
+# git lynx runs from git hooks many times a day, so starting it must stay
+# cheap: light subcommands should neither import the dependencies of other
+# subcommands nor read the configuration (which runs git).
+import os
+import subprocess
+import sys
+import time
+
+GIT_LYNX = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "git_lynx.py"
+)
+
+# Modules only some subcommands need.
+SUBCOMMAND_MODULES = [
+    "requests",
+    "yaml",
+    "config",
+    "concurrent.futures",
+    "checkers.checker_manager",
+    "checkers.cpplint",
+    "utils.merge_request",
+]
+
+# Generous, so that slow machines do not fail. Starting without the
+# subcommand dependencies takes a fraction of it.
+STARTUP_BUDGET_SECONDS = 1.0
+
+
+def _run_git_lynx(args, env=None):
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", GIT_LYNX] + args,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        env=env,
+    )
+
+
+def _imported_modules(stderr):
+    return {
+        line.rsplit("|", 1)[-1].strip()
+        for line in stderr.splitlines()
+        if line.startswith("import time:")
+    }
+
+
+def test_help_does_not_import_subcommand_dependencies():
+    result = _run_git_lynx(["help"])
+    assert result.returncode == 0
+    imported = _imported_modules(result.stderr)
+    assert not imported.intersection(SUBCOMMAND_MODULES)
+
+
+def test_help_does_not_run_git():
+    # Without git on PATH, reading the configuration would fail.
+    env = dict(os.environ, PATH="")
+    result = _run_git_lynx(["help"], env)
+    assert result.returncode == 0, result.stderr
+
+
+def test_startup_time():
+    timings = []
+    for _ in range(3):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, GIT_LYNX, "help"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        timings.append(time.perf_counter() - start)
+    assert sorted(timings)[1] < STARTUP_BUDGET_SECONDS
+
+
+if __name__ == "__main__":
+    test_help_does_not_import_subcommand_dependencies()
+    test_help_does_not_run_git()
+    test_startup_time()
+    print("\033[92mTESTS PASSED\033[0m")
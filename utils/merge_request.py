@@ -2,6 +2,7 @@
 # Copyright 2024 The Lynx Authors. All rights reserved.
 # Licensed under the Apache License Version 2.0 that can be found in the
 # LICENSE file in the root directory of this source tree.
+import os
 import subprocess
 
 
@@ -24,10 +25,30 @@ class MergeRequest:
         except UnicodeDecodeError:
             return "", f"Error decode for the result of command: {' '.join(command)}"
 
+    # Run a git command directly, without going through a shell.
+    def RunGitCommand(self, command):
+        p = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        try:
+            return p.stdout.decode("utf-8"), p.stderr.decode("utf-8")
+        except UnicodeDecodeError:
+            return "", f"Error decode for the result of command: {' '.join(command)}"
+
+    # Run a git command and yield its output line by line while it is running,
+    # instead of holding the whole output in memory.
+    def IterGitCommand(self, command, error_message):
+        with subprocess.Popen(
+            command, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        ) as p:
+            for line in p.stdout:
+                yield line.decode("utf-8", errors="replace").rstrip("\n")
+            error = p.stderr.read().decode("utf-8", errors="replace")
+        if error:
+            print("%s: %s" % (error_message, error))
+
     # Get project/git root directory
     def GetRootDirectory(self):
         command = ["git", "rev-parse", "--show-toplevel"]
-        result, error = self.RunCommand(command)
+        result, error = self.RunGitCommand(command)
         if error:
             print(
                 (
@@ -38,9 +59,23 @@ class MergeRequest:
             return None
         return result.strip()
 
+    # Get the .git directory shared by all worktrees of the repo.
+    def GetGitDirectory(self):
+        command = ["git", "rev-parse", "--git-common-dir"]
+        result, error = self.RunGitCommand(command)
+        if error:
+            print(
+                (
+                    "Error, can not get git directory, make sure it is a git repo: %s"
+                    % (error)
+                )
+            )
+            return None
+        return os.path.abspath(result.strip())
+
     def GetAllLFSManagerFiles(self):
         command = ["git", "lfs", "ls-files"]
-        result, error = self.RunCommand(command)
+        result, error = self.RunGitCommand(command)
         if error:
             print(
                 (
@@ -78,7 +113,7 @@ class MergeRequest:
     def GetUntrackedFiles(self):
         file_list = []
         command = ["git", "ls-files", "--others", "--exclude-standard"]
-        result, error = self.RunCommand(command)
+        result, error = self.RunGitCommand(command)
         if error:
             print(
                 (
@@ -94,7 +129,7 @@ class MergeRequest:
 
     def GetChangedLines(self):
         cmd = ["git", "diff", "-U0"]
-        result, error = self.RunCommand(cmd)
+        result, error = self.RunGitCommand(cmd)
         if error:
             print(
                 (
@@ -104,12 +139,18 @@ class MergeRequest:
             )
         return result
 
+    def IterChangedLines(self):
+        return self.IterGitCommand(
+            ["git", "diff", "-U0"],
+            "Error, can not get staged lines, make sure it is a git repo",
+        )
+
     # Get uncommitted changed files.
     def GetChangedFiles(self):
         file_list = []
         # Staged files
         command = ["git", "diff", "--cached", "--name-only", "--diff-filter=ACMRT"]
-        result, error = self.RunCommand(command)
+        result, error = self.RunGitCommand(command)
         if error:
             print(
                 (
@@ -123,7 +164,7 @@ class MergeRequest:
                 file_list.append(filename)
         # Unstaged files
         command = ["git", "diff", "--name-only", "--diff-filter=ACMRT"]
-        result, error = self.RunCommand(command)
+        result, error = self.RunGitCommand(command)
         if error:
             print(
                 (
@@ -147,7 +188,7 @@ class MergeRequest:
             "--name-only",
             "--pretty=format:",
         ]
-        result, error = self.RunCommand(command)
+        result, error = self.RunGitCommand(command)
         if error:
             print(("Error: can not get change list of last commit: %s" % (error)))
             return []
@@ -160,15 +201,21 @@ class MergeRequest:
 
     def GetLastCommitLines(self):
         cmd = ["git", "diff", "HEAD^", "HEAD", "-U0"]
-        result, error = self.RunCommand(cmd)
+        result, error = self.RunGitCommand(cmd)
         if error:
             print(("Error, can not get changed lines of last commit: %s" % error))
         return result
 
+    def IterLastCommitLines(self):
+        return self.IterGitCommand(
+            ["git", "diff", "HEAD^", "HEAD", "-U0"],
+            "Error, can not get changed lines of last commit",
+        )
+
     # Get commit log of last commit.
     def GetCommitLog(self):
         command = ["git", "log", "--format=%B", "-n", "1"]
-        result, error = self.RunCommand(command)
+        result, error = self.RunGitCommand(command)
         if error:
             print("Error: can not get the commit log of last change.")
             return None
@@ -177,7 +224,7 @@ class MergeRequest:
     # Get all file in the repo.
     def GetAllFiles(self):
         command = ["git", "ls-tree", "--full-tree", "-r", "--name-only", "HEAD"]
-        result, error = self.RunCommand(command)
+        result, error = self.RunGitCommand(command)
         if error:
             print("Error: can not get all files, please check it is a git repo.")
             return None
@@ -188,6 +235,80 @@ class MergeRequest:
                 file_list.append(filename)
         return file_list
 
+    # Get the blob SHA of every file in the repo, keyed by path.
+    def GetAllFileBlobs(self):
+        command = ["git", "ls-tree", "--full-tree", "-r", "HEAD"]
+        result, error = self.RunGitCommand(command)
+        if error:
+            print("Error: can not get all files, please check it is a git repo.")
+            return {}
+        blobs = {}
+        for line in result.split("\n"):
+            if not line:
+                continue
+            info, filename = line.split("\t", 1)
+            _, object_type, sha = info.split()
+            if object_type == "blob":
+                blobs[filename] = sha
+        return blobs
+
+
+class RepositorySnapshot(MergeRequest):
+    """
+    A MergeRequest which runs every git query at most once and then answers
+    from memory. Create one per git lynx command, the answers are not
+    refreshed when the repository changes afterwards. Diffs read through
+    IterChangedLines/IterLastCommitLines are streamed and never kept.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._cache = {}
+
+    def _Memoize(self, key, query):
+        if key not in self._cache:
+            self._cache[key] = query()
+        value = self._cache[key]
+        # Hand out copies so that callers can not modify the cached values.
+        if isinstance(value, list):
+            return list(value)
+        if isinstance(value, dict):
+            return dict(value)
+        return value
+
+    def GetRootDirectory(self):
+        return self._Memoize("root", super().GetRootDirectory)
+
+    def GetGitDirectory(self):
+        return self._Memoize("git-dir", super().GetGitDirectory)
+
+    def GetAllLFSManagerFiles(self):
+        return self._Memoize("lfs-files", super().GetAllLFSManagerFiles)
+
+    def GetUntrackedFiles(self):
+        return self._Memoize("untracked-files", super().GetUntrackedFiles)
+
+    def GetChangedLines(self):
+        return self._Memoize("changed-lines", super().GetChangedLines)
+
+    def GetChangedFiles(self):
+        return self._Memoize("changed-files", super().GetChangedFiles)
+
+    def GetLastCommitFiles(self):
+        return self._Memoize("last-commit-files", super().GetLastCommitFiles)
+
+    def GetLastCommitLines(self):
+        return self._Memoize("last-commit-lines", super().GetLastCommitLines)
+
+    def GetCommitLog(self):
+        return self._Memoize("commit-log", super().GetCommitLog)
+
+    def GetAllFiles(self):
+        return self._Memoize("all-files", super().GetAllFiles)
+
+    def GetAllFileBlobs(self):
+        return self._Memoize("all-file-blobs", super().GetAllFileBlobs)
+
 
 if __name__ == "__main__":
     mr = MergeRequest()